@@ -0,0 +1,58 @@
+"""
+Measures the memory retained by the parses of a corpus, in bytes per token: the Token and
+Analyses objects of each token and the Analysis, InflGroup and Morph objects shared among
+them, or the columns of a ParseBatch. The transducers and the model are loaded and warmed up
+first, so that their caches are not counted.
+
+    python benchmarks/bench_memory.py [--corpus CORPUS] [--sentences N]
+"""
+import argparse
+import gc
+import time
+import tracemalloc
+
+from yakutmorph.main import YakutMorph
+
+from corpus import load_corpus
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--corpus', help='A corpus with one sentence per line. Defaults to a synthetic corpus.')
+    parser.add_argument('--sentences', type=int, default=5000)
+    args = parser.parse_args()
+
+    sentences = list(load_corpus(args.corpus, args.sentences))
+    warm = YakutMorph().load()
+    warm.parse_many(sentences)
+
+    def measure(method: str) -> tuple:
+        # A new YakutMorph object shares the warm transducer and model, but starts with an empty AnalysisTable
+        morphology = YakutMorph(transducer=warm.transducer, disambiguation_model=warm.disambiguation_model)
+        gc.collect()
+        tracemalloc.start()
+        before = tracemalloc.get_traced_memory()[0]
+        parses = getattr(morphology, method)(sentences)
+        gc.collect()
+        retained = tracemalloc.get_traced_memory()[0] - before
+        tracemalloc.stop()
+        return morphology, parses, retained
+
+    morphology, parses, retained = measure('parse_many')
+    _, batch, batch_retained = measure('parse_batch')
+
+    tokens = [token for parse in parses for token in parse.tokens]
+    analyses = [token.morph for token in tokens if token.has_morph]
+    start = time.perf_counter()
+    for analysis in analyses:
+        analysis.morphemes, analysis.remove_inflections(), analysis.stem
+    elapsed = time.perf_counter() - start
+
+    print(f'{len(parses)} sentences, {len(tokens)} tokens, {len(morphology.analysis_table)} distinct analyses')
+    print(f'Parse:      {retained / 2 ** 20:.1f} MiB, {retained / len(tokens):.0f} bytes/token')
+    print(f'ParseBatch: {batch_retained / 2 ** 20:.1f} MiB, {batch_retained / batch.n_tokens:.0f} bytes/token')
+    print(f'morphemes + remove_inflections + stem: {1e6 * elapsed / len(analyses):.2f} us/analysis')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,61 @@
+"""
+Compares the quantized disambiguation models with the float32 one: agreement of the selected
+analyses on a reference corpus (the share of sentences and tokens with the same selections as
+the float32 model), memory of the weights and latency per sentence.
+
+    python benchmarks/bench_quantization.py [--corpus CORPUS] [--sentences N] [--batch-size N]
+"""
+import argparse
+import time
+
+from yakutmorph.main import YakutMorph
+from yakutmorph.numpy_backend import YakutNumpyModel
+
+from corpus import load_corpus
+
+
+def measure(model: YakutNumpyModel, dags: list, batch_size: int) -> tuple:
+    start = time.perf_counter()
+    selections = list()
+    for i in range(0, len(dags), batch_size):
+        selections.extend(model.disambiguate_batch(dags[i:i + batch_size]))
+    return selections, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--corpus', help='A corpus with one sentence per line. Defaults to a synthetic corpus.')
+    parser.add_argument('--sentences', type=int, default=2000)
+    parser.add_argument('--batch-size', type=int, default=64)
+    args = parser.parse_args()
+
+    morphology = YakutMorph()
+    dags = [
+        dag for dag in (
+            parse.get_dag(morphology.mapper)
+            for parse in morphology.parse_many(load_corpus(args.corpus, args.sentences))
+            if parse.is_ambiguous()
+        )
+        if dag.is_ambiguous()
+    ]
+    n_tokens = sum(len(dag) - 2 for dag in dags)
+    print(f'{len(dags)} ambiguous sentences, {n_tokens} tokens, batch size {args.batch_size}')
+    print(f'{"model":<10}{"weights":>12}{"latency":>15}{"sentences":>12}{"tokens":>10}')
+
+    reference = None
+    for quantization in [None, 'float16', 'int8']:
+        model = YakutNumpyModel(quantization=quantization)
+        selections, elapsed = measure(model, dags, args.batch_size)
+        if reference is None:
+            reference = selections
+        same_sentences = sum(a == b for a, b in zip(selections, reference))
+        same_tokens = sum(x == y for a, b in zip(selections, reference) for x, y in zip(a, b))
+        print(
+            f'{quantization or "float32":<10}{model.model.nbytes / 1024:>9.0f} kB'
+            f'{1000 * elapsed / len(dags):>8.3f} ms/sent'
+            f'{100 * same_sentences / len(dags):>11.2f}%{100 * same_tokens / n_tokens:>9.2f}%'
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,51 @@
+"""
+Measures the startup time of yakutmorph: each scenario runs in a fresh interpreter, from the
+import of the package to the first result, and reports whether torch was loaded.
+
+    python benchmarks/bench_startup.py [--repeat N]
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+
+SENTENCE = 'Мин аатым Кэскил.'
+
+SCENARIOS = {
+    'import': 'import yakutmorph.main',
+    'construct': 'from yakutmorph.main import YakutMorph; YakutMorph()',
+    'tokenize': f'from yakutmorph.main import YakutMorph; YakutMorph().tokenizer.tokenize({SENTENCE!r})',
+    'analyse': f'from yakutmorph.main import YakutMorph; YakutMorph().transducer.analyse({SENTENCE.split()[1]!r})',
+    'parse': f'from yakutmorph.main import YakutMorph; YakutMorph().parse({SENTENCE!r})',
+}
+
+TEMPLATE = '''
+import json, sys, time
+start = time.perf_counter()
+{code}
+print(json.dumps([time.perf_counter() - start, 'torch' in sys.modules]))
+'''
+
+
+def run(code: str) -> tuple:
+    output = subprocess.run(
+        [sys.executable, '-c', TEMPLATE.format(code=code)], check=True, capture_output=True, text=True
+    ).stdout
+    return tuple(json.loads(output.splitlines()[-1]))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    print(f'{"scenario":<12}{"median":>10}{"min":>10}  torch')
+    for name, code in SCENARIOS.items():
+        results = [run(code) for _ in range(args.repeat)]
+        times = [elapsed for elapsed, _ in results]
+        print(f'{name:<12}{statistics.median(times):>9.3f}s{min(times):>9.3f}s  {"yes" if results[0][1] else "no"}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,191 @@
+"""
+End-to-end benchmark suite: measures each stage of the pipeline on a reproducible corpus and
+reports its throughput in tokens/s, the p50/p99 latency per call and the peak of the memory
+allocated by Python while the stage runs.
+
+Stages:
+    tokenize        YakutTokenizer.tokenize, per sentence
+    analyse[label]  YakutTransducerPipeline.analyse without caches, per word, by the transducer
+                    that analysed it (voc, syl, aff or fail)
+    get_dag         Parse.get_dag, per ambiguous sentence
+    encode          DAGEncoder.encode, per ambiguous sentence
+    disambiguate    the disambiguation model (YakutNumpyModel, and YakutModel with --torch), per DAG
+    conllu          CoNLLU, per sentence
+    conllu_writer   CoNLLUWriter.format, per sentence
+    parse           YakutMorph.parse end to end with cold caches, per sentence
+
+Each stage but `analyse` and `parse` runs a warm-up pass first, so that it measures the steady
+state rather than lazy loading. The results can be exported to JSON and compared with a
+previous run:
+
+    python benchmarks/bench_suite.py [--corpus CORPUS] [--sentences N] [--seed N] [--torch]
+        [--no-memory] [--output results.json] [--compare baseline.json]
+"""
+import argparse
+import datetime
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Sequence
+
+from yakutmorph.main import YakutMorph
+from yakutmorph.mappers import CoNLLU, CoNLLUWriter
+from yakutmorph.tokenizers import YakutTokenizer
+from yakutmorph.transducers import YakutTransducerPipeline
+from yakutmorph.wrappers import DAGEncoder
+
+from corpus import load_corpus
+
+
+def percentile(values: Sequence[float], p: float) -> float:
+    """
+    The nearest-rank percentile of a sorted sequence.
+    """
+    return values[min(len(values) - 1, max(0, round(p / 100 * len(values)) - 1))]
+
+
+def measure(items: Sequence, function: Callable, n_tokens: int, memory: bool, warm_up: bool = True) -> Dict:
+    """
+    Calls a function on each item and measures the latency of each call.
+
+    :param items: The inputs of the function.
+    :param function: The function to measure.
+    :param n_tokens: The number of tokens in the items.
+    :param memory: Run the items once more under tracemalloc to measure the peak memory.
+    :param warm_up: Run the items once before measuring.
+    :return: A dictionary with the results of the stage.
+    """
+    if warm_up:
+        for item in items:
+            function(item)
+    latencies = list()
+    for item in items:
+        start = time.perf_counter()
+        function(item)
+        latencies.append(time.perf_counter() - start)
+    latencies.sort()
+    seconds = sum(latencies)
+    result = {
+        'calls': len(items),
+        'tokens': n_tokens,
+        'seconds': seconds,
+        'tokens_per_s': n_tokens / seconds if seconds else None,
+        'p50_ms': 1000 * percentile(latencies, 50) if latencies else None,
+        'p99_ms': 1000 * percentile(latencies, 99) if latencies else None,
+        'peak_kib': None
+    }
+    if memory:
+        tracemalloc.start()
+        for item in items:
+            function(item)
+        result['peak_kib'] = tracemalloc.get_traced_memory()[1] / 1024
+        tracemalloc.stop()
+    return result
+
+
+def run(sentences: List[str], use_torch: bool, memory: bool) -> Dict[str, Dict]:
+    stages = dict()
+    tokenizer = YakutTokenizer()
+    tokens = [tokenizer.tokenize(sentence) for sentence in sentences]
+    n_tokens = sum(len(sentence_tokens) for sentence_tokens in tokens)
+    stages['tokenize'] = measure(sentences, tokenizer.tokenize, n_tokens, memory)
+
+    # The transducers are timed without caches, on every word with morphology
+    pipeline = YakutTransducerPipeline(cache_size=0)
+    has_morphology = tokenizer.has_morphology()
+    words = [token for sentence_tokens in tokens for token, token_type in sentence_tokens if token_type in has_morphology]
+    by_label = dict()
+    for word in words:
+        by_label.setdefault(pipeline.analyse(word)[0].label, []).append(word)
+    stages['analyse'] = measure(words, pipeline.analyse, len(words), memory, warm_up=False)
+    for label, label_words in by_label.items():
+        stages[f'analyse[{label}]'] = measure(label_words, pipeline.analyse, len(label_words), False, warm_up=False)
+
+    morphology = YakutMorph().load()
+    parses = morphology.parse_many(sentences)
+    ambiguous = [parse for parse in parses if parse.is_ambiguous()]
+    n_ambiguous = sum(len(parse.tokens) for parse in ambiguous)
+    stages['get_dag'] = measure(ambiguous, lambda parse: parse.get_dag(morphology.mapper), n_ambiguous, memory)
+    encoder = DAGEncoder(morphology.mapper, *morphology.disambiguation_model.get_vocabulary())
+    stages['encode'] = measure(ambiguous, encoder.encode, n_ambiguous, memory)
+
+    dags = [(dag, len(dag) - 2) for dag in (parse.get_dag(morphology.mapper) for parse in ambiguous) if dag.is_ambiguous()]
+    models = {'disambiguate': morphology.disambiguation_model}
+    if use_torch:
+        from yakutmorph.disambiguation import YakutModel
+        models['disambiguate[torch]'] = YakutModel()
+    for name, model in models.items():
+        stages[name] = measure(
+            [dag for dag, _ in dags], model.disambiguate, sum(n for _, n in dags), memory
+        )
+
+    stages['conllu'] = measure(parses, CoNLLU, n_tokens, memory)
+    stages['conllu_writer'] = measure(parses, CoNLLUWriter().format, n_tokens, memory)
+
+    # A YakutMorph object with its components loaded, but with cold caches
+    def parse_cold() -> Callable:
+        cold = YakutMorph(disambiguation_model=morphology.disambiguation_model, mapper=morphology.mapper)
+        cold.transducer
+        return cold.parse
+
+    stages['parse'] = measure(sentences, parse_cold(), n_tokens, False, warm_up=False)
+    if memory:
+        stages['parse']['peak_kib'] = measure(sentences, parse_cold(), n_tokens, True, warm_up=False)['peak_kib']
+    return stages
+
+
+def report(stages: Dict[str, Dict], baseline: Dict[str, Dict] = None) -> None:
+    header = f'{"stage":<22}{"calls":>8}{"tokens/s":>12}{"p50 ms":>10}{"p99 ms":>10}{"peak KiB":>11}'
+    print(header + (f'{"vs base":>10}' if baseline else ''))
+    for name, stage in stages.items():
+        line = (
+            f'{name:<22}{stage["calls"]:>8}{stage["tokens_per_s"] or 0:>12.0f}'
+            f'{stage["p50_ms"] or 0:>10.3f}{stage["p99_ms"] or 0:>10.3f}'
+            f'{stage["peak_kib"] if stage["peak_kib"] is not None else float("nan"):>11.0f}'
+        )
+        base = baseline.get(name) if baseline else None
+        if base and base.get('tokens_per_s') and stage['tokens_per_s']:
+            line += f'{stage["tokens_per_s"] / base["tokens_per_s"]:>9.2f}x'
+        print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--corpus', help='A corpus with one sentence per line. Defaults to a synthetic corpus.')
+    parser.add_argument('--sentences', type=int, default=1000)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--torch', action='store_true', help='Also measure the PyTorch YakutModel.')
+    parser.add_argument('--no-memory', action='store_true', help='Do not measure the peak memory of the stages.')
+    parser.add_argument('--output', help='Write the results to a JSON file.')
+    parser.add_argument('--compare', help='A JSON file of a previous run to compare the throughput with.')
+    args = parser.parse_args()
+
+    sentences = load_corpus(args.corpus, args.sentences, args.seed)
+    stages = run(sentences, args.torch, not args.no_memory)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            baseline = json.load(f)['stages']
+    report(stages, baseline)
+
+    if args.output:
+        results = {
+            'date': datetime.datetime.now().isoformat(timespec='seconds'),
+            'python': sys.version.split()[0],
+            'platform': platform.platform(),
+            'corpus': {
+                'path': args.corpus,
+                'sentences': len(sentences),
+                'seed': None if args.corpus else args.seed
+            },
+            'stages': stages
+        }
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
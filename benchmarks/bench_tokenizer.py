@@ -0,0 +1,61 @@
+"""
+Compares the throughput of YakutTokenizer with the re.Scanner-based implementation it replaced.
+
+    python benchmarks/bench_tokenizer.py [--corpus CORPUS] [--repeat N]
+"""
+import argparse
+import re
+import time
+
+from yakutmorph.tokenizers import YakutTokenizer
+
+from corpus import load_corpus
+
+
+def scanner_tokenizer(tokenizer: YakutTokenizer) -> re.Scanner:
+    """
+    Builds the previous re.Scanner implementation from the rules of the tokenizer.
+    """
+    def action(token_type):
+        return lambda scanner, token: (token, token_type)
+
+    return re.Scanner([
+        (pattern, None if name == 'SPACE' else action(tokenizer.types[name]))
+        for name, pattern in tokenizer.rules
+    ])
+
+
+def measure(function, text: str, repeat: int) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function(text)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--corpus', help='A corpus with one sentence per line. Defaults to a synthetic corpus.')
+    parser.add_argument('--sentences', type=int, default=5000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    text = '\n'.join(load_corpus(args.corpus, args.sentences))
+    tokenizer = YakutTokenizer()
+    scanner = scanner_tokenizer(tokenizer)
+
+    tokens, remainder = scanner.scan(text)
+    assert not remainder and tokens == tokenizer.tokenize(text), 'The outputs of the tokenizers differ'
+
+    before = measure(scanner.scan, text, args.repeat)
+    after = measure(tokenizer.tokenize, text, args.repeat)
+    megabytes = len(text.encode('utf-8')) / 1e6
+    print(f'{len(tokens)} tokens, {megabytes:.1f} MB')
+    print(f're.Scanner:   {len(tokens) / before:12.0f} tokens/s {megabytes / before:8.2f} MB/s')
+    print(f'master regex: {len(tokens) / after:12.0f} tokens/s {megabytes / after:8.2f} MB/s')
+    print(f'speed-up:     {before / after:12.2f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+"""
+A reproducible synthetic Sakha corpus for the benchmarks.
+
+Sentences are built from the lexical roots of the transducer sources (src/lexicons), inflected
+with the vocabulary-based transducer, and mixed with numbers, Roman numerals, URIs and punctuation.
+"""
+import os
+import random
+from typing import Iterator, List
+
+from yakutmorph.transducers import YakutTransducer
+
+ROOTS = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src', 'lexicons', 'lexical_roots.lex')
+
+NOUN_TAGS = ['', '+PL', '+ACC', '+DAT', '+ABL', '+INST', '+COMIT', '+LOC', '+POSS.1SG', '+POSS.3SG', '+PL+ACC']
+VERB_TAGS = ['', '+PST.1SG', '+PST.3SG', '+PST.3PL', '+NEG', '+PART_PAST', '+CONV#1', '+IMP', '+3SG']
+EXTRA = ['мин', 'саха', 'үйэ', 'бары', 'бу', 'ол', 'эбит', 'XIX', '1949', '10', 'https://www.trud.ru', '01/04/2024']
+
+
+def load_roots(path: str = ROOTS) -> List[List[str]]:
+    with open(path, encoding='utf-8') as f:
+        return [line.strip().rstrip('>').split('<', 1) for line in f if '<' in line]
+
+
+def generate_sentences(n_sentences: int, seed: int = 0, transducer: YakutTransducer = None) -> Iterator[str]:
+    """
+    Generates a reproducible sequence of synthetic sentences.
+
+    :param n_sentences: The number of sentences.
+    :param seed: The seed of the random generator.
+    :param transducer: The transducer used to inflect the roots. Defaults to YakutTransducer.
+    :return: An iterator over the sentences.
+    """
+    rng = random.Random(seed)
+    transducer = transducer if transducer else YakutTransducer()
+    roots = load_roots()
+
+    def word() -> str:
+        if rng.random() < 0.15:
+            return rng.choice(EXTRA)
+        lemma, stem = rng.choice(roots)
+        if stem.startswith('noun'):
+            tag, tags = '^N', NOUN_TAGS
+        elif stem.startswith('propn'):
+            tag, tags = '^PN', NOUN_TAGS[:4]
+        elif stem.startswith(('intr', 'tran')):
+            tag, tags = '^V', VERB_TAGS
+        elif stem.startswith('adj'):
+            tag, tags = '^Adj', ['']
+        else:
+            return lemma
+        forms = transducer.generate(lemma + tag + rng.choice(tags))
+        return sorted(forms)[0] if forms else lemma
+
+    for _ in range(n_sentences):
+        words = [word() for _ in range(rng.randint(3, 20))]
+        words[0] = words[0][:1].upper() + words[0][1:]
+        for i in range(1, len(words) - 1):
+            if rng.random() < 0.08:
+                words[i] += ','
+        yield ' '.join(words) + rng.choice(['.', '.', '.', '?', '!', '...'])
+
+
+def load_corpus(path: str = None, n_sentences: int = 2000, seed: int = 0) -> List[str]:
+    """
+    Loads a corpus with one sentence per line, or generates a synthetic one if no path is given.
+    """
+    if path:
+        with open(path, encoding='utf-8') as f:
+            return [line.strip() for line in f if line.strip()]
+    return list(generate_sentences(n_sentences, seed))
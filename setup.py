@@ -18,13 +18,20 @@ setup(
     packages=find_packages(),
     include_package_data=True,
     package_data={
-        'yakutmorph': ['data/*.yaml', 'data/*.pkl', 'data/*.pth'],
+        'yakutmorph': ['data/*.yaml', 'data/*.pkl', 'data/*.pth', 'data/*.npz'],
     },
     install_requires=[
         'sfst-transduce>=1.0.2',
-        'torch>=1.10.0',
-        'PyYAML>=6.0.1'
+        'numpy>=1.17',
+        'PyYAML>=6.0.1',
+        'importlib_resources>=1.3; python_version < "3.9"'
     ],
+    extras_require={
+        'torch': ['torch>=1.10.0'],
+    },
+    entry_points={
+        'console_scripts': ['yakutmorph=yakutmorph.cli:main'],
+    },
     keywords=['python', 'morphology', 'analyzer', 'Yakut', 'Sakha', 'NLP'],
     classifiers=[
         "Development Status :: 1 - Planning",
@@ -0,0 +1,91 @@
+import asyncio
+from concurrent.futures import Executor, Future
+import unittest
+from yakutmorph.aio import AsyncYakutMorph
+from yakutmorph.main import YakutMorph
+from yakutmorph.mappers import CoNLLU
+
+
+class TestAsyncYakutMorph(unittest.TestCase):
+
+    sentences = [
+        'Мин аатым Кэскил.',
+        'Мама Егора учуутал.',
+        'Хаартыска https://www.trud.ru саайтан.',
+        'XIX үйэҕэ 1949 сыллаахха 10 киһи кэлбитэ!'
+    ]
+
+    @classmethod
+    def setUpClass(cls):
+        cls.morphology = YakutMorph().load()
+        cls.expected = [CoNLLU(cls.morphology.parse(sentence)) for sentence in cls.sentences]
+
+    def test_parse(self):
+        async def run():
+            async with AsyncYakutMorph(self.morphology, max_batch_size=3, max_wait=0.1) as morphology:
+                parses = await asyncio.gather(*[morphology.parse(sentence) for sentence in 2 * self.sentences])
+                return parses, morphology.n_batches
+
+        parses, n_batches = asyncio.run(run())
+        self.assertEqual([CoNLLU(parse) for parse in parses], 2 * self.expected)
+        # The concurrent requests are coalesced into full batches
+        self.assertEqual(n_batches, 3)
+
+    def test_annotate(self):
+        async def run():
+            async with AsyncYakutMorph(self.morphology) as morphology:
+                return await asyncio.gather(
+                    morphology.annotate(self.sentences[0], 'conllu', ['# sent_id = 1']),
+                    morphology.annotate(self.sentences[1], 'json'),
+                    morphology.parse_many(self.sentences)
+                )
+
+        conllu, annotation, parses = asyncio.run(run())
+        self.assertEqual(conllu, CoNLLU(self.morphology.parse(self.sentences[0]), ['# sent_id = 1']))
+        self.assertEqual(annotation['parses'][0]['text'], 'Мама')
+        self.assertEqual([CoNLLU(parse) for parse in parses], self.expected)
+
+    def test_errors(self):
+        async def run():
+            async with AsyncYakutMorph(self.morphology) as morphology:
+                return await asyncio.gather(
+                    morphology.parse(self.sentences[0]), morphology.parse(None), return_exceptions=True
+                )
+
+        parse, error = asyncio.run(run())
+        self.assertEqual(CoNLLU(parse), self.expected[0])
+        self.assertIsInstance(error, Exception)
+        with self.assertRaises(ValueError):
+            asyncio.run(AsyncYakutMorph(self.morphology).annotate(self.sentences[0], 'xml'))
+
+
+    def test_close(self):
+        async def run():
+            morphology = AsyncYakutMorph(self.morphology, max_wait=10.0)
+            tasks = [asyncio.ensure_future(morphology.parse(sentence)) for sentence in self.sentences]
+            await asyncio.sleep(0)
+            # The batch is dispatched without waiting for the timer
+            await asyncio.wait_for(morphology.close(), 5.0)
+            return [task.result() for task in tasks]
+
+        self.assertEqual([CoNLLU(parse) for parse in asyncio.run(run())], self.expected)
+
+    def test_cancelled_batch(self):
+        class CancellingExecutor(Executor):
+            def submit(self, fn, *args, **kwargs):
+                future = Future()
+                future.cancel()
+                return future
+
+        async def run():
+            morphology = AsyncYakutMorph(self.morphology, executor=CancellingExecutor())
+            results = await asyncio.wait_for(
+                asyncio.gather(morphology.parse(self.sentences[0]), return_exceptions=True), 5.0
+            )
+            await asyncio.wait_for(morphology.close(), 5.0)
+            return results
+
+        self.assertIsInstance(asyncio.run(run())[0], asyncio.CancelledError)
+
+if __name__ == '__main__':
+    unittest.main()
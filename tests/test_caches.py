@@ -0,0 +1,105 @@
+import os
+import tempfile
+import unittest
+from yakutmorph.caches import LRUAnalysisCache, SQLiteAnalysisCache
+from yakutmorph.transducers import YakutTransducerPipeline
+
+
+class TestLRUAnalysisCache(unittest.TestCase):
+
+    def setUp(self):
+        self.cache = LRUAnalysisCache(maxsize=2)
+
+    def test_get(self):
+        self.cache.put('дьоннор', 'voc', ['дьон^N+PL'])
+        self.assertEqual(self.cache.get('дьоннор'), ('voc', ('дьон^N+PL',)))
+        self.assertIsNone(self.cache.get('аатым'))
+        self.assertEqual(self.cache.info()[:2], (1, 1))
+
+    def test_eviction(self):
+        self.cache.put('дьоннор', 'voc', ['дьон^N+PL'])
+        self.cache.put('аатым', 'voc', ['аат^N+POSS.1SG'])
+        self.cache.get('дьоннор')
+        self.cache.put('мин', 'voc', ['мин^N', 'мин^Pron'])
+        self.assertIsNone(self.cache.get('аатым'))
+        self.assertIsNotNone(self.cache.get('дьоннор'))
+        self.assertEqual(self.cache.info().evictions, 1)
+        self.assertEqual(self.cache.info().currsize, 2)
+
+
+class TestSQLiteAnalysisCache(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'analyses.db')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_persistence(self):
+        cache = SQLiteAnalysisCache(self.path, 'fingerprint')
+        cache.put('дьоннор', 'voc', ['дьон^N+PL'])
+        cache.close()
+        cache = SQLiteAnalysisCache(self.path, 'fingerprint')
+        self.assertEqual(cache.get('дьоннор'), ('voc', ('дьон^N+PL',)))
+        cache.close()
+
+    def test_concurrent_readers(self):
+        writer = SQLiteAnalysisCache(self.path, 'fingerprint')
+        reader = SQLiteAnalysisCache(self.path, 'fingerprint')
+        writer.put('дьоннор', 'voc', ['дьон^N+PL'])
+        self.assertIsNone(reader.get('дьоннор'))
+        writer.flush()
+        self.assertEqual(reader.get('дьоннор'), ('voc', ('дьон^N+PL',)))
+        writer.close()
+        reader.close()
+
+    def test_fingerprint(self):
+        cache = SQLiteAnalysisCache(self.path, 'fingerprint')
+        cache.put('дьоннор', 'voc', ['дьон^N+PL'])
+        cache.close()
+        cache = SQLiteAnalysisCache(self.path, 'other fingerprint')
+        self.assertIsNone(cache.get('дьоннор'))
+        self.assertEqual(cache.purge(), 1)
+        cache.close()
+
+
+class TestYakutTransducerPipelineCache(unittest.TestCase):
+
+    def setUp(self):
+        self.pipeline = YakutTransducerPipeline(cache_size=10)
+
+    def test_analyse(self):
+        fst, analyses = self.pipeline.analyse('Дьоннор')
+        cached_fst, cached_analyses = self.pipeline.analyse('дьоннор')
+        self.assertIs(fst, cached_fst)
+        self.assertEqual(analyses, cached_analyses)
+        self.assertEqual(self.pipeline.cache_info().hits, 1)
+
+    def test_fallback_keeps_case(self):
+        self.assertEqual(self.pipeline.analyse('Щ')[1], ['Щ^UNK'])
+        fst, analyses = self.pipeline.analyse('щ')
+        self.assertEqual(fst.label, 'fail')
+        self.assertEqual(analyses, ['щ^UNK'])
+
+    def test_warm_up(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'analyses.db')
+            pipeline = YakutTransducerPipeline(cache_path=path)
+            self.assertEqual(pipeline.warm_up(['дьоннор', 'Дьоннор', 'аатым']), 2)
+            pipeline.persistent_cache.close()
+
+            pipeline = YakutTransducerPipeline(cache_path=path)
+            fst, analyses = pipeline.analyse('аатым')
+            self.assertEqual((fst.label, analyses), ('voc', ['аат^N+POSS.1SG']))
+            self.assertEqual(pipeline.cache_info(persistent=True).hits, 1)
+            pipeline.persistent_cache.close()
+
+    def test_disabled_cache(self):
+        pipeline = YakutTransducerPipeline(cache_size=0)
+        self.assertIsNone(pipeline.cache_info())
+        self.assertEqual(pipeline.analyse('дьоннор')[1], ['дьон^N+PL'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,131 @@
+import json
+import os
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+import unittest
+from unittest import mock
+from yakutmorph.cli import main
+
+
+class TestCommandLine(unittest.TestCase):
+
+    sentences = [
+        'Мин аатым Кэскил.',
+        'Мама Егора учуутал.',
+        'Хаартыска https://www.trud.ru саайтан.'
+    ]
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.input = os.path.join(self.directory.name, 'input.txt')
+        self.output = os.path.join(self.directory.name, 'output.conllu')
+        with open(self.input, 'w', encoding='utf-8') as f:
+            f.write('\n'.join(self.sentences) + '\n')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def read_output(self):
+        with open(self.output, encoding='utf-8') as f:
+            return f.read()
+
+    def test_conllu(self):
+        main(['annotate', self.input, '-o', self.output, '--workers', '0'])
+        sentences = self.read_output().strip().split('\n\n')
+        headers = [sentence.split('\n')[0] for sentence in sentences]
+        self.assertEqual(headers, [f'# text = {sentence}' for sentence in self.sentences])
+        with open(f'{self.output}.offset') as f:
+            offsets = json.load(f)
+        self.assertEqual(offsets, {'input': os.path.getsize(self.input), 'output': os.path.getsize(self.output)})
+
+    def test_jsonl(self):
+        jsonl = os.path.join(self.directory.name, 'input.jsonl')
+        with open(jsonl, 'w', encoding='utf-8') as f:
+            for i, sentence in enumerate(self.sentences):
+                f.write(json.dumps({'id': i, 'text': sentence}, ensure_ascii=False) + '\n')
+        main([
+            'annotate', jsonl, '-o', self.output, '--workers', '0',
+            '--input-format', 'jsonl', '--output-format', 'json'
+        ])
+        annotations = [json.loads(line) for line in self.read_output().splitlines()]
+        self.assertEqual([annotation['id'] for annotation in annotations], [0, 1, 2])
+        self.assertEqual(annotations[1]['parses'][0]['text'], 'Мама')
+
+    def test_resume(self):
+        main(['annotate', self.input, '-o', self.output, '--workers', '0'])
+        expected = self.read_output()
+
+        # The offsets were saved after the first sentence, which was followed by a partly written one
+        first = expected.split('\n\n')[0] + '\n\n'
+        with open(self.output, 'w', encoding='utf-8') as f:
+            f.write(first + expected.split('\n\n')[1][:20])
+        with open(f'{self.output}.offset', 'w') as f:
+            json.dump({'input': len(self.sentences[0].encode('utf-8')) + 1, 'output': len(first.encode('utf-8'))}, f)
+        main(['annotate', self.input, '-o', self.output, '--workers', '0', '--resume'])
+        self.assertEqual(self.read_output(), expected)
+
+    def test_resume_after_write_error(self):
+        main(['annotate', self.input, '-o', self.output, '--workers', '0'])
+        expected = self.read_output()
+
+        class FailingStream:
+            # Fails on the annotation of the second sentence
+            def __init__(self, stream):
+                self.stream = stream
+                self.n_writes = 0
+
+            def write(self, text):
+                self.n_writes += 1
+                if self.n_writes == 2:
+                    raise OSError('No space left on device')
+                return self.stream.write(text)
+
+            def __getattr__(self, name):
+                return getattr(self.stream, name)
+
+        def failing_open(path, *args, **kwargs):
+            stream = open(path, *args, **kwargs)
+            return FailingStream(stream) if path == self.output else stream
+
+        with mock.patch('yakutmorph.cli.open', failing_open, create=True):
+            with self.assertRaises(OSError):
+                main(['annotate', self.input, '-o', self.output, '--workers', '0'])
+        self.assertEqual(self.read_output(), expected.split('\n\n')[0] + '\n\n')
+        main(['annotate', self.input, '-o', self.output, '--workers', '0', '--resume'])
+        self.assertEqual(self.read_output(), expected)
+
+    def test_resume_invalid_offsets(self):
+        main(['annotate', self.input, '-o', self.output, '--workers', '0'])
+        with open(f'{self.output}.offset', 'w') as f:
+            f.write('')
+        with self.assertRaises(SystemExit):
+            main(['annotate', self.input, '-o', self.output, '--workers', '0', '--resume'])
+
+    def test_resume_after_kill(self):
+        with open(self.input, 'w', encoding='utf-8') as f:
+            f.write('\n'.join(500 * self.sentences) + '\n')
+        main(['annotate', self.input, '-o', self.output, '--workers', '0', '--batch-size', '4'])
+        expected = self.read_output()
+        os.remove(self.output)
+        os.remove(f'{self.output}.offset')
+
+        args = ['annotate', self.input, '-o', self.output, '--workers', '0', '--batch-size', '4']
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        process = subprocess.Popen([sys.executable, '-m', 'yakutmorph', *args], cwd=root)
+        try:
+            # Killed once some batches have been written
+            while not os.path.exists(f'{self.output}.offset') and process.poll() is None:
+                time.sleep(0.01)
+            time.sleep(0.1)
+            process.send_signal(signal.SIGKILL)
+        finally:
+            process.wait()
+        self.assertLess(len(self.read_output()), len(expected))
+        main([*args, '--resume'])
+        self.assertEqual(self.read_output(), expected)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,50 @@
+import unittest
+from yakutmorph.disambiguation import YakutModel
+from yakutmorph.wrappers import DAG
+
+
+class TestYakutModel(unittest.TestCase):
+
+    def setUp(self):
+        self.model = YakutModel()
+
+    def test_disambiguate(self):
+        dag = [['<BOS>'], ['^N', '^Pron'], ['^N+POSS.1SG'], ['^N', '^PN'], ['<EOS>']]
+        expected = [1, 0, 1]
+        self.assertEqual(self.model.disambiguate(dag), expected)
+
+    def test_beam_search(self):
+        dag = [['<BOS>'], ['^N', '^Pron'], ['^N+POSS.1SG'], ['^N', '^PN'], ['<EOS>']]
+        expected = ['<BOS>', '^Pron', '^N+POSS.1SG', '^PN', '<EOS>']
+        self.assertEqual(self.model.beam_search(dag), expected)
+
+    def test_duplicated_analyses(self):
+        dag = [['<BOS>'], ['^N', '^N', '^Pron'], ['<EOS>']]
+        expected = ['<BOS>', '^Pron', '<EOS>']
+        self.assertEqual(self.model.beam_search(dag, beam_width=1), expected)
+
+    def test_collapsed_dag(self):
+        steps = [['<BOS>'], ['^N', '^N', '^Pron', '^N'], ['^N+POSS.1SG'], ['^PN', '^N', '^PN'], ['<EOS>']]
+        dag = DAG.collapse(steps)
+        self.assertEqual(dag.get_indexes(self.model.disambiguate(dag)), self.model.disambiguate(steps))
+
+    def test_unknown_nodes(self):
+        # Nodes out of the vocabulary are collapsed into a single candidate
+        dag = [['<BOS>'], ['^X', '^Y'], ['<EOS>']]
+        self.assertEqual(self.model.disambiguate(dag), [1])
+
+    def test_disambiguate_batch(self):
+        dags = [
+            [['<BOS>'], ['^N', '^Pron'], ['^N+POSS.1SG'], ['^N', '^PN'], ['<EOS>']],
+            [['<BOS>'], ['^N', '^Pron'], ['<STOP>'], ['<EOS>']],
+            [['<BOS>'], ['^N+PL'], ['^V', '^N', '^Adj'], ['^N+ACC', '^V+NEG'], ['^V+PST.3SG'], ['<STOP>'], ['<EOS>']]
+        ]
+        expected = [self.model.disambiguate(dag) for dag in dags]
+        self.assertEqual(self.model.disambiguate_batch(dags), expected)
+
+    def test_disambiguate_empty_batch(self):
+        self.assertEqual(self.model.disambiguate_batch([]), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
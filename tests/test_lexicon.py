@@ -0,0 +1,75 @@
+import os
+import pickle
+import tempfile
+import unittest
+from yakutmorph.lexicon import FullFormLexicon, write_lexicon
+from yakutmorph.transducers import YakutTransducerPipeline
+
+
+class TestFullFormLexicon(unittest.TestCase):
+
+    fingerprint = 'ab' * 32
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'lexicon.bin')
+        entries = [
+            ('дьоннор', 'voc', ['дьон^N+PL']),
+            ('мин', 'voc', ['мин^N', 'мин^Pron']),
+            ('щ', 'fail', []),
+            ('мин', 'aff', ['мин^V'])
+        ]
+        self.assertEqual(write_lexicon(self.path, entries, self.fingerprint), 3)
+        self.lexicon = FullFormLexicon(self.path, self.fingerprint)
+
+    def tearDown(self):
+        self.lexicon.close()
+        self.directory.cleanup()
+
+    def test_get(self):
+        self.assertEqual(self.lexicon.get('дьоннор'), ('voc', ('дьон^N+PL',)))
+        self.assertEqual(self.lexicon.get('мин'), ('voc', ('мин^N', 'мин^Pron')))
+        self.assertEqual(self.lexicon.get('щ'), ('fail', ()))
+        self.assertIsNone(self.lexicon.get('аатым'))
+        self.assertEqual(len(self.lexicon), 3)
+
+    def test_fingerprint(self):
+        with self.assertRaises(ValueError):
+            FullFormLexicon(self.path, 'cd' * 32)
+
+    def test_failed_write(self):
+        with self.assertRaises(ValueError):
+            write_lexicon(self.path, [('аатым', 'voc', ['аат^N+POSS.1SG'])], 'not a fingerprint')
+        # The temporary file is removed and the previous lexicon is left in place
+        self.assertEqual(os.listdir(self.directory.name), ['lexicon.bin'])
+        self.assertEqual(len(FullFormLexicon(self.path, self.fingerprint)), 3)
+
+    def test_pickle(self):
+        lexicon = pickle.loads(pickle.dumps(self.lexicon))
+        self.assertEqual(lexicon.get('дьоннор'), ('voc', ('дьон^N+PL',)))
+        lexicon.close()
+
+
+class TestYakutTransducerPipelineLexicon(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'lexicon.bin')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_build_lexicon(self):
+        pipeline = YakutTransducerPipeline(cache_size=0)
+        self.assertEqual(pipeline.build_lexicon(['Дьоннор', 'дьоннор', 'Щ'], self.path), 2)
+        lexicon_pipeline = YakutTransducerPipeline(cache_size=0, lexicon_path=self.path)
+        for surface_form in ['Дьоннор', 'Щ', 'аатым']:
+            fst, analyses = lexicon_pipeline.analyse(surface_form)
+            expected_fst, expected_analyses = pipeline.analyse(surface_form)
+            self.assertEqual((fst.label, analyses), (expected_fst.label, expected_analyses))
+        self.assertIn('дьоннор', lexicon_pipeline.lexicon)
+        lexicon_pipeline.lexicon.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,129 @@
+import io
+import subprocess
+import sys
+import unittest
+from yakutmorph.instrumentation import Profiler
+from yakutmorph.interfaces import DisambiguationModel
+from yakutmorph.main import YakutMorph
+from yakutmorph.mappers import CoNLLU, YakutAnnotation
+
+
+class TestYakutMorph(unittest.TestCase):
+
+    text = 'Мин аатым Кэскил. Мама Егора учуутал. Хаартыска https://www.trud.ru саайтан.'
+
+    @classmethod
+    def setUpClass(cls):
+        cls.morphology = YakutMorph()
+
+    def test_parse_many(self):
+        sentences = ['Мин аатым Кэскил.', 'Мама Егора учуутал.']
+        expected = [CoNLLU(self.morphology.parse(sentence)) for sentence in sentences]
+        self.assertEqual([CoNLLU(parse) for parse in self.morphology.parse_many(sentences)], expected)
+
+    def test_parse_batch(self):
+        sentences = ['Мин аатым Кэскил.', 'Мама Егора учуутал.', 'Хаартыска https://www.trud.ru саайтан.']
+        batch = self.morphology.parse_batch(sentences, batch_size=2)
+        expected = [CoNLLU(parse) for parse in self.morphology.parse_many(sentences)]
+        self.assertEqual(len(batch), 3)
+        self.assertEqual([CoNLLU(parse) for parse in batch], expected)
+        self.assertEqual(CoNLLU.from_batch(batch), expected)
+
+    def test_annotate_many(self):
+        sentences = ['Мин аатым Кэскил.', 'Мама Егора учуутал.']
+        parses = self.morphology.parse_many(sentences)
+        headers = [['# sent_id = 1'], None]
+        self.assertEqual(
+            self.morphology.annotate_many(sentences, 'conllu', headers),
+            [CoNLLU(parse, header) for parse, header in zip(parses, headers)]
+        )
+        self.assertEqual(self.morphology.annotate_many(sentences, 'json'), [YakutAnnotation(parse, None) for parse in parses])
+        self.assertEqual([parse.text for parse in self.morphology.annotate_many(sentences)], sentences)
+        with self.assertRaises(ValueError):
+            self.morphology.annotate_many(sentences, 'xml')
+
+    def test_model_without_vocabulary(self):
+        class StringModel(DisambiguationModel):
+            def __init__(self, model):
+                self.model = model
+
+            def disambiguate(self, graph):
+                return self.model.disambiguate(graph)
+
+        morphology = YakutMorph(disambiguation_model=StringModel(self.morphology.disambiguation_model))
+        self.assertIsNone(morphology.encoder)
+        self.assertEqual(CoNLLU(morphology.parse(self.text)), CoNLLU(self.morphology.parse(self.text)))
+        with self.assertRaises(TypeError):
+            morphology.disambiguation_model.disambiguate_incremental([[0], [1, 2], [3]])
+
+    def test_iter_parse(self):
+        parses = list(self.morphology.iter_parse(self.text, batch_size=2))
+        self.assertEqual([parse.text for parse in parses], [
+            'Мин аатым Кэскил.', 'Мама Егора учуутал.', 'Хаартыска https://www.trud.ru саайтан.'
+        ])
+        expected = [CoNLLU(self.morphology.parse(parse.text)) for parse in parses]
+        self.assertEqual([CoNLLU(parse) for parse in parses], expected)
+
+    def test_iter_parse_file(self):
+        parses = self.morphology.iter_parse(io.StringIO(self.text.replace('. ', '.\n')))
+        expected = [parse.text for parse in self.morphology.iter_parse(self.text)]
+        self.assertEqual([parse.text for parse in parses], expected)
+
+    def test_offsets(self):
+        parse = self.morphology.parse(' Мин  аатым Кэскил.')
+        self.assertEqual([(token.start, token.end) for token in parse.tokens], [(1, 4), (6, 11), (12, 18), (18, 19)])
+        self.assertTrue(CoNLLU(parse).split('\n')[1].endswith('\tTokenRange=1:4'))
+        for parse in self.morphology.iter_parse(self.text):
+            self.assertTrue(all(parse.text[token.start:token.end] == token.surface for token in parse.tokens))
+
+    def test_lazy_loading(self):
+        code = (
+            'import sys; from yakutmorph.main import YakutMorph; morphology = YakutMorph(); '
+            'morphology.tokenizer.tokenize("Мин аатым"); morphology.transducer.analyse("аатым"); '
+            'assert morphology._disambiguation_model is None; morphology.parse("Мин аатым Кэскил."); '
+            'assert "torch" not in sys.modules'
+        )
+        subprocess.run([sys.executable, '-c', code], check=True)
+
+    def test_reparse(self):
+        text = 'Мин аатым Кэскил. Мама Егора учуутал.'
+        parse = self.morphology.parse(text)
+        edits = [(4, 9, 'ааппын'), (0, 0, 'Бу '), (3, 4, ''), (len(text), len(text), ' XIX үйэ, 1949 с.'), (0, 3, '')]
+        for start, end, replacement in edits:
+            text = parse.text[:start] + replacement + parse.text[end:]
+            parse = self.morphology.reparse(parse, start, end, replacement)
+            expected = self.morphology.parse(text)
+            self.assertEqual(parse.text, text)
+            self.assertEqual(CoNLLU(parse), CoNLLU(expected))
+        with self.assertRaises(ValueError):
+            self.morphology.reparse(parse, 5, 2, '')
+
+    def test_instrumentation(self):
+        sentences = ['Мин аатым Кэскил.', 'Мама Егора учуутал.', 'Хаартыска https://www.trud.ru саайтан.']
+        profiler = Profiler()
+        morphology = YakutMorph(
+            transducer=self.morphology.transducer, disambiguation_model=self.morphology.disambiguation_model,
+            instrumentation=profiler
+        )
+        expected = [CoNLLU(parse) for parse in self.morphology.parse_many(sentences)]
+        self.assertEqual([CoNLLU(parse) for parse in morphology.parse_many(sentences)], expected)
+        self.assertEqual([CoNLLU(parse) for parse in morphology.iter_parse(' '.join(sentences))], expected)
+        self.assertEqual(CoNLLU.from_batch(morphology.parse_batch(sentences)), expected)
+
+        profile = profiler.as_dict()
+        n_tokens = 3 * sum(len(morphology.tokenizer.tokenize(sentence)) for sentence in sentences)
+        self.assertEqual(profile['stages']['tokenize']['count'], n_tokens)
+        self.assertEqual(profile['stages']['analyse']['count'], sum(profile['transducers'].values()))
+        self.assertEqual(profile['stages']['dag']['count'], profile['ambiguity']['dags'])
+        self.assertGreater(profile['stages']['disambiguate']['count'], 0)
+        self.assertGreaterEqual(profile['ambiguity']['analyses_per_token'], 1)
+        self.assertIn('voc', profile['transducers'])
+        self.assertIn('memory', profile['caches'])
+        self.assertIn('disambiguate', profiler.summary())
+
+        profiler.reset()
+        self.assertEqual(profiler.as_dict()['stages'], {})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,44 @@
+import io
+import unittest
+from yakutmorph.main import YakutMorph
+from yakutmorph.mappers import CoNLLU, CoNLLUWriter
+
+
+class TestCoNLLUWriter(unittest.TestCase):
+
+    sentences = [
+        'Мин аатым Кэскил.',
+        'Мама Егора учуутал.',
+        'Хаартыска https://www.trud.ru саайтан.',
+        'XIX үйэҕэ 1949 сыллаахха 10 киһи кэлбитэ!'
+    ]
+
+    @classmethod
+    def setUpClass(cls):
+        cls.morphology = YakutMorph()
+        cls.parses = cls.morphology.parse_many(cls.sentences)
+
+    def test_format(self):
+        writer = CoNLLUWriter()
+        for _ in range(2):
+            self.assertEqual([writer.format(parse) for parse in self.parses], [CoNLLU(parse) for parse in self.parses])
+        header = ['# sent_id = 1', f'# text = {self.sentences[0]}']
+        self.assertEqual(writer.format(self.parses[0], header), CoNLLU(self.parses[0], header))
+
+    def test_format_batch(self):
+        batch = self.morphology.parse_batch(self.sentences)
+        headers = [[f'# sent_id = {i}'] for i in range(len(self.sentences))]
+        expected = [CoNLLU(parse, header) for parse, header in zip(self.parses, headers)]
+        self.assertEqual(CoNLLUWriter().format_batch(batch, headers), expected)
+
+    def test_write(self):
+        stream = io.StringIO()
+        writer = CoNLLUWriter(stream)
+        writer.write(self.parses[0])
+        writer.write_batch(self.morphology.parse_batch(self.sentences[1:]))
+        self.assertEqual(stream.getvalue(), ''.join(CoNLLU(parse) + '\n\n' for parse in self.parses))
+        self.assertLessEqual(len(writer.analyses), sum(len(parse.tokens) for parse in self.parses))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,90 @@
+import unittest
+import numpy as np
+
+from yakutmorph.numpy_backend import YakutNumpyModel, quantize
+from yakutmorph.wrappers import DAG
+
+try:
+    from yakutmorph.disambiguation import YakutModel
+except ImportError:
+    YakutModel = None
+
+
+class TestYakutNumpyModel(unittest.TestCase):
+
+    dags = [
+        [['<BOS>'], ['^N', '^Pron'], ['^N+POSS.1SG'], ['^N', '^PN'], ['<EOS>']],
+        [['<BOS>'], ['^N', '^Pron'], ['<STOP>'], ['<EOS>']],
+        [['<BOS>'], ['^N+PL'], ['^V', '^N', '^Adj'], ['^N+ACC', '^V+NEG'], ['^V+PST.3SG'], ['<STOP>'], ['<EOS>']],
+        DAG.collapse([['<BOS>'], ['^N', '^N', '^Pron', '^N'], ['^N+POSS.1SG'], ['^PN', '^N', '^PN'], ['<EOS>']])
+    ]
+
+    @classmethod
+    def setUpClass(cls):
+        cls.model = YakutNumpyModel()
+
+    def test_disambiguate(self):
+        self.assertEqual(self.model.disambiguate(self.dags[0]), [1, 0, 1])
+
+    def test_beam_search(self):
+        expected = ['<BOS>', '^Pron', '^N+POSS.1SG', '^PN', '<EOS>']
+        self.assertEqual(self.model.beam_search(self.dags[0]), expected)
+
+    def test_disambiguate_batch(self):
+        expected = [self.model.disambiguate(dag) for dag in self.dags]
+        self.assertEqual(self.model.disambiguate_batch(self.dags), expected)
+        self.assertEqual(self.model.disambiguate_batch([]), [])
+
+    def test_disambiguate_encoded(self):
+        stoi, unknown_idx = self.model.get_vocabulary()
+        dags = [DAG.collapse([[stoi.get(node, unknown_idx) for node in step] for step in dag]) for dag in self.dags[:3]]
+        self.assertEqual(self.model.disambiguate_encoded(dags), self.model.disambiguate_batch(self.dags[:3]))
+        self.assertEqual(self.model.disambiguate_encoded([]), [])
+
+    def test_disambiguate_incremental(self):
+        stoi, unknown_idx = self.model.get_vocabulary()
+        dags = [DAG.collapse([[stoi.get(node, unknown_idx) for node in step] for step in dag]) for dag in [
+            [['<BOS>'], ['^N+PL'], ['^V', '^N', '^Adj'], ['^N+ACC', '^V+NEG'], ['^V+PST.3SG'], ['<STOP>'], ['<EOS>']],
+            [['<BOS>'], ['^N+PL'], ['^V', '^N', '^Adj'], ['^N', '^Pron'], ['^V+PST.3SG'], ['<STOP>'], ['<EOS>']],
+            [['<BOS>'], ['^N+PL'], ['^V', '^N', '^Adj'], ['^N', '^Pron'], ['<STOP>'], ['<EOS>']],
+            [['<BOS>'], ['^N+PL'], ['^V', '^N', '^Adj'], ['^N', '^Pron'], ['<STOP>'], ['<EOS>']]
+        ]]
+        state = None
+        for dag, n_reused in zip(dags, [0, 3, 4, 6]):
+            indexes, state = self.model.disambiguate_incremental(dag, state)
+            self.assertEqual(indexes, self.model.disambiguate_encoded([dag])[0])
+            self.assertEqual(state.n_reused, n_reused)
+
+    def test_quantization(self):
+        for quantization in ['float16', 'int8']:
+            model = YakutNumpyModel(quantization=quantization)
+            self.assertLess(model.model.nbytes, self.model.model.nbytes)
+            self.assertEqual(model.disambiguate(self.dags[0]), [1, 0, 1])
+
+    def test_quantize(self):
+        weight = np.random.default_rng(0).normal(size=(10, 8)).astype(np.float32)
+        weight[3] = 0
+        quantized, scale = quantize(weight, 'int8')
+        self.assertEqual(quantized.dtype, np.int8)
+        self.assertTrue(np.all(np.abs(quantized * scale[:, None] - weight) <= scale[:, None] / 2 + 1e-7))
+        self.assertEqual(quantize(weight, 'float16')[0].dtype, np.float16)
+        self.assertIs(quantize(weight, None)[0], weight)
+        with self.assertRaises(ValueError):
+            quantize(weight, 'int4')
+
+    @unittest.skipIf(YakutModel is None, 'torch is not installed')
+    def test_same_selections(self):
+        model = YakutModel()
+        self.assertEqual(self.model.disambiguate_batch(self.dags), model.disambiguate_batch(self.dags))
+        dags = [DAG.collapse([[model.stoi.get(node, model.unknown_idx) for node in step] for step in dag]) for dag in self.dags[:3]]
+        self.assertEqual(self.model.disambiguate_encoded(dags), model.disambiguate_encoded(dags))
+        for beam_width in [1, 3]:
+            for dag in self.dags:
+                self.assertEqual(
+                    self.model.beam_search(dag, beam_width, apply_softmax=False),
+                    model.beam_search(dag, beam_width, apply_softmax=False)
+                )
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,43 @@
+import unittest
+from yakutmorph.main import YakutMorph
+from yakutmorph.mappers import CoNLLU
+from yakutmorph.parallel import ParallelAnnotator
+
+
+class TestParallelAnnotator(unittest.TestCase):
+
+    sentences = [
+        'Мин аатым Кэскил.',
+        'Мама Егора учуутал.',
+        'Ити саха хомустара бары XIX үйэ бүтүүтэ – XX үйэ бастакы аҥаарыгар оҥоһуллубуттар.',
+        '1949 сыллаахха оруобуна ахсынньы 10 күнүгэр аан бастаан көрдөрүллүбүт эбит.',
+        'Хаартыска https://www.trud.ru саайтан.'
+    ]
+
+    @classmethod
+    def setUpClass(cls):
+        morphology = YakutMorph()
+        cls.expected = [CoNLLU(morphology.parse(sentence)) for sentence in cls.sentences]
+
+    def test_annotate(self):
+        with ParallelAnnotator(workers=2, output_format='conllu', chunk_size=2, max_in_flight=1) as annotator:
+            self.assertEqual(list(annotator.annotate(self.sentences)), self.expected)
+
+    def test_annotate_parses(self):
+        with ParallelAnnotator(workers=1, chunk_size=2) as annotator:
+            parses = list(annotator.annotate(self.sentences))
+        self.assertEqual([CoNLLU(parse) for parse in parses], self.expected)
+
+    def test_annotate_in_process(self):
+        annotator = ParallelAnnotator(workers=0, output_format='json')
+        annotations = list(annotator.annotate(self.sentences))
+        first_tokens = [annotation['parses'][0]['text'] for annotation in annotations]
+        self.assertEqual(first_tokens, ['Мин', 'Мама', 'Ити', '1949', 'Хаартыска'])
+
+    def test_unknown_format(self):
+        with self.assertRaises(ValueError):
+            ParallelAnnotator(output_format='xml')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,168 @@
+import asyncio
+import http.client
+import json
+import os
+import socket
+import tempfile
+import threading
+import unittest
+from yakutmorph.aio import AsyncYakutMorph
+from yakutmorph.main import YakutMorph
+from yakutmorph.mappers import CoNLLU, YakutAnnotation
+from yakutmorph.server import AnnotationServer, HTTPError
+
+
+class TestAnnotationServer(unittest.TestCase):
+
+    sentences = [
+        'Мин аатым Кэскил.',
+        'Мама Егора учуутал.',
+        'Хаартыска https://www.trud.ru саайтан.'
+    ]
+
+    @classmethod
+    def setUpClass(cls):
+        cls.morphology = YakutMorph().load()
+        cls.directory = tempfile.TemporaryDirectory()
+        cls.socket_path = os.path.join(cls.directory.name, 'yakutmorph.sock')
+        cls.loop = asyncio.new_event_loop()
+        cls.server = AnnotationServer(AsyncYakutMorph(cls.morphology))
+
+        async def start():
+            await cls.server.load()
+            return await cls.server.start(port=0), await cls.server.start(path=cls.socket_path)
+
+        cls.listeners = cls.loop.run_until_complete(start())
+        cls.port = cls.listeners[0].sockets[0].getsockname()[1]
+        cls.thread = threading.Thread(target=cls.loop.run_forever, daemon=True)
+        cls.thread.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        async def stop():
+            for listener in cls.listeners:
+                listener.close()
+                await listener.wait_closed()
+            await cls.server.morph.close()
+
+        asyncio.run_coroutine_threadsafe(stop(), cls.loop).result()
+        cls.loop.call_soon_threadsafe(cls.loop.stop)
+        cls.thread.join()
+        cls.loop.close()
+        cls.directory.cleanup()
+
+    def request(self, method, path, body=None, connection=None):
+        connection = connection or http.client.HTTPConnection('127.0.0.1', self.port, timeout=30)
+        connection.request(method, path, body=json.dumps(body) if body is not None else None)
+        response = connection.getresponse()
+        return response.status, json.loads(response.read())
+
+    def test_annotate(self):
+        status, response = self.request('POST', '/annotate', {'text': self.sentences[0]})
+        self.assertEqual(status, 200)
+        expected = YakutAnnotation(self.morphology.parse(self.sentences[0]), {'text': self.sentences[0]})
+        self.assertEqual(response['annotation'], expected)
+
+        texts = [self.sentences[0], {'id': 7, 'text': self.sentences[1]}, self.sentences[2]]
+        status, response = self.request('POST', '/annotate', {'texts': texts, 'format': 'conllu'})
+        self.assertEqual(status, 200)
+        headers = [
+            [f'# text = {self.sentences[0]}'],
+            ['# sent_id = 7', f'# text = {self.sentences[1]}'],
+            [f'# text = {self.sentences[2]}']
+        ]
+        expected = [CoNLLU(self.morphology.parse(sentence), header) for sentence, header in zip(self.sentences, headers)]
+        self.assertEqual(response['annotations'], expected)
+
+    def test_concurrent_requests(self):
+        results = [None] * 8
+
+        def annotate(i):
+            results[i] = self.request('POST', '/annotate', {'texts': self.sentences, 'format': 'conllu'})
+
+        threads = [threading.Thread(target=annotate, args=(i,)) for i in range(len(results))]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        expected = [CoNLLU(self.morphology.parse(sentence), [f'# text = {sentence}']) for sentence in self.sentences]
+        self.assertEqual(results, [(200, {'annotations': expected})] * len(results))
+
+    def test_keep_alive(self):
+        connection = http.client.HTTPConnection('127.0.0.1', self.port, timeout=30)
+        for sentence in self.sentences:
+            self.assertEqual(self.request('POST', '/annotate', {'text': sentence}, connection)[0], 200)
+        connection.close()
+
+    def test_errors(self):
+        self.assertEqual(self.request('POST', '/annotate', {'sentence': 'Мин'})[0], 400)
+        self.assertEqual(self.request('POST', '/annotate', {'text': 'Мин', 'format': 'xml'})[0], 400)
+        self.assertEqual(self.request('GET', '/annotate')[0], 405)
+        self.assertEqual(self.request('GET', '/unknown')[0], 404)
+        connection = http.client.HTTPConnection('127.0.0.1', self.port, timeout=30)
+        connection.request('POST', '/annotate', body='{')
+        self.assertEqual(connection.getresponse().status, 400)
+
+    def test_error_status(self):
+        class FailingMorph:
+            def __init__(self, error):
+                self.error = error
+
+            async def annotate(self, input_text, output_format, header):
+                raise self.error
+
+        async def annotate(error):
+            server = AnnotationServer(FailingMorph(error))
+            try:
+                await server.annotate(json.dumps({'texts': self.sentences}).encode('utf-8'))
+            except HTTPError as e:
+                return e.status, server.n_requests, server.n_errors
+
+        self.assertEqual(asyncio.run(annotate(ValueError('Invalid sentence'))), (400, 1, 1))
+        self.assertEqual(asyncio.run(annotate(RuntimeError('Transducer failure'))), (500, 1, 1))
+
+    def test_health_while_loading(self):
+        async def run():
+            server = AnnotationServer(AsyncYakutMorph(self.morphology))
+            statuses = [await server.dispatch('GET', '/health', b'')]
+            loading = asyncio.ensure_future(server.load())
+            statuses.append(await server.dispatch('GET', '/health', b''))
+            await loading
+            statuses.append(await server.dispatch('GET', '/health', b''))
+            await server.morph.close()
+            return [response['status'] for _, response in statuses]
+
+        self.assertEqual(asyncio.run(run()), ['loading', 'loading', 'ok'])
+
+    def test_health_and_metrics(self):
+        self.assertEqual(self.request('GET', '/health'), (200, {'status': 'ok'}))
+        self.request('POST', '/annotate', {'texts': self.sentences})
+        status, metrics = self.request('GET', '/metrics')
+        self.assertEqual(status, 200)
+        self.assertGreaterEqual(metrics['sentences'], len(self.sentences))
+        self.assertGreater(metrics['batches'], 0)
+        self.assertGreater(metrics['sentences_per_s'], 0)
+        self.assertIsNotNone(metrics['latency_ms']['p99'])
+
+    def test_unix_socket(self):
+        body = json.dumps({'text': self.sentences[0]}).encode('utf-8')
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+            client.settimeout(30)
+            client.connect(self.socket_path)
+            client.sendall(
+                b'POST /annotate HTTP/1.1\r\nHost: localhost\r\nConnection: close\r\n'
+                + f'Content-Length: {len(body)}\r\n\r\n'.encode('latin-1') + body
+            )
+            response = b''
+            while True:
+                data = client.recv(65536)
+                if not data:
+                    break
+                response += data
+        head, _, content = response.partition(b'\r\n\r\n')
+        self.assertTrue(head.startswith(b'HTTP/1.1 200 OK'))
+        self.assertEqual(json.loads(content)['annotation']['parses'][0]['text'], 'Мин')
+
+
+if __name__ == '__main__':
+    unittest.main()
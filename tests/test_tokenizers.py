@@ -1,5 +1,6 @@
 import unittest
-from yakutmorph.tokenizers import YakutTokenizer
+import io
+from yakutmorph.tokenizers import YakutTokenizer, YakutSentenceSplitter
 
 
 class TestYakutTokenizer(unittest.TestCase):
@@ -57,6 +58,56 @@ class TestYakutTokenizer(unittest.TestCase):
         ]
         self.assertEqual(self.tokenizer.tokenize(text), expected)
 
+    def test_iter_tokenize(self):
+        text = 'Мин аатым Кэскил.'
+        tokens = self.tokenizer.iter_tokenize(text)
+        self.assertEqual(next(tokens), ('Мин', 'title'))
+        self.assertEqual(list(tokens), [('аатым', 'lowercase'), ('Кэскил', 'title'), ('.', 'period')])
+
+    def test_ascii_boundaries(self):
+        text = 'жюн7 ١٢'
+        expected = [('жюн', 'lowercase'), ('7', 'number'), ('١', 'unknown'), ('٢', 'unknown')]
+        self.assertEqual(self.tokenizer.tokenize(text), expected)
+
+    def test_span_tokenize(self):
+        text = ' Мин  аатым\nКэскил.'
+        tokens = list(self.tokenizer.span_tokenize(text))
+        expected = [('Мин', 'title', 1, 4), ('аатым', 'lowercase', 6, 11), ('Кэскил', 'title', 12, 18), ('.', 'period', 18, 19)]
+        self.assertEqual(tokens, expected)
+        self.assertTrue(all(text[start:end] == token for token, _, start, end in tokens))
+
+
+class TestYakutSentenceSplitter(unittest.TestCase):
+
+    def setUp(self):
+        self.splitter = YakutSentenceSplitter()
+
+    def test_split(self):
+        text = 'Мин аатым Кэскил. «Мама Егора учуутал!» Ити саха... бары XIX үйэ? Хаартыска https://www.trud.ru саайтан.'
+        expected = [
+            'Мин аатым Кэскил.', '«Мама Егора учуутал!»', 'Ити саха... бары XIX үйэ?',
+            'Хаартыска https://www.trud.ru саайтан.'
+        ]
+        self.assertEqual([sentence for sentence, _ in self.splitter.split(text)], expected)
+
+    def test_tokens(self):
+        sentences = list(self.splitter.split('Хаартыска https://www.trud.ru саайтан. Мин аатым Кэскил'))
+        expected = [('Мин', 'title', 0, 3), ('аатым', 'lowercase', 4, 9), ('Кэскил', 'title', 10, 16)]
+        self.assertEqual(sentences[1][1], expected)
+
+    def test_max_tokens(self):
+        splitter = YakutSentenceSplitter(max_tokens=2)
+        expected = ['Мин аатым', 'Кэскил.']
+        self.assertEqual([sentence for sentence, _ in splitter.split('Мин аатым Кэскил.')], expected)
+
+    def test_iter_split(self):
+        lines = io.StringIO('Мин аатым\nКэскил. Мама\nЕгора учуутал! Ити\n\nсаха\n')
+        expected = ['Мин аатым\nКэскил.', 'Мама\nЕгора учуутал!', 'Ити', 'саха']
+        sentences = list(self.splitter.iter_split(lines))
+        self.assertEqual([sentence for sentence, _ in sentences], expected)
+        for sentence, tokens in sentences:
+            self.assertTrue(all(sentence[start:end] == token for token, _, start, end in tokens))
+
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
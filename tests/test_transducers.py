@@ -17,6 +17,12 @@ class TestYakutTransducer(unittest.TestCase):
         surface_form = ['дьоннор']
         self.assertEqual(self.transducer.generate(analysis_form), surface_form)
 
+    def test_generate_many(self):
+        analysis_forms = ['дьон^N+PL', 'дьон^N', 'дьон^N+PL']
+        expected = [self.transducer.generate(analysis_form) for analysis_form in analysis_forms]
+        self.assertEqual(self.transducer.generate_many(analysis_forms), expected)
+        self.assertEqual(len(self.transducer.generated), 2)
+
 
 if __name__ == '__main__':
     unittest.main()
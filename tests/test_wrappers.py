@@ -0,0 +1,186 @@
+import pickle
+import unittest
+from yakutmorph.main import YakutMorph
+from yakutmorph.transducers import YakutTransducer, PostPipeline
+from yakutmorph.wrappers import AnalysisTable, DAG, DAGEncoder, ParseBatch, generate_lemmas
+
+
+class TestAnalysisTable(unittest.TestCase):
+
+    def setUp(self):
+        self.transducer = YakutTransducer()
+        self.table = AnalysisTable()
+
+    def test_get_morphemes(self):
+        self.assertEqual(self.table.get_morphemes(self.transducer, 'дьон^N+PL'), ('дьон', '^N', '+PL'))
+
+    def test_shared_analysis(self):
+        morphemes = self.table.get_morphemes(self.transducer, 'дьон^N+PL')
+        analysis = self.table.get_analysis(self.transducer, list(morphemes))
+        self.assertIs(self.table.get_analysis(self.transducer, list(morphemes)), analysis)
+        self.assertEqual([m.morpheme for m in analysis.morphemes], ['дьон', '^N', '+PL'])
+
+    def test_post_analysis(self):
+        morphemes = self.table.get_morphemes(self.transducer, 'кэскил^N')
+        first = self.table.get_analysis(self.transducer, PostPipeline.apply(list(morphemes), 'Кэскил', 1))
+        second = self.table.get_analysis(self.transducer, PostPipeline.apply(list(morphemes), 'Кэскил', 2))
+        self.assertEqual(first.infl_groups[-1].affixes[0].morpheme, '^N')
+        self.assertEqual(second.infl_groups[-1].affixes[0].morpheme, '^PN')
+        self.assertEqual(self.table.get_morphemes(self.transducer, 'кэскил^N'), ('кэскил', '^N'))
+
+
+class TestAnalysis(unittest.TestCase):
+
+    def setUp(self):
+        self.transducer = YakutTransducer()
+        self.table = AnalysisTable()
+        self.analysis = self.table.get_analysis(self.transducer, ['үлэ', '^V', '^N#1', '+PL', '+ACC'])
+
+    def test_infl_groups(self):
+        self.assertEqual([ig.pos for ig in self.analysis.infl_groups], [1, 2])
+        self.assertEqual([m.morpheme for m in self.analysis.infl_groups[-1].affixes], ['^N#1', '+PL', '+ACC'])
+        self.assertEqual([m.morpheme for m in self.analysis.remove_inflections()], ['үлэ', '^V', '^N#1'])
+        self.assertEqual(self.analysis.stem, 'үлэ^V^N#1')
+
+    def test_derived_properties(self):
+        self.assertIsInstance(self.analysis.morphemes, tuple)
+        self.assertIs(self.analysis.morphemes, self.analysis.morphemes)
+        self.assertIs(self.analysis.remove_inflections(), self.analysis.remove_inflections())
+
+    def test_immutable(self):
+        with self.assertRaises(AttributeError):
+            self.analysis.root = None
+        with self.assertRaises(AttributeError):
+            self.analysis.root.morpheme = 'ас'
+        with self.assertRaises(AttributeError):
+            self.analysis._lemmas = ('ас',)
+        self.assertFalse(hasattr(self.analysis, '__dict__'))
+        self.assertFalse(hasattr(self.analysis.root, '__dict__'))
+
+    def test_shared_morphs(self):
+        other = self.table.get_analysis(self.transducer, ['ас', '^N', '+PL'])
+        self.assertIs(other.infl_groups[0].affixes[1], self.analysis.infl_groups[1].affixes[1])
+
+    def test_pickle(self):
+        parse = YakutMorph().parse('Дьоннору көрдүм.')
+        copy = pickle.loads(pickle.dumps(parse))
+        self.assertFalse(hasattr(copy.tokens[0], '__dict__'))
+        self.assertEqual(repr(copy.tokens[0].morph), repr(parse.tokens[0].morph))
+        self.assertEqual(copy.tokens[0].morph.stem, parse.tokens[0].morph.stem)
+
+
+class TestDAG(unittest.TestCase):
+
+    def setUp(self):
+        self.dag = DAG.collapse([['<BOS>'], ['^N+ACC', '^V', '^N+ACC'], ['^N'], ['<EOS>']])
+
+    def test_collapse(self):
+        self.assertEqual(self.dag, [['<BOS>'], ['^N+ACC', '^V'], ['^N'], ['<EOS>']])
+        self.assertEqual(self.dag.backpointers[1], [[0, 2], [1]])
+        self.assertEqual(self.dag.counts[1], [2, 1])
+
+    def test_get_indexes(self):
+        self.assertEqual(self.dag.get_indexes([0, 0]), [2, 0])
+        self.assertEqual(self.dag.get_indexes([1, 0]), [1, 0])
+        self.assertEqual(self.dag.get_indexes(), [2, 0])
+
+    def test_is_ambiguous(self):
+        self.assertTrue(self.dag.is_ambiguous())
+        self.assertFalse(DAG.collapse([['<BOS>'], ['^N', '^N'], ['<EOS>']]).is_ambiguous())
+
+
+class TestDAGEncoder(unittest.TestCase):
+
+    def setUp(self):
+        self.morphology = YakutMorph()
+        self.stoi, self.unknown_idx = self.morphology.disambiguation_model.get_vocabulary()
+        self.encoder = DAGEncoder(self.morphology.mapper, self.stoi, self.unknown_idx)
+
+    def test_encode(self):
+        for parse in self.morphology.parse_many(['Мин аатым Кэскил.', 'Хаартыска https://www.trud.ru саайтан.']):
+            dag = self.encoder.encode(parse)
+            expected = DAG.collapse(
+                [[self.stoi.get(node, self.unknown_idx) for node in step] for step in parse.get_dag(self.morphology.mapper)]
+            )
+            self.assertEqual(dag, expected)
+            self.assertEqual(dag.is_ambiguous(), expected.is_ambiguous())
+
+    def test_memoized(self):
+        parse = self.morphology.parse('Мин аатым Кэскил.')
+        self.encoder.encode(parse)
+        self.assertEqual(len(self.encoder.analyses), len({a for t in parse.tokens if t.analyses for a in t.analyses.output}))
+        self.encoder.mapper = None
+        self.encoder.encode(parse)
+        self.encoder.clear()
+        self.assertEqual(len(self.encoder.morphs), 0)
+
+
+class TestParseBatch(unittest.TestCase):
+
+    def setUp(self):
+        self.morphology = YakutMorph()
+        self.parses = self.morphology.parse_many(['Мин аатым Кэскил.', 'Хаартыска https://www.trud.ru саайтан.'])
+        self.batch = ParseBatch.from_parses(self.parses)
+
+    def test_columns(self):
+        self.assertEqual(list(self.batch.token_offsets), [0, 4, 8])
+        self.assertEqual(self.batch.surfaces, 'МинаатымКэскил.Хаартыскаhttps://www.trud.ruсаайтан.')
+        self.assertEqual(self.batch.token_types[self.batch.types[7]], 'period')
+        self.assertEqual(self.batch.fsts[7], -1)
+        self.assertEqual(self.batch.mla[7], -1)
+        self.assertEqual(len(self.batch.analysis_table), len(set(self.batch.analysis_table)))
+
+    def test_getitem(self):
+        for parse, view in zip(self.parses, self.batch):
+            self.assertEqual(view.text, parse.text)
+            for token, token_view in zip(parse.tokens, view.tokens):
+                self.assertEqual(
+                    (token_view.pos, token_view.surface, token_view.type, token_view.start, token_view.end),
+                    (token.pos, token.surface, token.type, token.start, token.end)
+                )
+                self.assertIs(token_view.morph, token.morph)
+        self.assertEqual(self.batch[-1].text, self.parses[-1].text)
+        with self.assertRaises(IndexError):
+            self.batch[2]
+
+    def test_set_mla(self):
+        self.assertTrue(self.batch.is_ambiguous(0))
+        self.batch.set_mla(0, [0, 0, 0, 0])
+        self.assertEqual(self.batch[0].tokens[0].morph, self.batch.get_analyses(0)[0])
+        self.assertEqual(self.batch.mla[3], -1)
+
+    def test_encode_batch(self):
+        encoder = self.morphology.encoder
+        self.assertEqual(encoder.encode_batch(self.batch, [1, 0]), [encoder.encode(self.parses[1]), encoder.encode(self.parses[0])])
+
+    def test_generate_lemmas(self):
+        self.batch.generate_lemmas()
+        self.assertEqual(self.batch[0].tokens[1].lemmas, ['аат'])
+
+
+class TestLemmas(unittest.TestCase):
+
+    def setUp(self):
+        self.parses = YakutMorph().parse_many(['Дьоннор кэллилэр.', 'Дьоннору көрдүм.'])
+
+    def test_stem(self):
+        self.assertEqual(self.parses[0].tokens[0].morph.stem, 'дьон^N')
+
+    def test_generate_lemmas(self):
+        tokens = [token for parse in self.parses for token in parse.tokens if token.has_morph]
+        generate_lemmas(self.parses)
+        for token in tokens:
+            self.assertEqual(token.lemmas, token.analyses.fst.generate(token.morph.stem))
+        self.assertEqual(tokens[0].lemmas, ['дьон'])
+
+    def test_lemmas_generated_once(self):
+        token = self.parses[0].tokens[0]
+        lemmas = token.lemmas
+        token.lemmas.append('x')
+        token.analyses.fst.generated.clear()
+        token.analyses.fst.generate = None
+        self.assertEqual(token.lemmas, lemmas)
+
+
+if __name__ == '__main__':
+    unittest.main()
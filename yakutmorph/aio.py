@@ -0,0 +1,221 @@
+import asyncio
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Any, List, Tuple
+
+from .main import YakutMorph
+from .mappers import output_formats
+from .wrappers import Parse
+
+
+class AsyncYakutMorph:
+    """
+    An asyncio front-end to YakutMorph. The sentences are parsed in a worker thread, so the event
+    loop is not blocked, and the requests that arrive while a batch is being collected or parsed
+    are coalesced into a single batch, which is analysed and disambiguated together.
+
+    A batch is dispatched as soon as it holds `max_batch_size` sentences, or `max_wait` seconds
+    after its first sentence arrived if the worker is idle. While the worker is busy, new
+    sentences wait for it and are dispatched together when it is done, so the batches grow with
+    the load even without a waiting window, and a single request under light load is parsed at once.
+
+    Usage:
+        async with AsyncYakutMorph() as morphology:
+            parse = await morphology.parse('Мин аатым Кэскил.')
+
+    Attributes
+    ----------
+    morph : The YakutMorph object used to parse, which should not be used by other threads meanwhile.
+    max_batch_size : The maximum number of sentences parsed together.
+    max_wait : The maximum time in seconds that a sentence waits for others before its batch is
+        dispatched to an idle worker. A value of 0 dispatches the sentences that are waiting at once.
+    executor : The executor that runs the batches. Defaults to a single thread owned by the object.
+    """
+
+    def __init__(
+            self,
+            morph: YakutMorph = None,
+            max_batch_size: int = 64,
+            max_wait: float = 0.0,
+            executor: Executor = None,
+            **morph_kwargs
+            ):
+        """
+        Initializes the front-end. The components of YakutMorph are loaded in the worker on first use.
+
+        :param morph: A YakutMorph object. Defaults to one created with `morph_kwargs`.
+        :param max_batch_size: The maximum number of sentences parsed together. Defaults to 64.
+        :param max_wait: The maximum time in seconds that a sentence waits for others to arrive
+            while the worker is idle. Defaults to 0.0.
+        :param executor: The executor that runs the batches, one at a time. Defaults to a single thread.
+        :param morph_kwargs: Keyword arguments used to initialize YakutMorph if `morph` is not given.
+        """
+        if max_batch_size < 1:
+            raise ValueError(f'The batch size must be a positive integer, got {max_batch_size}')
+        self.morph = morph if morph is not None else YakutMorph(**morph_kwargs)
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self.owns_executor = executor is None
+        self.executor = executor if executor is not None else ThreadPoolExecutor(1, thread_name_prefix='yakutmorph')
+        self.pending = list()
+        self.busy = False
+        self.timer = None
+        self.loop = None
+        # Set when the worker is idle and no sentence is pending, while `close` waits for it
+        self.drained = None
+        self.n_requests = 0
+        self.n_batches = 0
+
+    async def parse(self, input_text: str) -> Parse:
+        """
+        Parses a text, together with the other texts requested meanwhile.
+
+        :param input_text: The text to parse.
+        :return: A Parse object.
+        """
+        return await self.annotate(input_text, 'parse')
+
+    async def parse_many(self, input_texts: List[str]) -> List[Parse]:
+        """
+        Parses several texts. They are batched with each other and with the other texts requested meanwhile.
+
+        :param input_texts: The texts to parse.
+        :return: A list of Parse objects, in the same order as the input texts.
+        """
+        return list(await asyncio.gather(*[self.parse(input_text) for input_text in input_texts]))
+
+    async def annotate(self, input_text: str, output_format: str = 'parse', header: Any = None) -> Any:
+        """
+        Annotates a text in one of the output formats of `YakutMorph.annotate_many`, together with
+        the other texts requested meanwhile. The annotations are formatted in the worker.
+
+        :param input_text: The text to annotate.
+        :param output_format: 'parse' (a Parse object), 'conllu' (a CoNLL-U string) or 'json'
+            (a YakutAnnotation dictionary). Defaults to 'parse'.
+        :param header: The header passed to the output format.
+        :return: The annotation of the text.
+        """
+        if output_format not in output_formats:
+            raise ValueError(f'Unknown output format "{output_format}", expected one of {list(output_formats)}')
+        loop = asyncio.get_running_loop()
+        if self.loop is None:
+            self.loop = loop
+        elif self.loop is not loop:
+            raise RuntimeError(f'{self.__class__.__name__} is bound to another event loop')
+
+        future = loop.create_future()
+        self.pending.append((input_text, output_format, header, future))
+        self.n_requests += 1
+        self.__schedule()
+        return await future
+
+    def __schedule(self) -> None:
+        """
+        Dispatches the pending sentences if the worker is idle and the batch is full or
+        no waiting is configured, or starts the timer of the batch.
+        """
+        if self.busy or not self.pending:
+            return
+        if len(self.pending) >= self.max_batch_size or self.max_wait <= 0:
+            self.__dispatch()
+        elif self.timer is None:
+            self.timer = self.loop.call_later(self.max_wait, self.__dispatch)
+
+    def __dispatch(self) -> None:
+        """
+        Sends the first `max_batch_size` pending sentences to the worker.
+        """
+        if self.timer is not None:
+            self.timer.cancel()
+            self.timer = None
+        if self.busy or not self.pending:
+            return
+        batch = self.pending[:self.max_batch_size]
+        del self.pending[:self.max_batch_size]
+        self.busy = True
+        self.n_batches += 1
+        items = [(input_text, output_format, header) for input_text, output_format, header, _ in batch]
+        result = self.loop.run_in_executor(self.executor, self._run, self.morph, items)
+        result.add_done_callback(lambda done: self.__complete(batch, done))
+
+    def __complete(self, batch: List[Tuple], done: asyncio.Future) -> None:
+        """
+        Sets the results of a batch and dispatches the sentences that arrived meanwhile, which
+        have already waited for the worker.
+
+        :param batch: The (text, output format, header, future) tuples of the batch.
+        :param done: The future of the batch.
+        """
+        self.busy = False
+        if done.cancelled():
+            # The executor cancelled the batch, e.g. because it was shut down
+            for _, _, _, future in batch:
+                future.cancel()
+        else:
+            exception = done.exception()
+            results = [exception] * len(batch) if exception is not None else done.result()
+            for (_, _, _, future), result in zip(batch, results):
+                if future.done():
+                    # The caller was cancelled
+                    continue
+                if isinstance(result, BaseException):
+                    future.set_exception(result)
+                else:
+                    future.set_result(result)
+        if self.pending:
+            self.__dispatch()
+        elif self.drained is not None:
+            self.drained.set()
+
+    @staticmethod
+    def _run(morph: YakutMorph, items: List[Tuple[str, str, Any]]) -> List[Any]:
+        """
+        Annotates a batch of sentences in the worker, grouped by output format. If a group
+        fails, its sentences are annotated one by one, so that an invalid sentence only fails
+        its own request.
+
+        :param morph: The YakutMorph object.
+        :param items: The (text, output format, header) tuples of the batch.
+        :return: The annotation of each sentence, or the exception it raised.
+        """
+        results = [None] * len(items)
+        groups = dict()
+        for idx, (input_text, output_format, header) in enumerate(items):
+            groups.setdefault(output_format, []).append(idx)
+        for output_format, indexes in groups.items():
+            texts = [items[idx][0] for idx in indexes]
+            headers = [items[idx][2] for idx in indexes]
+            try:
+                annotations = morph.annotate_many(texts, output_format, headers)
+            except Exception:
+                annotations = list()
+                for text, header in zip(texts, headers):
+                    try:
+                        annotations.extend(morph.annotate_many([text], output_format, [header]))
+                    except Exception as e:
+                        annotations.append(e)
+            for idx, annotation in zip(indexes, annotations):
+                results[idx] = annotation
+        return results
+
+    async def close(self) -> None:
+        """
+        Waits for the pending sentences and stops the worker thread if it is owned by the object.
+        """
+        if self.pending and not self.busy:
+            # The batch that waits for others is dispatched at once
+            self.__dispatch()
+        if self.busy:
+            if self.drained is None or self.drained.is_set():
+                self.drained = asyncio.Event()
+            await self.drained.wait()
+        if self.owns_executor:
+            self.executor.shutdown(wait=False)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+    def __repr__(self):
+        return f'{self.__class__.__name__}({self.n_requests} requests, {self.n_batches} batches)'
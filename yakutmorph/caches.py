@@ -0,0 +1,242 @@
+import json
+import sqlite3
+import weakref
+from collections import OrderedDict
+from threading import Lock
+from typing import Dict, Optional, Tuple
+
+from .interfaces import AnalysisCache, CacheInfo
+
+
+class LRUAnalysisCache(AnalysisCache):
+    """
+    A bounded, thread-safe cache that discards the least recently used surface forms first.
+    """
+
+    def __init__(self, maxsize: int = 50000):
+        """
+        Initializes an empty cache.
+
+        :param maxsize: The maximum number of surface forms kept in the cache.
+        """
+        if maxsize < 1:
+            raise ValueError(f'The cache size must be a positive integer, got {maxsize}')
+        self.maxsize = maxsize
+        self.entries = OrderedDict()
+        self.lock = Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, surface_form: str) -> Optional[Tuple[str, Tuple[str, ...]]]:
+        """
+        Retrieves the cached analyses of a surface form and marks it as recently used.
+
+        :param surface_form: The surface form to look up.
+        :return: A tuple with the label of the transducer and its analyses, or None
+            if the surface form is not cached.
+        """
+        with self.lock:
+            entry = self.entries.get(surface_form)
+            if entry is None:
+                self.misses += 1
+                return None
+            self.entries.move_to_end(surface_form)
+            self.hits += 1
+            return entry
+
+    def put(self, surface_form: str, label: str, analyses: Tuple[str, ...]) -> None:
+        """
+        Stores the analyses of a surface form, evicting the least recently used
+        surface form if the cache is full.
+
+        :param surface_form: The surface form to store.
+        :param label: The label of the transducer that performed the analysis.
+        :param analyses: The analyses of the surface form.
+        """
+        with self.lock:
+            if surface_form in self.entries:
+                self.entries.move_to_end(surface_form)
+            elif len(self.entries) >= self.maxsize:
+                self.entries.popitem(last=False)
+                self.evictions += 1
+            self.entries[surface_form] = (label, tuple(analyses))
+
+    def info(self) -> CacheInfo:
+        """
+        Returns the statistics of the cache.
+        """
+        with self.lock:
+            return CacheInfo(self.hits, self.misses, self.evictions, self.maxsize, len(self.entries))
+
+    def clear(self) -> None:
+        """
+        Removes all the entries and resets the statistics of the cache.
+        """
+        with self.lock:
+            self.entries.clear()
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __repr__(self):
+        return f'{self.__class__.__name__}({len(self.entries)}/{self.maxsize})'
+
+
+def _write_entries(connection: sqlite3.Connection, fingerprint: str, entries: Dict) -> None:
+    """
+    Writes a series of pending entries to a SQLite analysis cache in a single transaction.
+
+    :param connection: The connection to the database.
+    :param fingerprint: The fingerprint of the transducers that produced the entries.
+    :param entries: A dictionary mapping surface forms to tuples of transducer label and analyses.
+    """
+    if not entries:
+        return
+    with connection:
+        connection.executemany(
+            'INSERT OR REPLACE INTO analyses (fingerprint, surface, label, analyses) VALUES (?, ?, ?, ?)',
+            [
+                (fingerprint, surface_form, label, json.dumps(analyses, ensure_ascii=False))
+                for surface_form, (label, analyses) in entries.items()
+            ]
+        )
+    entries.clear()
+
+
+def _close(connection: sqlite3.Connection, fingerprint: str, entries: Dict) -> None:
+    """
+    Writes the pending entries and closes the connection to a SQLite analysis cache.
+    """
+    try:
+        _write_entries(connection, fingerprint, entries)
+    finally:
+        connection.close()
+
+
+class SQLiteAnalysisCache(AnalysisCache):
+    """
+    A persistent cache stored in a SQLite database, which can be shared by several processes.
+
+    Entries are keyed by the surface form and a fingerprint of the transducers (and reference)
+    that produced them, so entries produced by other versions of the transducers are ignored.
+    The database uses write-ahead logging, so many processes can read it concurrently while
+    one of them writes. New entries are buffered and written in batches.
+    """
+
+    def __init__(self, path: str, fingerprint: str, flush_size: int = 1000, timeout: float = 30.0):
+        """
+        Opens (or creates) the cache database.
+
+        :param path: The path to the SQLite database file.
+        :param fingerprint: A fingerprint of the transducers that produce the entries.
+        :param flush_size: The number of new entries buffered before writing them to disk.
+        :param timeout: The number of seconds to wait for a lock held by another process.
+        """
+        self.path = path
+        self.fingerprint = fingerprint
+        self.flush_size = flush_size
+        self.lock = Lock()
+        self.pending = dict()
+        self.hits = 0
+        self.misses = 0
+
+        self.connection = sqlite3.connect(path, timeout=timeout, check_same_thread=False)
+        self.connection.execute('PRAGMA journal_mode=WAL')
+        self.connection.execute('PRAGMA synchronous=NORMAL')
+        with self.connection:
+            self.connection.execute(
+                'CREATE TABLE IF NOT EXISTS analyses ('
+                'fingerprint TEXT NOT NULL, surface TEXT NOT NULL, label TEXT NOT NULL, analyses TEXT NOT NULL, '
+                'PRIMARY KEY (fingerprint, surface)) WITHOUT ROWID'
+            )
+        self.finalizer = weakref.finalize(self, _close, self.connection, self.fingerprint, self.pending)
+
+    def get(self, surface_form: str) -> Optional[Tuple[str, Tuple[str, ...]]]:
+        """
+        Retrieves the cached analyses of a surface form.
+
+        :param surface_form: The surface form to look up.
+        :return: A tuple with the label of the transducer and its analyses, or None
+            if the surface form is not cached.
+        """
+        with self.lock:
+            entry = self.pending.get(surface_form)
+            if entry is None:
+                row = self.connection.execute(
+                    'SELECT label, analyses FROM analyses WHERE fingerprint = ? AND surface = ?',
+                    (self.fingerprint, surface_form)
+                ).fetchone()
+                if row is not None:
+                    entry = (row[0], tuple(json.loads(row[1])))
+            if entry is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+            return entry
+
+    def put(self, surface_form: str, label: str, analyses: Tuple[str, ...]) -> None:
+        """
+        Stores the analyses of a surface form. The entry is written to disk once
+        `flush_size` entries are pending.
+
+        :param surface_form: The surface form to store.
+        :param label: The label of the transducer that performed the analysis.
+        :param analyses: The analyses of the surface form.
+        """
+        with self.lock:
+            self.pending[surface_form] = (label, tuple(analyses))
+            if len(self.pending) >= self.flush_size:
+                _write_entries(self.connection, self.fingerprint, self.pending)
+
+    def flush(self) -> None:
+        """
+        Writes the pending entries to disk.
+        """
+        with self.lock:
+            _write_entries(self.connection, self.fingerprint, self.pending)
+
+    def purge(self) -> int:
+        """
+        Removes the entries produced by other versions of the transducers.
+
+        :return: The number of removed entries.
+        """
+        with self.lock, self.connection:
+            return self.connection.execute(
+                'DELETE FROM analyses WHERE fingerprint != ?', (self.fingerprint,)
+            ).rowcount
+
+    def info(self) -> CacheInfo:
+        """
+        Returns the statistics of the cache. The cache is unbounded, so its maximum size is None.
+        """
+        with self.lock:
+            _write_entries(self.connection, self.fingerprint, self.pending)
+            stored = self.connection.execute(
+                'SELECT COUNT(*) FROM analyses WHERE fingerprint = ?', (self.fingerprint,)
+            ).fetchone()[0]
+            return CacheInfo(self.hits, self.misses, 0, None, stored)
+
+    def clear(self) -> None:
+        """
+        Removes the entries produced by the current transducers and resets the statistics.
+        """
+        with self.lock, self.connection:
+            self.pending.clear()
+            self.connection.execute('DELETE FROM analyses WHERE fingerprint = ?', (self.fingerprint,))
+            self.hits = 0
+            self.misses = 0
+
+    def close(self) -> None:
+        """
+        Writes the pending entries and closes the database.
+        """
+        with self.lock:
+            self.finalizer()
+
+    def __repr__(self):
+        return f'{self.__class__.__name__}({self.path})'
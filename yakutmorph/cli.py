@@ -0,0 +1,320 @@
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from collections import deque
+from typing import Any, BinaryIO, Deque, Iterator, List, Optional, TextIO, Tuple
+
+from .mappers import get_header
+from .parallel import ParallelAnnotator
+from .transducers import YakutTransducerPipeline
+from .utils import read_word_list
+
+
+class Progress:
+    """
+    Reports the number of annotated sentences, the throughput and the input offset to stderr.
+    """
+
+    def __init__(self, total_bytes: Optional[int], interval: float = 1.0, stream: TextIO = sys.stderr):
+        """
+        :param total_bytes: The size of the input, if known.
+        :param interval: The minimum number of seconds between reports.
+        :param stream: The stream where the progress is written.
+        """
+        self.total_bytes = total_bytes
+        self.interval = interval
+        self.stream = stream
+        self.start = time.monotonic()
+        self.last = self.start
+        self.sentences = 0
+
+    def update(self, offset: int) -> None:
+        """
+        Counts an annotated sentence and prints the progress if the interval has elapsed.
+
+        :param offset: The input offset (in bytes) up to which the output has been written.
+        """
+        self.sentences += 1
+        now = time.monotonic()
+        if now - self.last >= self.interval:
+            self.last = now
+            self.report(offset)
+
+    def report(self, offset: int, end: str = '\r') -> None:
+        """
+        Prints the number of sentences, the throughput and the input offset.
+
+        :param offset: The input offset (in bytes) up to which the output has been written.
+        :param end: The string written after the report.
+        """
+        elapsed = max(time.monotonic() - self.start, 1e-9)
+        percent = f' ({100 * offset / self.total_bytes:.1f}%)' if self.total_bytes else ''
+        self.stream.write(
+            f'{self.sentences} sentences, {self.sentences / elapsed:.1f} sentences/s, '
+            f'offset {offset}{percent}{end}'
+        )
+        self.stream.flush()
+
+
+def read_sentences(
+        stream: BinaryIO,
+        input_format: str,
+        text_field: str,
+        offset: int = 0
+        ) -> Iterator[Tuple[str, Any, int]]:
+    """
+    Reads the sentences of a plain-text (one sentence per line) or JSONL input line by line.
+
+    :param stream: The input, opened in binary mode.
+    :param input_format: Either 'text' or 'jsonl'.
+    :param text_field: The field that holds the sentence in JSONL objects.
+    :param offset: The offset (in bytes) of the first line to read.
+    :return: An iterator of tuples with the sentence, the JSONL object (or None) and
+        the offset of the end of the line.
+    """
+    for line in stream:
+        offset += len(line)
+        line = line.decode('utf-8').strip()
+        if not line:
+            continue
+        if input_format == 'jsonl':
+            record = json.loads(line)
+            yield record[text_field], record, offset
+        else:
+            yield line, None, offset
+
+
+def read_offsets(path: str) -> Tuple[int, int]:
+    """
+    Reads the offsets saved by `annotate`.
+
+    :param path: The path to the offset file.
+    :return: A tuple with the input offset and the output offset (in bytes) up to which
+        the annotations have been written.
+    """
+    with open(path) as f:
+        content = f.read()
+    try:
+        offsets = json.loads(content)
+        return int(offsets['input']), int(offsets['output'])
+    except (ValueError, KeyError, TypeError):
+        raise SystemExit(f'Cannot read the offsets saved in {path}: {content!r}')
+
+
+def write_offsets(path: str, input_offset: int, output_offset: int) -> None:
+    """
+    Saves the offsets of `annotate`. The file is written next to the path and then moved
+    into place, so that an interrupted write does not leave a truncated file.
+
+    :param path: The path to the offset file.
+    :param input_offset: The input offset (in bytes) up to which the annotations have been written.
+    :param output_offset: The size of the output (in bytes) with these annotations.
+    """
+    fd, tmp_path = tempfile.mkstemp(
+        prefix=f'{os.path.basename(path)}.', suffix='.tmp', dir=os.path.dirname(path) or '.'
+    )
+    try:
+        with os.fdopen(fd, 'w') as f:
+            f.write(json.dumps({'input': input_offset, 'output': output_offset}))
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+
+
+def annotate(args: argparse.Namespace) -> None:
+    """
+    Streams the input through a ParallelAnnotator and writes the annotations incrementally.
+    """
+    offset_path = f'{args.output}.offset' if args.output else None
+    offset = args.start_offset
+    # The size of the output with the annotations of the input up to the offset
+    output_offset = None
+    if args.resume:
+        if not offset_path:
+            raise SystemExit('--resume requires --output')
+        if os.path.exists(offset_path):
+            offset, output_offset = read_offsets(offset_path)
+
+    if offset and args.input == '-':
+        raise SystemExit('Offsets are not supported when reading from stdin')
+    input_stream = open(args.input, 'rb') if args.input != '-' else sys.stdin.buffer
+    if offset:
+        input_stream.seek(offset)
+    if output_offset is not None:
+        if not os.path.exists(args.output) or os.path.getsize(args.output) < output_offset:
+            raise SystemExit(f'{args.output} is shorter than the output offset {output_offset} saved in {offset_path}')
+        # Whatever was written after the offsets were saved is annotated again
+        output_stream = open(args.output, 'r+', encoding='utf-8')
+        output_stream.seek(output_offset)
+        output_stream.truncate()
+    else:
+        output_stream = open(args.output, 'w', encoding='utf-8') if args.output else sys.stdout
+
+    total_bytes = os.path.getsize(args.input) if args.input != '-' else None
+    progress = Progress(total_bytes) if args.progress else None
+    offsets: Deque[int] = deque()
+
+    def items() -> Iterator[Tuple[str, Any]]:
+        for sentence, record, end in read_sentences(input_stream, args.input_format, args.text_field, offset):
+            offsets.append(end)
+            yield sentence, get_header(sentence, record, args.output_format)
+
+    def save_offset(end: int) -> None:
+        output_stream.flush()
+        write_offsets(offset_path, end, output_stream.tell())
+
+    annotator = ParallelAnnotator(
+        workers=args.workers,
+        output_format=args.output_format,
+        chunk_size=args.batch_size,
+        cache_path=args.cache,
+        lexicon_path=args.lexicon,
+        quantization=args.quantization
+    )
+    end = offset
+    written = 0
+    try:
+        with annotator:
+            for annotation in annotator.annotate(items()):
+                next_end = offsets.popleft()
+                if args.output_format == 'json':
+                    output_stream.write(json.dumps(annotation, ensure_ascii=False) + '\n')
+                else:
+                    output_stream.write(annotation + '\n\n')
+                # The offset only covers the sentences whose annotation has been written
+                end = next_end
+                written += 1
+                if offset_path and written % args.batch_size == 0:
+                    save_offset(end)
+                if progress:
+                    progress.update(end)
+    finally:
+        if offset_path:
+            save_offset(end)
+        if progress:
+            progress.report(end, end='\n')
+        if input_stream is not sys.stdin.buffer:
+            input_stream.close()
+        if output_stream is not sys.stdout:
+            output_stream.close()
+
+
+def build_lexicon(args: argparse.Namespace) -> None:
+    """
+    Builds a full-form lexicon from a word list.
+    """
+    size = YakutTransducerPipeline(cache_size=0).build_lexicon(read_word_list(args.input), args.output)
+    print(f'{size} word forms written to {args.output}', file=sys.stderr)
+
+
+def serve(args: argparse.Namespace) -> None:
+    """
+    Runs a local annotation server.
+    """
+    # Imported here, so that the other commands do not load asyncio
+    from .server import serve as run_server
+    run_server(
+        host=args.host,
+        port=args.port,
+        path=args.unix_socket,
+        max_batch_size=args.batch_size,
+        max_wait=args.max_wait,
+        cache_path=args.cache,
+        lexicon_path=args.lexicon,
+        quantization=args.quantization
+    )
+
+
+def get_parser() -> argparse.ArgumentParser:
+    """
+    Builds the parser of the command-line arguments.
+    """
+    parser = argparse.ArgumentParser(
+        prog='yakutmorph', description='Morphological annotation of Yakut (Sakha) texts.'
+    )
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    annotate_parser = subparsers.add_parser(
+        'annotate', help='Annotate a corpus line by line.',
+        description='Streams a plain-text (one sentence per line) or JSONL corpus into CoNLL-U or JSONL annotations.'
+    )
+    annotate_parser.add_argument('input', nargs='?', default='-', help='The input file. Defaults to stdin.')
+    annotate_parser.add_argument('-o', '--output', help='The output file. Defaults to stdout.')
+    annotate_parser.add_argument('--input-format', choices=['text', 'jsonl'], default='text')
+    annotate_parser.add_argument(
+        '--text-field', default='text', help='The field that holds the sentence in JSONL input. Defaults to "text".'
+    )
+    annotate_parser.add_argument('--output-format', choices=['conllu', 'json'], default='conllu')
+    annotate_parser.add_argument(
+        '--workers', type=int, default=None,
+        help='The number of worker processes. 0 annotates in the current process. Defaults to the number of CPUs.'
+    )
+    annotate_parser.add_argument(
+        '--batch-size', type=int, default=32, help='The number of sentences sent to a worker at once. Defaults to 32.'
+    )
+    annotate_parser.add_argument('--cache', help='The path to a persistent analysis cache.')
+    annotate_parser.add_argument('--lexicon', help='The path to a full-form lexicon built with build-lexicon.')
+    annotate_parser.add_argument(
+        '--quantization', choices=['float16', 'int8'],
+        help='Quantize the weights of the disambiguation model to reduce the memory of each worker.'
+    )
+    annotate_parser.add_argument('--progress', action='store_true', help='Report the progress and throughput to stderr.')
+    annotate_parser.add_argument(
+        '--start-offset', type=int, default=0, help='The offset (in bytes) of the input where annotation starts.'
+    )
+    annotate_parser.add_argument(
+        '--resume', action='store_true',
+        help='Resume from the offsets saved in OUTPUT.offset, discarding the output written after them.'
+    )
+    annotate_parser.set_defaults(func=annotate)
+
+    lexicon_parser = subparsers.add_parser(
+        'build-lexicon', help='Build a full-form lexicon from a word list.',
+        description='Analyses the word forms of a word list or a word-frequency list and writes them to a '
+                    'memory-mapped full-form lexicon, which is looked up before the transducers.'
+    )
+    lexicon_parser.add_argument('input', help='The word list, with a word form (and optionally its frequency) per line.')
+    lexicon_parser.add_argument('-o', '--output', required=True, help='The path to the lexicon file.')
+    lexicon_parser.set_defaults(func=build_lexicon)
+
+    serve_parser = subparsers.add_parser(
+        'serve', help='Run a local annotation server.',
+        description='Serves annotations over HTTP with a single loaded model, batching the sentences of '
+                    'concurrent requests. POST /annotate with {"text": ...} or {"texts": [...]} and an optional '
+                    '"format" ("json" or "conllu"); GET /health and /metrics.'
+    )
+    serve_parser.add_argument('--host', default='127.0.0.1', help='The address to bind. Defaults to 127.0.0.1.')
+    serve_parser.add_argument('--port', type=int, default=8000, help='The port to bind. Defaults to 8000.')
+    serve_parser.add_argument('--unix-socket', help='Listen on a Unix socket instead of a TCP port.')
+    serve_parser.add_argument(
+        '--batch-size', type=int, default=64, help='The maximum number of sentences parsed together. Defaults to 64.'
+    )
+    serve_parser.add_argument(
+        '--max-wait', type=float, default=0.0,
+        help='The maximum time in seconds that a sentence waits for others before it is parsed. Defaults to 0.'
+    )
+    serve_parser.add_argument('--cache', help='The path to a persistent analysis cache.')
+    serve_parser.add_argument('--lexicon', help='The path to a full-form lexicon built with build-lexicon.')
+    serve_parser.add_argument(
+        '--quantization', choices=['float16', 'int8'], help='Quantize the weights of the disambiguation model.'
+    )
+    serve_parser.set_defaults(func=serve)
+    return parser
+
+
+def main(argv: List[str] = None) -> None:
+    """
+    The entry point of the `yakutmorph` command.
+
+    :param argv: The command-line arguments. Defaults to sys.argv.
+    """
+    args = get_parser().parse_args(argv)
+    args.func(args)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,4 +1,3 @@
-import pickle
 from typing import List, Tuple, Dict
 
 import torch
@@ -6,6 +5,7 @@ import torch.nn.functional as F
 from torch import nn
 
 from .interfaces import DisambiguationModel
+from .numpy_backend import load_vocabulary, pad_dags, pad_encoded_dags
 from .utils import get_file_path
 
 
@@ -73,59 +73,136 @@ class YakutModel(DisambiguationModel, GRUModel):
         :return: A tuple containing the size of the vocabulary, a dictionary mapping
             strings to indices, and a dictionary mapping indices to strings.
         """
-        with open(get_file_path(filename), 'rb') as f:
-            mappings = pickle.load(f)
-        return len(mappings['stoi']), mappings['stoi'], mappings['itos']
+        stoi, itos = load_vocabulary(get_file_path(filename))
+        return len(stoi), stoi, itos
 
-    def beam_search(self, dag: List[List[str]], beam_width: int = 5, apply_softmax: bool = True) -> List[int]:
+    def get_vocabulary(self) -> Tuple[Dict[str, int], int]:
+        return self.stoi, self.unknown_idx
+
+    def beam_search(self, dag: List[List[str]], beam_width: int = 5, apply_softmax: bool = True) -> List[str]:
         """
         Performs beam search to find the most probable sequence of morphological analyses.
 
         :param dag: A directed acyclic graph representing possible analyses.
         :param beam_width: The width of the beam search. Defaults to 5.
         :param apply_softmax: Apply softmax to the model's output. Defaults to True.
-        :return: A list with the indices with the most probable analysis.
+        :return: A list with the most probable sequence of analyses.
         """
-        start_token = dag.pop(0)[0]
-        start_token_idx = self.stoi.get(start_token)
-
-        branches = [
-            [(1.0, [start_token_idx], self.init_hidden(1))]
-        ]  # Initialize with model's hidden state
-
-        for analyses in dag:
-            new_branches = list()
-            for score, seq, hidden in branches[-1]:
-
-                input_seq = torch.tensor([seq[-1]], dtype=torch.long).unsqueeze(0)
-
-                with torch.no_grad():
-                    output, hidden = self(input_seq, hidden)
-
-                # Convert to probabilities
-                next_ig_idxs = [self.stoi.get(analysis, self.stoi['^UNK']) for analysis in analyses]
-                logs = output[..., next_ig_idxs]
-
-                if apply_softmax:
-                    probabilities = F.softmax(logs, dim=2)
-
-                for i, analysis in enumerate(analyses):
-                    updated_seq = seq + [next_ig_idxs[i]]
-                    if apply_softmax:
-                        updated_score = score * probabilities[0, 0, i].item()
-                    else:
-                        updated_score = score + logs[0, 0, i].item()
-
-                    new_branch = (updated_score, updated_seq, hidden)
-                    if new_branch not in new_branches:
-                        new_branches.append(new_branch)
-
-            new_branches = sorted(new_branches, key=lambda tup: tup[0], reverse=True)[:beam_width]
-
-            branches.append(new_branches)
+        return self.beam_search_batch([dag], beam_width, apply_softmax)[0]
+
+    def beam_search_batch(
+            self,
+            dags: List[List[List[str]]],
+            beam_width: int = 5,
+            apply_softmax: bool = True
+            ) -> List[List[str]]:
+        """
+        Performs beam search over several DAGs in lockstep.
 
-        most_likely_sequence = [self.itos[idx] for idx in branches[-1][0][1]]
-        return most_likely_sequence
+        :param dags: A list of directed acyclic graphs representing possible analyses.
+        :param beam_width: The width of the beam search. Defaults to 5.
+        :param apply_softmax: Apply softmax to the model's output. Defaults to True.
+        :return: A list with the most probable sequence of analyses for each DAG.
+        """
+        if not dags:
+            return list()
+
+        candidates, log_counts, lengths, _ = self.__pad_dags(dags)
+        sequences = self.__search(candidates, log_counts, lengths, beam_width, apply_softmax)
+        return [
+            [self.itos[idx] for idx in sequence[:length]]
+            for sequence, length in zip(sequences.tolist(), lengths.tolist())
+        ]
+
+    def __search(
+            self,
+            candidates: torch.Tensor,
+            log_counts: torch.Tensor,
+            lengths: torch.Tensor,
+            beam_width: int,
+            apply_softmax: bool
+            ) -> torch.Tensor:
+        """
+        Performs beam search over padded DAGs in lockstep.
+
+        Each sentence keeps `beam_width` branch slots, and the last predictions of all live
+        branches are stacked into a single [sentences * beam, 1] input with a
+        [layers * 2, sentences * beam, hidden] hidden state, so that each step of the search
+        costs a single forward pass of the model. Branches are scored in log-space and
+        pruned with a vectorized top-k per sentence.
+
+        The candidates of a step are distinct vocabulary indices, so a branch never has two
+        children with the same history, and hypotheses with an identical label history never
+        have to be merged. The number of analyses collapsed into each candidate still counts
+        in the softmax, which thus scores the same as over the uncollapsed analyses.
+
+        :param candidates: A [sentences, steps, candidates] tensor with the vocabulary indices
+            of the candidates, padded with -1.
+        :param log_counts: The logarithm of the number of analyses of each candidate.
+        :param lengths: The number of steps of each DAG.
+        :param beam_width: The width of the beam search.
+        :param apply_softmax: Apply softmax to the model's output.
+        :return: A [sentences, steps] tensor with the most probable sequence of each DAG.
+        """
+        n_sentences, n_steps, n_candidates = candidates.shape
+
+        sequences = torch.full((n_sentences, beam_width, n_steps), self.padding_idx, dtype=torch.long)
+        sequences[:, :, 0] = candidates[:, 0, 0].unsqueeze(1)
+        # Only the first slot of each beam holds a branch before the first step
+        scores = torch.full((n_sentences, beam_width), float('-inf'), dtype=torch.float64)
+        scores[:, 0] = 0.0
+        hidden = self.init_hidden(n_sentences * beam_width).view(-1, n_sentences, beam_width, self.hidden_size)
+
+        for step in range(1, n_steps):
+            active = (lengths > step).nonzero().squeeze(1)
+            n_active = len(active)
+            step_candidates = candidates[active, step]
+            padding = step_candidates.eq(-1)
+            step_candidates = step_candidates.masked_fill(padding, self.padding_idx)
+
+            with torch.no_grad():
+                output, step_hidden = self(
+                    sequences[active, :, step - 1].reshape(-1, 1),
+                    hidden[:, active].reshape(-1, n_active * beam_width, self.hidden_size)
+                )
+
+            logs = torch.gather(
+                output.view(n_active, beam_width, -1), 2,
+                step_candidates.unsqueeze(1).expand(-1, beam_width, -1)
+            )
+            logs = logs.masked_fill(padding.unsqueeze(1), float('-inf'))
+            if apply_softmax:
+                step_log_counts = log_counts[active, step].unsqueeze(1)
+                logs = F.log_softmax(logs + step_log_counts, dim=2) - step_log_counts
+            step_scores = (scores[active].unsqueeze(2) + logs.double()).view(n_active, -1)
+
+            # A stable sort keeps the original branch order among equally scored candidates
+            order = torch.sort(step_scores, dim=1, descending=True, stable=True).indices[:, :beam_width]
+            parents = torch.div(order, n_candidates, rounding_mode='floor')
+            chosen = torch.gather(step_candidates, 1, order % n_candidates)
+
+            scores[active] = torch.gather(step_scores, 1, order)
+            step_hidden = step_hidden.view(-1, n_active, beam_width, self.hidden_size)
+            hidden[:, active] = torch.gather(
+                step_hidden, 2, parents.view(1, n_active, beam_width, 1).expand_as(step_hidden)
+            )
+            step_sequences = torch.gather(
+                sequences[active], 1, parents.unsqueeze(2).expand(-1, -1, n_steps)
+            )
+            step_sequences[:, :, step] = chosen
+            sequences[active] = step_sequences
+
+        return sequences[:, 0]
+
+    def __pad_dags(
+            self,
+            dags: List[List[List[str]]]
+            ) -> Tuple[torch.Tensor, torch.Tensor, torch.Tensor, List[List[Dict[int, int]]]]:
+        """
+        Pads a list of DAGs into tensors of distinct vocabulary indices per step (see `pad_dags`).
+        """
+        candidates, log_counts, lengths, positions = pad_dags(dags, self.stoi, self.unknown_idx)
+        return torch.from_numpy(candidates), torch.from_numpy(log_counts), torch.from_numpy(lengths), positions
 
     def disambiguate(self, dag: List[List[str]]) -> List[int]:
         """
@@ -134,13 +211,41 @@ class YakutModel(DisambiguationModel, GRUModel):
         :param dag: A directed acyclic graph representing possible analyses.
         :return: The indices of the selected analyses in the DAG.
         """
-        most_probable_sequence = self.beam_search(dag)
-        most_probable_sequence = most_probable_sequence[1:]
+        return self.disambiguate_batch([dag])[0]
 
-        indexes = [0] * len(most_probable_sequence)
+    def disambiguate_batch(self, dags: List[List[List[str]]]) -> List[List[int]]:
+        """
+        Disambiguates the morphological analyses of several DAGs with a single beam search.
 
-        for i, token in enumerate(dag):
-            for e, analysis in enumerate(token):
-                if analysis == most_probable_sequence[i]:
-                    indexes[i] = e
-        return indexes[:-1]
+        :param dags: A list of directed acyclic graphs representing possible analyses.
+        :return: The indices of the selected analyses for each DAG.
+        """
+        if not dags:
+            return list()
+
+        candidates, log_counts, lengths, positions = self.__pad_dags(dags)
+        sequences = self.__search(candidates, log_counts, lengths, 5, True)
+        return [
+            [dag_positions[step][idx] for step, idx in enumerate(sequence[1:length - 1], start=1)]
+            for dag_positions, sequence, length in zip(positions, sequences.tolist(), lengths.tolist())
+        ]
+
+    def disambiguate_encoded(self, dags: List[List[List[int]]]) -> List[List[int]]:
+        """
+        Disambiguates several DAGs of vocabulary indices, as encoded by `DAGEncoder`, with a
+        single beam search.
+
+        :param dags: A list of DAGs of distinct vocabulary indices per step.
+        :return: The indices of the selected nodes for each DAG.
+        """
+        if not dags:
+            return list()
+
+        candidates, log_counts, lengths = pad_encoded_dags(dags)
+        sequences = self.__search(
+            torch.from_numpy(candidates), torch.from_numpy(log_counts), torch.from_numpy(lengths), 5, True
+        )
+        return [
+            [dag[step].index(idx) for step, idx in enumerate(sequence[1:length - 1], start=1)]
+            for dag, sequence, length in zip(dags, sequences.tolist(), lengths.tolist())
+        ]
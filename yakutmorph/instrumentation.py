@@ -0,0 +1,137 @@
+import sys
+from collections import Counter
+from typing import Dict, IO
+
+from .interfaces import CacheInfo, Instrumentation
+
+
+class Profiler(Instrumentation):
+    """
+    A collector that aggregates the events of `YakutMorph` into a profile: the time spent in
+    each stage, the transducers that analysed the tokens, the ambiguity of the analyses and of
+    the DAGs, and the hit rates of the analysis caches.
+
+    Usage:
+        profiler = Profiler()
+        morphology = YakutMorph(instrumentation=profiler)
+        morphology.parse_many(sentences)
+        profiler.print_summary()
+    """
+
+    STAGES = ('tokenize', 'analyse', 'post_analysis', 'dag', 'disambiguate')
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self) -> None:
+        """
+        Discards the collected events.
+        """
+        self.seconds = Counter()
+        self.counts = Counter()
+        self.labels = Counter()
+        self.n_analyses = 0
+        self.n_ambiguous_tokens = 0
+        self.n_dags = 0
+        self.n_steps = 0
+        self.n_ambiguous_steps = 0
+        self.n_nodes = 0
+        self.caches = dict()
+
+    def on_stage(self, stage: str, seconds: float, count: int) -> None:
+        self.seconds[stage] += seconds
+        self.counts[stage] += count
+
+    def on_analysis(self, label: str, n_analyses: int) -> None:
+        self.labels[label] += 1
+        self.n_analyses += n_analyses
+        if n_analyses > 1:
+            self.n_ambiguous_tokens += 1
+
+    def on_dag(self, n_steps: int, n_ambiguous_steps: int, n_nodes: int) -> None:
+        self.n_dags += 1
+        self.n_steps += n_steps
+        self.n_ambiguous_steps += n_ambiguous_steps
+        self.n_nodes += n_nodes
+
+    def on_cache(self, name: str, info: CacheInfo) -> None:
+        self.caches[name] = info
+
+    def as_dict(self) -> Dict:
+        """
+        Returns the profile as a dictionary, e.g. to export it to JSON.
+
+        :return: A dictionary with the 'stages', 'transducers', 'ambiguity' and 'caches' of the profile.
+        """
+        n_tokens = sum(self.labels.values())
+        return {
+            'stages': {
+                stage: {'seconds': self.seconds[stage], 'count': self.counts[stage]}
+                for stage in [*self.STAGES, *sorted(set(self.seconds) - set(self.STAGES))]
+                if stage in self.seconds
+            },
+            'transducers': dict(self.labels),
+            'ambiguity': {
+                'tokens': n_tokens,
+                'analyses_per_token': self.n_analyses / n_tokens if n_tokens else 0.0,
+                'ambiguous_tokens': self.n_ambiguous_tokens,
+                'dags': self.n_dags,
+                'steps_per_dag': self.n_steps / self.n_dags if self.n_dags else 0.0,
+                'ambiguous_steps_per_dag': self.n_ambiguous_steps / self.n_dags if self.n_dags else 0.0,
+                'nodes_per_step': self.n_nodes / self.n_steps if self.n_steps else 0.0
+            },
+            'caches': {
+                name: {
+                    **info._asdict(),
+                    'hit_rate': info.hits / (info.hits + info.misses) if info.hits + info.misses else 0.0
+                }
+                for name, info in self.caches.items()
+            }
+        }
+
+    def summary(self) -> str:
+        """
+        Formats the profile as a table.
+
+        :return: The summary of the profile.
+        """
+        profile = self.as_dict()
+        total = sum(stage['seconds'] for stage in profile['stages'].values())
+        lines = [f'{"stage":<16}{"count":>10}{"seconds":>10}{"%":>7}{"us/item":>10}']
+        for name, stage in profile['stages'].items():
+            lines.append(
+                f'{name:<16}{stage["count"]:>10}{stage["seconds"]:>10.3f}'
+                f'{100 * stage["seconds"] / total if total else 0.0:>7.1f}'
+                f'{1e6 * stage["seconds"] / stage["count"] if stage["count"] else 0.0:>10.1f}'
+            )
+
+        n_tokens = profile['ambiguity']['tokens']
+        if n_tokens:
+            lines.append('transducers: ' + ', '.join(
+                f'{label} {count} ({100 * count / n_tokens:.1f}%)' for label, count in self.labels.most_common()
+            ))
+            ambiguity = profile['ambiguity']
+            lines.append(
+                f'ambiguity: {ambiguity["analyses_per_token"]:.2f} analyses/token, '
+                f'{ambiguity["ambiguous_tokens"]} ambiguous tokens, {ambiguity["dags"]} DAGs, '
+                f'{ambiguity["steps_per_dag"]:.1f} steps/DAG ({ambiguity["ambiguous_steps_per_dag"]:.1f} ambiguous), '
+                f'{ambiguity["nodes_per_step"]:.2f} nodes/step'
+            )
+        for name, cache in profile['caches'].items():
+            lines.append(
+                f'{name} cache: {100 * cache["hit_rate"]:.1f}% hits '
+                f'({cache["hits"]} hits, {cache["misses"]} misses, {cache["evictions"]} evictions, '
+                f'{cache["currsize"]} entries)'
+            )
+        return '\n'.join(lines)
+
+    def print_summary(self, file: IO[str] = None) -> None:
+        """
+        Prints the summary of the profile.
+
+        :param file: The stream to print to. Defaults to sys.stderr.
+        """
+        print(self.summary(), file=file if file is not None else sys.stderr)
+
+    def __repr__(self):
+        return f'{self.__class__.__name__}({sum(self.labels.values())} tokens)'
@@ -1,5 +1,5 @@
 from abc import abstractmethod, ABC
-from typing import List, Any
+from typing import Any, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
 
 
 class Tokenizer(ABC):
@@ -17,6 +17,22 @@ class Tokenizer(ABC):
         """
         ...
 
+    def span_tokenize(self, text: str) -> Iterator[Tuple[str, str, int, int]]:
+        """
+        Split the input text into tokens with their start and end character offsets.
+
+        The default implementation locates the output of `tokenize` in the text. Tokenizers
+        that know the position of their matches should override it.
+
+        :param text: The text to be tokenized.
+        :return: An iterator of (token, type, start, end) tuples, such that text[start:end] == token.
+        """
+        end = 0
+        for token, token_type in self.tokenize(text):
+            start = text.index(token, end)
+            end = start + len(token)
+            yield token, token_type, start, end
+
     @abstractmethod
     def has_morphology(self) -> List[str]:
         """
@@ -61,6 +77,15 @@ class Transducer(ABC):
         """
         ...
 
+    def generate_many(self, analysis_forms: Iterable[str]) -> List[List[str]]:
+        """
+        Generate the possible surface forms of several analysis forms.
+
+        :param analysis_forms: The analysis forms to be used for generation.
+        :return: A list with the possible surface forms of each analysis form.
+        """
+        return [self.generate(analysis_form) for analysis_form in analysis_forms]
+
     def __repr__(self):
         """
         Returns a string representation of the Transducer.
@@ -68,6 +93,109 @@ class Transducer(ABC):
         return f'Fst({self.label})'
 
 
+class CacheInfo(NamedTuple):
+    """
+    Statistics of an analysis cache.
+    """
+    hits: int
+    misses: int
+    evictions: int
+    maxsize: Optional[int]
+    currsize: int
+
+
+class AnalysisCache(ABC):
+    """
+    Abstract class for a cache that stores the outputs of a transducer pipeline by surface form.
+    """
+
+    @abstractmethod
+    def get(self, surface_form: str) -> Optional[Tuple[str, Tuple[str, ...]]]:
+        """
+        Retrieve the cached analyses of a surface form.
+
+        :param surface_form: The surface form to look up.
+        :return: A tuple with the label of the transducer that performed the analysis and
+            its analyses, or None if the surface form is not cached.
+        """
+        ...
+
+    @abstractmethod
+    def put(self, surface_form: str, label: str, analyses: Tuple[str, ...]) -> None:
+        """
+        Store the analyses of a surface form.
+
+        :param surface_form: The surface form to store.
+        :param label: The label of the transducer that performed the analysis.
+        :param analyses: The analyses of the surface form.
+        """
+        ...
+
+    @abstractmethod
+    def info(self) -> CacheInfo:
+        """
+        Return the statistics of the cache.
+        """
+        ...
+
+    @abstractmethod
+    def clear(self) -> None:
+        """
+        Remove all the entries and reset the statistics of the cache.
+        """
+        ...
+
+
+class Instrumentation(ABC):
+    """
+    Abstract base class for a collector of the events of `YakutMorph`, e.g. to profile where
+    the time of a parse goes. The default implementations ignore the events, so a collector
+    only overrides the ones it needs.
+    """
+
+    def on_stage(self, stage: str, seconds: float, count: int) -> None:
+        """
+        Called after a stage processed a series of items. The stages are 'tokenize', 'analyse'
+        (the transducers), 'post_analysis', 'dag' (building the DAGs of the ambiguous sentences)
+        and 'disambiguate'.
+
+        :param stage: The name of the stage.
+        :param seconds: The time spent in the stage.
+        :param count: The number of items processed: tokens for 'tokenize', 'analyse' and
+            'post_analysis', and DAGs for 'dag' and 'disambiguate'.
+        """
+        pass
+
+    def on_analysis(self, label: str, n_analyses: int) -> None:
+        """
+        Called after a token was analysed.
+
+        :param label: The label of the transducer of the pipeline that analysed the token.
+        :param n_analyses: The number of analyses of the token.
+        """
+        pass
+
+    def on_dag(self, n_steps: int, n_ambiguous_steps: int, n_nodes: int) -> None:
+        """
+        Called after the DAG of an ambiguous sentence was built.
+
+        :param n_steps: The number of steps of the DAG, including '<BOS>' and '<EOS>'.
+        :param n_ambiguous_steps: The number of steps with more than one node, i.e. where the
+            disambiguation model has to choose.
+        :param n_nodes: The total number of nodes of the DAG.
+        """
+        pass
+
+    def on_cache(self, name: str, info: CacheInfo) -> None:
+        """
+        Called at the end of a parse with the statistics of an analysis cache of the transducer.
+
+        :param name: The name of the cache: 'memory' for the in-memory cache.
+        :param info: The statistics of the cache since it was created or cleared.
+        """
+        pass
+
+
 class DisambiguationModel(ABC):
     """
     Abstract class for a morphological disambiguation process.
@@ -83,6 +211,54 @@ class DisambiguationModel(ABC):
         """
         ...
 
+    def disambiguate_batch(self, graphs: List[List[List[str]]]) -> List[List[str]]:
+        """
+        Select the most probable interpretation from each graph in a batch. The default
+        implementation disambiguates the graphs one by one.
+
+        :param graphs: A list of graphs representing multiple possible analyses.
+        :return: The most probable interpretation selected from each graph.
+        """
+        return [self.disambiguate(graph) for graph in graphs]
+
+    def get_vocabulary(self) -> Optional[Tuple[Dict[str, int], int]]:
+        """
+        Returns the vocabulary of the model if it can disambiguate graphs of vocabulary
+        indices with `disambiguate_encoded`. The default implementation returns None.
+
+        :return: A tuple containing a dictionary mapping the nodes to vocabulary indices and
+            the index of the nodes out of the vocabulary, or None.
+        """
+        return None
+
+    def disambiguate_encoded(self, graphs: List[List[List[int]]]) -> List[List[int]]:
+        """
+        Select the most probable interpretation from each graph in a batch of graphs whose
+        nodes are vocabulary indices, without duplicates in a step. Only supported by the
+        models that return a vocabulary from `get_vocabulary`.
+
+        :param graphs: A list of graphs of vocabulary indices.
+        :return: The indices of the selected nodes of each graph.
+        """
+        raise NotImplementedError(f'{self.__class__.__name__} does not disambiguate graphs of vocabulary indices')
+
+    def disambiguate_incremental(self, graph: List[List[int]], state: Any = None) -> Tuple[List[int], Any]:
+        """
+        Select the most probable interpretation from a graph of vocabulary indices, reusing the
+        state returned for a previous graph (e.g. the same sentence before an edit). The default
+        implementation disambiguates the graph from scratch with `disambiguate_encoded` and
+        returns no state. Only supported by the models that return a vocabulary from `get_vocabulary`.
+
+        :param graph: A graph of vocabulary indices.
+        :param state: The state returned for a previous graph, if any.
+        :return: A tuple containing the indices of the selected nodes and the state of the graph.
+        """
+        if self.get_vocabulary() is None:
+            raise TypeError(
+                f'{self.__class__.__name__} has no vocabulary, so it cannot disambiguate graphs of vocabulary indices'
+            )
+        return self.disambiguate_encoded([graph])[0], None
+
 
 class PostAnalysis(ABC):
     """
@@ -158,3 +334,15 @@ class OutputFormat(ABC):
     @staticmethod
     def apply(*args, **kwargs) -> Any:
         ...
+
+    @classmethod
+    def from_batch(cls, batch, headers: List[Any] = None) -> List[Any]:
+        """
+        Formats each sentence of a ParseBatch. The Parse object of each sentence is built
+        from the batch only while it is formatted.
+
+        :param batch: A ParseBatch object.
+        :param headers: The header of each sentence, if any.
+        :return: A list with the formatted sentences.
+        """
+        return [cls(parse, headers[idx] if headers else None) for idx, parse in enumerate(batch)]
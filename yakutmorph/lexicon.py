@@ -0,0 +1,155 @@
+import mmap
+import os
+import struct
+import tempfile
+import zlib
+from typing import Iterable, Optional, Sequence, Tuple
+
+# The file starts with a header, followed by an open-addressing hash table of buckets and the
+# entries. A bucket holds the CRC-32 of the key of an entry and the offset of the entry (0 for
+# an empty bucket). An entry holds the lengths of its key and value, the UTF-8 encoded key and
+# the value: the label of the transducer and its analyses, separated by SEPARATOR.
+MAGIC = b'YMLEX\x00\x01\x00'
+HEADER = struct.Struct('<8s32sQQ')
+BUCKET = struct.Struct('<IQ')
+ENTRY = struct.Struct('<HI')
+SEPARATOR = '\x1f'
+
+
+def write_lexicon(path: str, entries: Iterable[Tuple[str, str, Sequence[str]]], fingerprint: str) -> int:
+    """
+    Writes a full-form lexicon. The file is written next to the path and then moved into
+    place, so that processes that have the previous version mapped are not affected.
+
+    :param path: The path to the lexicon file.
+    :param entries: An iterable of tuples with a (lowercased) surface form, the label of the
+        transducer that analysed it and its analyses. Only the first entry of a surface form is kept.
+    :param fingerprint: The fingerprint of the transducers that produced the analyses.
+    :return: The number of surface forms in the lexicon.
+    """
+    keys = list()
+    values = list()
+    seen = set()
+    for surface_form, label, analyses in entries:
+        if surface_form in seen:
+            continue
+        seen.add(surface_form)
+        keys.append(surface_form.encode('utf-8'))
+        values.append(SEPARATOR.join([label, *analyses]).encode('utf-8'))
+
+    # A power of two of at least twice the number of entries keeps the probe sequences short
+    n_buckets = 1
+    while n_buckets < 2 * len(keys):
+        n_buckets *= 2
+    mask = n_buckets - 1
+
+    buckets = bytearray(n_buckets * BUCKET.size)
+    offset = HEADER.size + len(buckets)
+    data = list()
+    for key, value in zip(keys, values):
+        key_hash = zlib.crc32(key)
+        i = key_hash & mask
+        while BUCKET.unpack_from(buckets, i * BUCKET.size)[1]:
+            i = (i + 1) & mask
+        BUCKET.pack_into(buckets, i * BUCKET.size, key_hash, offset)
+        entry = ENTRY.pack(len(key), len(value)) + key + value
+        data.append(entry)
+        offset += len(entry)
+
+    # A unique temporary file, so that concurrent builds of the same lexicon do not write to the same file
+    fd, tmp_path = tempfile.mkstemp(
+        prefix=f'{os.path.basename(path)}.', suffix='.tmp', dir=os.path.dirname(path) or '.'
+    )
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(HEADER.pack(MAGIC, bytes.fromhex(fingerprint), n_buckets, len(keys)))
+            f.write(buckets)
+            f.writelines(data)
+        # mkstemp creates the file readable by its owner only
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+    return len(keys)
+
+
+class FullFormLexicon:
+    """
+    A read-only lexicon of precomputed analyses, built from a list of word forms by
+    `YakutTransducerPipeline.build_lexicon`.
+
+    The file is memory-mapped, so lookups do not load it into the memory of the process, and
+    all the processes that use the same file share it through the page cache. A lookup hashes
+    the surface form and reads the matching entry in place.
+    """
+
+    def __init__(self, path: str, fingerprint: str = None):
+        """
+        Opens a lexicon file.
+
+        :param path: The path to the lexicon file.
+        :param fingerprint: The fingerprint of the transducers of the pipeline. If provided, it
+            must match the fingerprint of the transducers the lexicon was built with.
+        """
+        self.path = path
+        with open(path, 'rb') as f:
+            self.mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, digest, self.n_buckets, self.n_entries = HEADER.unpack_from(self.mmap, 0)
+        if magic != MAGIC:
+            self.mmap.close()
+            raise ValueError(f'{path} is not a full-form lexicon')
+        self.fingerprint = digest.hex()
+        if fingerprint is not None and fingerprint != self.fingerprint:
+            self.mmap.close()
+            raise ValueError(f'The lexicon {path} was built with different transducers')
+        self.mask = self.n_buckets - 1
+
+    def get(self, surface_form: str) -> Optional[Tuple[str, Tuple[str, ...]]]:
+        """
+        Looks up the analyses of a surface form.
+
+        :param surface_form: The (lowercased) surface form to look up.
+        :return: A tuple with the label of the transducer and its analyses, or None if the
+            surface form is not in the lexicon.
+        """
+        mm = self.mmap
+        key = surface_form.encode('utf-8')
+        key_hash = zlib.crc32(key)
+        i = key_hash & self.mask
+        while True:
+            bucket_hash, offset = BUCKET.unpack_from(mm, HEADER.size + i * BUCKET.size)
+            if not offset:
+                return None
+            if bucket_hash == key_hash:
+                key_size, value_size = ENTRY.unpack_from(mm, offset)
+                start = offset + ENTRY.size
+                if mm[start:start + key_size] == key:
+                    start += key_size
+                    label, *analyses = mm[start:start + value_size].decode('utf-8').split(SEPARATOR)
+                    return label, tuple(analyses)
+            i = (i + 1) & self.mask
+
+    def close(self) -> None:
+        """
+        Unmaps the file.
+        """
+        self.mmap.close()
+
+    def __contains__(self, surface_form: str):
+        return self.get(surface_form) is not None
+
+    def __len__(self):
+        return self.n_entries
+
+    def __getstate__(self):
+        """
+        The memory map cannot be pickled, so the file is mapped again on unpickling.
+        """
+        return {'path': self.path, 'fingerprint': self.fingerprint}
+
+    def __setstate__(self, state):
+        self.__init__(state['path'], state['fingerprint'])
+
+    def __repr__(self):
+        return f'{self.__class__.__name__}({self.path}, {self.n_entries})'
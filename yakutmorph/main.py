@@ -1,37 +1,127 @@
-from typing import List
+from time import perf_counter
+from typing import IO, Any, Iterable, Iterator, List, Optional, Tuple, Union
 
-from .disambiguation import YakutModel
-from .interfaces import Tokenizer, Transducer, DisambiguationModel, PostAnalysis, Mapper
-from .mappers import YakutMapper
-from .tokenizers import YakutTokenizer
+from .interfaces import Tokenizer, Transducer, DisambiguationModel, PostAnalysis, Mapper, Instrumentation
+from .mappers import YakutMapper, CoNLLU, CoNLLUWriter, output_formats
+from .tokenizers import YakutTokenizer, YakutSentenceSplitter
 from .transducers import YakutTransducerPipeline, PostPipeline, YakutMorphReference
-from .wrappers import Parse, Token, Analyses, Analysis
+from .wrappers import DAG, DAGEncoder, Analysis, Parse, ParseBatch, Token, Analyses, AnalysisTable
 
 
 class YakutMorph:
     """
     A class used to perform morphological analysis on Yakut language texts.
 
+    The default transducer, disambiguation model and mapper are loaded on first use, so that
+    creating a YakutMorph object is cheap and a run that only tokenizes never loads the
+    transducers, and one that never meets an ambiguous sentence never loads the model.
+
     Attributes
     ----------
     tokenizer : The tokenizer to split input text into tokens. Default is YakutTokenizer.
     transducer : The transducer to perform morphological analysis. Default is YakutTransducerPipeline.
-    disambiguation_model : The model used to disambiguate morphological analyses. Default is YakutModel.
+    disambiguation_model : The model used to disambiguate morphological analyses. Default is
+        YakutNumpyModel, which makes the same selections as the PyTorch YakutModel without torch.
     mapper : The mapper used for parsing DAGs. Default is YakutMapper with 'data/mappings.yaml'.
     reference: A reference to map the implemented morphology.
+    cache_size: The maximum number of surface forms kept in the analysis cache of the default
+        transducer. A value of 0 disables the cache.
+    cache_path: The path to a SQLite database used by the default transducer as a persistent cache.
+    lexicon_path: The path to a full-form lexicon used by the default transducer before the FSTs.
+    quantization: Quantize the weights of the default disambiguation model to 'float16' or 'int8'
+        to reduce its memory. Defaults to None (float32).
+    analysis_table: The table that shares Analysis objects among tokens and sentences.
+    encoder: The encoder of parses into DAGs of vocabulary indices, built from the mapper and the
+        vocabulary of the disambiguation model, or None if the model does not provide a vocabulary.
+    splitter: The sentence splitter used by `iter_parse`. Default is YakutSentenceSplitter.
+    instrumentation: A collector of the timings of each stage, the transducers that analysed the
+        tokens, the ambiguity of the analyses and the statistics of the analysis cache (e.g. a
+        Profiler). Disabled by default, in which case the stages are not timed.
     """
     def __init__(self,
                  tokenizer: Tokenizer = None,
                  transducer: Transducer = None,
                  disambiguation_model: DisambiguationModel = None,
                  mapper: Mapper = None,
-                 reference: YakutMorphReference = None
+                 reference: YakutMorphReference = None,
+                 cache_size: int = 50000,
+                 cache_path: str = None,
+                 splitter: YakutSentenceSplitter = None,
+                 quantization: str = None,
+                 lexicon_path: str = None,
+                 instrumentation: Instrumentation = None
                  ):
 
         self.tokenizer = tokenizer if tokenizer else YakutTokenizer()
-        self.transducer = transducer if transducer else YakutTransducerPipeline(morph_reference=reference)
-        self.disambiguation_model = disambiguation_model if disambiguation_model else YakutModel()
-        self.mapper = mapper if mapper else YakutMapper('data/mappings.yaml', inside_package=True)
+        self.reference = reference
+        self.cache_size = cache_size
+        self.cache_path = cache_path
+        self.quantization = quantization
+        self.lexicon_path = lexicon_path
+        self._transducer = transducer
+        self._disambiguation_model = disambiguation_model
+        self._mapper = mapper
+        self._encoder = None
+        # The CoNLL-U writer of annotate_many, which keeps the columns of the analyses it has formatted
+        self._writer = None
+        self.analysis_table = AnalysisTable()
+        self.splitter = splitter if splitter else YakutSentenceSplitter(self.tokenizer)
+        self.instrumentation = instrumentation
+
+    @property
+    def transducer(self) -> Transducer:
+        if self._transducer is None:
+            self._transducer = YakutTransducerPipeline(
+                morph_reference=self.reference, cache_size=self.cache_size, cache_path=self.cache_path,
+                lexicon_path=self.lexicon_path
+            )
+        return self._transducer
+
+    @transducer.setter
+    def transducer(self, transducer: Transducer) -> None:
+        self._transducer = transducer
+
+    @property
+    def disambiguation_model(self) -> DisambiguationModel:
+        if self._disambiguation_model is None:
+            # Imported here, so that numpy is only loaded when a sentence has to be disambiguated
+            from .numpy_backend import YakutNumpyModel
+            self._disambiguation_model = YakutNumpyModel(quantization=self.quantization)
+        return self._disambiguation_model
+
+    @disambiguation_model.setter
+    def disambiguation_model(self, disambiguation_model: DisambiguationModel) -> None:
+        self._disambiguation_model = disambiguation_model
+        self._encoder = None
+
+    @property
+    def mapper(self) -> Mapper:
+        if self._mapper is None:
+            self._mapper = YakutMapper('data/mappings.yaml', inside_package=True)
+        return self._mapper
+
+    @mapper.setter
+    def mapper(self, mapper: Mapper) -> None:
+        self._mapper = mapper
+        self._encoder = None
+
+    @property
+    def encoder(self) -> Optional[DAGEncoder]:
+        if self._encoder is None:
+            vocabulary = self.disambiguation_model.get_vocabulary()
+            # False marks a model without a vocabulary, which is given DAGs of strings
+            self._encoder = DAGEncoder(self.mapper, *vocabulary) if vocabulary else False
+        return self._encoder or None
+
+    def load(self) -> 'YakutMorph':
+        """
+        Loads the components that are not loaded yet, e.g. before serving requests.
+
+        :return: The YakutMorph object.
+        """
+        # Accessing the properties loads the default components
+        self.transducer, self.disambiguation_model, self.mapper
+        return self
 
     def __tokenize(self, input_text: str) -> List[Token]:
         """
@@ -40,43 +130,184 @@ class YakutMorph:
         :param input_text: The text to be tokenized.
         :return: A list of Token objects.
         """
+        return self.__wrap_tokens(self.__span_tokenize(input_text))
+
+    def __span_tokenize(self, input_text: str) -> Iterable[Tuple[str, str, int, int]]:
+        """
+        Tokenizes the input text into (token, type, start, end) tuples, timing the tokenizer
+        if the instrumentation is enabled.
+
+        :param input_text: The text to be tokenized.
+        :return: An iterable of (token, type, start, end) tuples.
+        """
+        if self.instrumentation is None:
+            return self.tokenizer.span_tokenize(input_text)
+        start = perf_counter()
+        tokens = list(self.tokenizer.span_tokenize(input_text))
+        self.instrumentation.on_stage('tokenize', perf_counter() - start, len(tokens))
+        return tokens
+
+    def __timed_sentences(
+            self,
+            sentences: Iterable[Tuple[str, List[Tuple[str, str, int, int]]]]
+            ) -> Iterator[Tuple[str, List[Tuple[str, str, int, int]]]]:
+        """
+        Times the sentence splitter, which tokenizes the sentences it yields.
+
+        :param sentences: An iterable of (sentence, tokens) tuples.
+        :return: An iterator over the same tuples.
+        """
+        iterator = iter(sentences)
+        while True:
+            start = perf_counter()
+            try:
+                sentence, tokens = next(iterator)
+            except StopIteration:
+                return
+            self.instrumentation.on_stage('tokenize', perf_counter() - start, len(tokens))
+            yield sentence, tokens
+
+    def __wrap_tokens(self, tokens: Iterable[Tuple[str, str, int, int]]) -> List[Token]:
+        """
+        Wraps the output of the tokenizer into a list of Token objects.
+
+        :param tokens: An iterable of (token, type, start, end) tuples.
+        :return: A list of Token objects.
+        """
+        has_morphology = self.tokenizer.has_morphology()
         return [
-            Token(i + 1, token[0], token[1], True if token[1] in self.tokenizer.has_morphology() else False)
-            for i, token in enumerate(self.tokenizer.tokenize(input_text))
+            Token(i + 1, surface, token_type, token_type in has_morphology, start=start, end=end)
+            for i, (surface, token_type, start, end) in enumerate(tokens)
         ]
 
     def __analyse(self, tokens: List[Token], post_analysis: PostAnalysis):
         """
-        Analyzes the morphology of the given tokens.
+        Analyzes the morphology of the given tokens. The analyses are shared through
+        the analysis table, and the post-analysis only selects which shared analysis
+        a token points to.
 
         :param tokens: The list of Token objects to analyze.
         :param post_analysis: A PostAnalysis object to post-process the analyses.
         :return: The list of Tokens with their morphology analyzed.
         """
+        get_analyses = self.__get_analyses if self.instrumentation is None else self.__get_analyses_instrumented
         for token in tokens:
             if token.has_morph:
-                fst, analyses = self.transducer.analyse(token.surface)
-                token.analyses = Analyses(fst=fst, output=[
-                    Analysis(
-                        morphemes=
-                        post_analysis.apply(
-                            fst.get_morphemes(analysis), token.surface, token.pos
-                        ),
-                        reference=fst.reference
-                    )
-                    for analysis in analyses
-                    ]
-                )
+                fst, analyses = get_analyses(token.surface, token.pos, post_analysis)
+                token.analyses = Analyses(fst=fst, output=analyses)
         return tokens
 
-    def __disambiguate(self, dag: List[List[str]]) -> List[int]:
+    def __get_analyses(self, surface: str, pos: int, post_analysis: PostAnalysis) -> Tuple[Transducer, List[Analysis]]:
+        """
+        Analyzes the morphology of a token.
+
+        :param surface: The surface form of the token.
+        :param pos: The position of the token.
+        :param post_analysis: A PostAnalysis object to post-process the analyses.
+        :return: A tuple containing the transducer that analysed the token and its shared Analysis objects.
+        """
+        table = self.analysis_table
+        fst, analyses = self.transducer.analyse(surface)
+        return fst, [
+            table.get_analysis(fst, post_analysis.apply(list(table.get_morphemes(fst, analysis)), surface, pos))
+            for analysis in analyses
+        ]
+
+    def __get_analyses_instrumented(
+            self,
+            surface: str,
+            pos: int,
+            post_analysis: PostAnalysis
+            ) -> Tuple[Transducer, List[Analysis]]:
+        """
+        Analyzes the morphology of a token as `__get_analyses` does, and reports the time spent
+        in the transducer and in the post-analysis (including the analysis table).
+
+        :param surface: The surface form of the token.
+        :param pos: The position of the token.
+        :param post_analysis: A PostAnalysis object to post-process the analyses.
+        :return: A tuple containing the transducer that analysed the token and its shared Analysis objects.
+        """
+        instrumentation = self.instrumentation
+        table = self.analysis_table
+        start = perf_counter()
+        fst, analyses = self.transducer.analyse(surface)
+        analysed = perf_counter()
+        analyses = [
+            table.get_analysis(fst, post_analysis.apply(list(table.get_morphemes(fst, analysis)), surface, pos))
+            for analysis in analyses
+        ]
+        instrumentation.on_stage('analyse', analysed - start, 1)
+        instrumentation.on_stage('post_analysis', perf_counter() - analysed, 1)
+        instrumentation.on_analysis(fst.label, len(analyses))
+        return fst, analyses
+
+    def __report_dags(self, dags: List[DAG], seconds: float) -> None:
+        """
+        Reports the time spent building a series of DAGs and the ambiguity of each of them.
+
+        :param dags: The DAGs.
+        :param seconds: The time spent building them.
+        """
+        instrumentation = self.instrumentation
+        instrumentation.on_stage('dag', seconds, len(dags))
+        for dag in dags:
+            instrumentation.on_dag(len(dag), sum(len(step) > 1 for step in dag), sum(len(step) for step in dag))
+
+    def __report_caches(self) -> None:
+        """
+        Reports the statistics of the in-memory analysis cache of the transducer, if any. The
+        persistent cache is not reported, since its statistics are read from the database.
+        """
+        cache_info = getattr(self._transducer, 'cache_info', None)
+        info = cache_info() if cache_info is not None else None
+        if info is not None:
+            self.instrumentation.on_cache('memory', info)
+
+    def __get_dag(self, parse: Parse) -> DAG:
+        """
+        Builds the DAG of a parse: a DAG of vocabulary indices if the disambiguation model
+        provides a vocabulary, or a DAG of strings otherwise.
+
+        :param parse: The Parse object.
+        :return: The DAG of the parse.
+        """
+        encoder = self.encoder
+        if self.instrumentation is None:
+            return encoder.encode(parse) if encoder else parse.get_dag(self.mapper)
+        start = perf_counter()
+        dag = encoder.encode(parse) if encoder else parse.get_dag(self.mapper)
+        self.__report_dags([dag], perf_counter() - start)
+        return dag
+
+    def __disambiguate(self, dags: List[DAG]) -> List[List[int]]:
         """
         Disambiguates the morphological analyses using the disambiguation model.
 
-        :param dag: The directed acyclic graph representing possible analyses.
-        :return: The list of indexes representing the chosen analyses.
+        :param dags: The directed acyclic graphs representing possible analyses.
+        :return: The indexes of the chosen nodes of each DAG.
         """
-        return self.disambiguation_model.disambiguate(dag)
+        model = self.disambiguation_model
+        disambiguate = model.disambiguate_encoded if self.encoder else model.disambiguate_batch
+        if self.instrumentation is None:
+            return disambiguate(dags)
+        start = perf_counter()
+        indexes = disambiguate(dags)
+        self.instrumentation.on_stage('disambiguate', perf_counter() - start, len(dags))
+        return indexes
+
+    def __set_mla(self, parse: Parse, indexes: List[int] = None) -> None:
+        """
+        Sets the most likely analysis of each token with morphology.
+
+        :param parse: The Parse object to update.
+        :param indexes: The indexes of the chosen analyses, one per token. If not provided,
+            the first analysis is chosen for every token.
+        """
+        if indexes is None:
+            [token.analyses.set_mla(0) for token in parse.tokens if token.has_morph]
+        else:
+            [token.analyses.set_mla(idx) for token, idx in zip(parse.tokens, indexes) if token.has_morph]
 
     def parse(self, input_text: str, post_analysis: PostAnalysis = PostPipeline):
         """
@@ -91,10 +322,289 @@ class YakutMorph:
         parse = Parse(input_text, self.__analyse(tokens, post_analysis))
 
         if parse.is_ambiguous():
-            dag = parse.get_dag(self.mapper)
-            indexes = self.__disambiguate(dag)
-            [token.analyses.set_mla(idx) for token, idx in zip(parse.tokens, indexes) if token.has_morph]
+            dag = self.__get_dag(parse)
+            # The model is only needed if the analyses of a token reduce to different nodes
+            self.__set_mla(parse, dag.get_indexes(self.__disambiguate([dag])[0] if dag.is_ambiguous() else None))
         else:
-            [token.analyses.set_mla(0) for token in parse.tokens if token.has_morph]
+            self.__set_mla(parse)
 
+        if self.instrumentation is not None:
+            self.__report_caches()
         return parse
+
+    def reparse(
+            self,
+            parse: Parse,
+            start: int,
+            end: int,
+            replacement: str,
+            post_analysis: PostAnalysis = PostPipeline
+            ) -> Parse:
+        """
+        Parses an edited version of a parsed text, in which text[start:end] is replaced, repeating
+        only the work whose input changed. The result is the same as parsing the edited text.
+
+        The edited text is tokenized until its tokens line up with the previous ones after the
+        edit, and the remaining tokens are reused with shifted offsets. The analyses of the
+        tokens with the same surface form, type and position are reused as well, so only the
+        changed tokens, and the tokens whose position changed, are analysed again. If the
+        disambiguation model supports it (see `DisambiguationModel.disambiguate_incremental`),
+        the beam search resumes from the first step of the DAG that changed.
+
+        :param parse: The Parse object of the text before the edit, parsed with the same
+            post-analysis. It is not modified.
+        :param start: The offset of the first replaced character.
+        :param end: The offset after the last replaced character. Equal to `start` for an insertion.
+        :param replacement: The text inserted in place of text[start:end]. Empty for a deletion.
+        :param post_analysis: The post-analysis process to apply. Defaults to PostPipeline.
+        :return: A Parse object of the edited text, which can be edited again.
+        """
+        text = parse.text
+        if not 0 <= start <= end <= len(text):
+            raise ValueError(f'Invalid edit ({start}, {end}) of a text of length {len(text)}')
+        input_text = text[:start] + replacement + text[end:]
+        shift = len(replacement) - (end - start)
+        previous = parse.tokens
+
+        timer = perf_counter() if self.instrumentation is not None else None
+        spans, suffix = self.__retokenize(previous, input_text, end, shift)
+        if timer is not None:
+            self.instrumentation.on_stage('tokenize', perf_counter() - timer, len(spans))
+
+        has_morphology = self.tokenizer.has_morphology()
+        get_analyses = self.__get_analyses if self.instrumentation is None else self.__get_analyses_instrumented
+        tokens = list()
+        edited = [
+            (previous[pos - 1] if pos <= len(previous) else None, surface, token_type, token_start, token_end)
+            for pos, (surface, token_type, token_start, token_end) in enumerate(spans, start=1)
+        ]
+        edited.extend((token, token.surface, token.type, token.start + shift, token.end + shift) for token in suffix)
+        for pos, (token, surface, token_type, token_start, token_end) in enumerate(edited, start=1):
+            has_morph = token_type in has_morphology
+            analyses = None
+            if has_morph:
+                if token is not None and token.pos == pos and token.surface == surface and token.type == token_type:
+                    analyses = Analyses(fst=token.analyses.fst, output=token.analyses.output)
+                else:
+                    fst, output = get_analyses(surface, pos, post_analysis)
+                    analyses = Analyses(fst=fst, output=output)
+            tokens.append(Token(pos, surface, token_type, has_morph, analyses, token_start, token_end))
+
+        # The state of the previous parse is kept until a DAG has to be disambiguated again
+        edited_parse = Parse(input_text, tokens, parse.disambiguation_state)
+        if edited_parse.is_ambiguous():
+            dag = self.__get_dag(edited_parse)
+            if not dag.is_ambiguous():
+                self.__set_mla(edited_parse, dag.get_indexes())
+            elif self.encoder:
+                timer = perf_counter() if self.instrumentation is not None else None
+                indexes, edited_parse.disambiguation_state = self.disambiguation_model.disambiguate_incremental(
+                    dag, parse.disambiguation_state
+                )
+                if timer is not None:
+                    self.instrumentation.on_stage('disambiguate', perf_counter() - timer, 1)
+                self.__set_mla(edited_parse, dag.get_indexes(indexes))
+            else:
+                self.__set_mla(edited_parse, dag.get_indexes(self.__disambiguate([dag])[0]))
+        else:
+            self.__set_mla(edited_parse)
+
+        if self.instrumentation is not None:
+            self.__report_caches()
+        return edited_parse
+
+    def __retokenize(
+            self,
+            tokens: List[Token],
+            input_text: str,
+            end: int,
+            shift: int
+            ) -> Tuple[List[Tuple[str, str, int, int]], List[Token]]:
+        """
+        Tokenizes an edited text until its tokens line up with the tokens of the text before
+        the edit. A token of YakutTokenizer only depends on the text from the character before
+        it on, so once a token starts after the edit where a previous token started, the
+        following tokens are the same. Other tokenizers tokenize the whole text.
+
+        :param tokens: The tokens of the text before the edit.
+        :param input_text: The edited text.
+        :param end: The offset after the last replaced character in the text before the edit.
+        :param shift: The difference between the lengths of the edited text and the previous one.
+        :return: A tuple containing the (token, type, start, end) tuples of the edited text up
+            to the first token that lines up, and the previous tokens from that token on.
+        """
+        if not isinstance(self.tokenizer, YakutTokenizer) or any(token.start is None for token in tokens):
+            return list(self.tokenizer.span_tokenize(input_text)), list()
+        # The tokens that start at least one character after the edit
+        aligned = {token.start + shift: i for i, token in enumerate(tokens) if token.start > end}
+        spans = list()
+        for span in self.tokenizer.span_tokenize(input_text):
+            i = aligned.get(span[2])
+            if i is not None:
+                return spans, tokens[i:]
+            spans.append(span)
+        return spans, list()
+
+    def parse_many(
+            self,
+            input_texts: Iterable[str],
+            post_analysis: PostAnalysis = PostPipeline,
+            batch_size: int = 64
+            ) -> List[Parse]:
+        """
+        Parses several input texts, disambiguating the ambiguous ones in batches
+        with a single call to the disambiguation model per batch.
+
+        :param input_texts: The texts to parse.
+        :param post_analysis: The post-analysis process to apply. Defaults to PostPipeline.
+        :param batch_size: The maximum number of texts disambiguated together. Defaults to 64.
+        :return: A list of Parse objects, in the same order as the input texts.
+        """
+        parses = [
+            Parse(input_text, self.__analyse(self.__tokenize(input_text), post_analysis))
+            for input_text in input_texts
+        ]
+        self.__disambiguate_batch(parses, batch_size)
+        return parses
+
+    def parse_batch(
+            self,
+            input_texts: Iterable[str],
+            post_analysis: PostAnalysis = PostPipeline,
+            batch_size: int = 64
+            ) -> ParseBatch:
+        """
+        Parses several input texts into a columnar ParseBatch, without building a Token
+        object per token. The ambiguous texts are disambiguated directly from the columns,
+        in batches.
+
+        :param input_texts: The texts to parse.
+        :param post_analysis: The post-analysis process to apply. Defaults to PostPipeline.
+        :param batch_size: The maximum number of texts disambiguated together. Defaults to 64.
+        :return: A ParseBatch object, with the texts in the same order as the input texts.
+        """
+        batch = ParseBatch()
+        has_morphology = self.tokenizer.has_morphology()
+        get_analyses = self.__get_analyses if self.instrumentation is None else self.__get_analyses_instrumented
+        for input_text in input_texts:
+            tokens = list()
+            for pos, (surface, token_type, start, end) in enumerate(self.__span_tokenize(input_text), start=1):
+                if token_type in has_morphology:
+                    fst, analyses = get_analyses(surface, pos, post_analysis)
+                    tokens.append((surface, token_type, start, end, fst, analyses, 0))
+                else:
+                    tokens.append((surface, token_type, start, end, None, (), -1))
+            batch.append(input_text, tokens)
+
+        ambiguous = [idx for idx in range(len(batch)) if batch.is_ambiguous(idx)]
+        encoder = self.encoder
+        start = perf_counter()
+        if encoder:
+            dags = encoder.encode_batch(batch, ambiguous)
+        else:
+            dags = [batch[idx].get_dag(self.mapper) for idx in ambiguous]
+        if self.instrumentation is not None:
+            self.__report_dags(dags, perf_counter() - start)
+        # As in parse_many, the sentences whose DAG is not ambiguous are not disambiguated
+        for idx, dag in zip(ambiguous, dags):
+            if not dag.is_ambiguous():
+                batch.set_mla(idx, dag.get_indexes())
+        ambiguous = [(idx, dag) for idx, dag in zip(ambiguous, dags) if dag.is_ambiguous()]
+        for i in range(0, len(ambiguous), batch_size):
+            chunk = ambiguous[i:i + batch_size]
+            indexes = self.__disambiguate([dag for _, dag in chunk])
+            for (idx, dag), dag_indexes in zip(chunk, indexes):
+                batch.set_mla(idx, dag.get_indexes(dag_indexes))
+        if self.instrumentation is not None:
+            self.__report_caches()
+        return batch
+
+    def annotate_many(
+            self,
+            input_texts: List[str],
+            output_format: str = 'parse',
+            headers: List[Any] = None,
+            post_analysis: PostAnalysis = PostPipeline,
+            batch_size: int = 64
+            ) -> List[Any]:
+        """
+        Parses several input texts and formats them in one of the output formats of the
+        `mappers` module. The CoNLL-U and JSON formats are built from a ParseBatch.
+
+        :param input_texts: The texts to parse.
+        :param output_format: 'parse' (Parse objects), 'conllu' (CoNLL-U strings) or 'json'
+            (YakutAnnotation dictionaries). Defaults to 'parse'.
+        :param headers: The header of each text passed to the output format, if any.
+        :param post_analysis: The post-analysis process to apply. Defaults to PostPipeline.
+        :param batch_size: The maximum number of texts disambiguated together. Defaults to 64.
+        :return: A list with the annotation of each text, in the same order as the input texts.
+        """
+        if output_format not in output_formats:
+            raise ValueError(f'Unknown output format "{output_format}", expected one of {list(output_formats)}')
+        formatter = output_formats[output_format]
+        if formatter is None:
+            return self.parse_many(input_texts, post_analysis, batch_size)
+        batch = self.parse_batch(input_texts, post_analysis, batch_size)
+        if formatter is CoNLLU:
+            if self._writer is None:
+                self._writer = CoNLLUWriter()
+            return self._writer.format_batch(batch, headers)
+        return formatter.from_batch(batch, headers)
+
+    def __disambiguate_batch(self, parses: List[Parse], batch_size: int) -> None:
+        """
+        Sets the most likely analyses of a list of parses, disambiguating the ambiguous ones in batches.
+
+        :param parses: The list of Parse objects.
+        :param batch_size: The maximum number of parses disambiguated together.
+        """
+        ambiguous = list()
+        for parse in parses:
+            if not parse.is_ambiguous():
+                self.__set_mla(parse)
+                continue
+            dag = self.__get_dag(parse)
+            if dag.is_ambiguous():
+                ambiguous.append((parse, dag))
+            else:
+                self.__set_mla(parse, dag.get_indexes())
+
+        for i in range(0, len(ambiguous), batch_size):
+            batch = ambiguous[i:i + batch_size]
+            indexes = self.__disambiguate([dag for _, dag in batch])
+            for (parse, dag), dag_indexes in zip(batch, indexes):
+                self.__set_mla(parse, dag.get_indexes(dag_indexes))
+        if self.instrumentation is not None:
+            self.__report_caches()
+
+    def iter_parse(
+            self,
+            text_or_file: Union[str, IO[str]],
+            post_analysis: PostAnalysis = PostPipeline,
+            batch_size: int = 16
+            ) -> Iterator[Parse]:
+        """
+        Splits a text or a text file into sentences and lazily parses them. The file is read
+        line by line, so only the sentences of the current batch are kept in memory.
+
+        :param text_or_file: A text or a file-like object opened in text mode.
+        :param post_analysis: The post-analysis process to apply. Defaults to PostPipeline.
+        :param batch_size: The number of sentences disambiguated together. Defaults to 16.
+        :return: An iterator over the Parse object of each sentence.
+        """
+        if isinstance(text_or_file, str):
+            sentences = self.splitter.split(text_or_file)
+        else:
+            sentences = self.splitter.iter_split(text_or_file)
+        if self.instrumentation is not None:
+            sentences = self.__timed_sentences(sentences)
+
+        batch = list()
+        for sentence, tokens in sentences:
+            batch.append(Parse(sentence, self.__analyse(self.__wrap_tokens(tokens), post_analysis)))
+            if len(batch) == batch_size:
+                self.__disambiguate_batch(batch, batch_size)
+                yield from batch
+                batch = list()
+        self.__disambiguate_batch(batch, batch_size)
+        yield from batch
@@ -1,17 +1,14 @@
-from typing import List, Dict
+from typing import IO, Any, Dict, List, Optional
 
-import yaml
-
-from .interfaces import Mapper, OutputFormat
-from .utils import get_file_path
-from .wrappers import Morph, Parse, Token
+from .interfaces import Mapper, OutputFormat, Transducer
+from .utils import get_file_path, load_yaml
+from .wrappers import Analysis, Morph, Parse, ParseBatch, Token, generate_lemmas
 
 
 class YakutMapper(Mapper):
     def __init__(self, path_to_file: str, inside_package: bool = False):
         path = get_file_path(path_to_file) if inside_package else path_to_file
-        with open(path, 'r') as f:
-            self.mappings = yaml.safe_load(f)
+        self.mappings = load_yaml(path)
 
     def reduce_morph(self, morphs: List[str]) -> List[str]:
         return [morph.split('#')[0] for morph in morphs]
@@ -29,10 +26,115 @@ class YakutMapper(Mapper):
         return self.mappings['token_type_mapping'].get(token_type, token_type)
 
 
+def _map_token_type(token_type: str, tag_type: str) -> str:
+    """Maps tokens without morphology."""
+    if token_type in ['number', 'roman']:
+        return 'NUM' if tag_type == 'UPOS' else 'num'
+    if token_type in ['symbol']:
+        return 'SYM' if tag_type == 'UPOS' else 'sym'
+    return 'PUNCT' if tag_type == 'UPOS' else 'punct'
+
+
+def _map_tag(analysis: Analysis, tag_type: str) -> str:
+    last_ig = analysis.infl_groups[-1]
+    morpheme = last_ig.affixes[0]
+    return morpheme.map(tag_type)
+
+
+def _init_zero_affixation(upos: str):
+    """Add default grammemes that correspond to zero affixation."""
+    grammemes = dict()
+    if upos == 'VERB':
+        grammemes.update({'Mood': 'Imp'})
+
+    elif upos == 'PROPN':
+        grammemes.update({'Case': 'Nom'})
+
+    elif upos == 'NUM':
+        grammemes.update({'NumType': 'Card'})
+
+    elif upos == 'NOUN':
+        grammemes.update({'Case': 'Nom', 'Number': 'Sing'})
+
+    return grammemes
+
+
+def _lexical_root(affix: Dict, root: Morph):
+    if not affix:
+        return dict()
+    return affix.get(root.morpheme, dict())
+
+
+def _affixes(affix: Morph):
+    if not affix:
+        return dict()
+    mapped_affix = affix.map('ud')
+    return mapped_affix if mapped_affix else dict()
+
+
+def _combine_grammemes(grammemes: Dict) -> None:
+    """Modifies a series of grammemes if some conditions are met within the set."""
+    def __map_possessive(grammemes):
+        grammemes['Person'] = grammemes.get('Person[psor]')
+        grammemes['Number'] = grammemes.get('Number[psor]')
+        grammemes.pop('Person[psor]')
+        grammemes.pop('Number[psor]')
+
+    def __add_person_number(grammemes):
+        """For some forms the 3 person singular correspond to zero affixation."""
+        #CHECK PLURAL?
+        grammemes.update({'Person': 3, 'Number': 'Sing'})
+
+    def __map_tense(grammemes):
+        pos = grammemes.get('Person[psor]')
+        pred = grammemes.get('Person')
+        if pos and tense in ['Fut', 'PastResult']:
+            __map_possessive(grammemes)
+        elif tense == 'PastResult' and pred:
+            grammemes['Tense'] = 'PastPerf'
+        if not pos and not pred:
+            __add_person_number(grammemes)
+
+    if grammemes.get('VerbForm', None) and grammemes.get('Mood', None):
+        grammemes.pop('Mood')
+    tense = grammemes.get('Tense', None)
+    if tense:
+        __map_tense(grammemes)
+
+
+def _map_grammemes(analysis: Analysis) -> str:
+    affixes = analysis.infl_groups[-1].affixes
+
+    grammemes = _init_zero_affixation(_map_tag(analysis, 'UPOS'))
+    grammemes.update(_lexical_root(affixes[0].map('ud'), analysis.root))
+
+    for affix in affixes[1:]:
+        grammemes.update(_affixes(affix))
+
+    _combine_grammemes(grammemes)
+
+    to_string = [
+        f'{key}={value}'
+        for key, value in sorted(grammemes.items())
+    ]
+    return '|'.join(to_string) if grammemes else '_'
+
+
+def _get_root(analysis: Analysis) -> str:
+    return ''.join([m.morpheme for m in analysis.morphemes])
+
+
+def _get_misc(start: Optional[int], end: Optional[int]) -> str:
+    """The character offsets of the token in the text, as in the UD TokenRange attribute."""
+    return f'TokenRange={start}:{end}' if start is not None else '_'
+
+
 class CoNLLU(OutputFormat):
     """
     A class to format a Parse object into a CoNLL-U string used in Universal Dependencies' treebanks.
     The mapping requires to apply a series of transformations in cascade.
+
+    To format many sentences, CoNLLUWriter produces the same output faster.
     """
     def __new__(self, parse: Parse, header: List[str] = None):
         def __get_lemma(token: Token) -> str:
@@ -44,101 +146,20 @@ class CoNLLU(OutputFormat):
                 return '|'.join(token.lemmas)
             return token.surface
 
-        def __map_token_type(token: Token, tag_type: str) -> str:
-            """Maps tokens without morphology."""
-            if token.type in ['number', 'roman']:
-                return 'NUM' if tag_type == 'UPOS' else 'num'
-            if token.type in ['symbol']:
-                return 'SYM' if tag_type == 'UPOS' else 'sym'
-            return 'PUNCT' if tag_type == 'UPOS' else 'punct'
-
         def __map_tag(token: Token, tag_type: str) -> str:
             if token.has_morph:
-                last_ig = token.morph.infl_groups[-1]
-                morpheme = last_ig.affixes[0]
-                return morpheme.map(tag_type)
-            return __map_token_type(token, tag_type)
-
-        def __init_zero_affixation(upos: str):
-            """Add default grammemes that correspond to zero affixation."""
-            grammemes = dict()
-            if upos == 'VERB':
-                grammemes.update({'Mood': 'Imp'})
-
-            elif upos == 'PROPN':
-                grammemes.update({'Case': 'Nom'})
-
-            elif upos == 'NUM':
-                grammemes.update({'NumType': 'Card'})
-
-            elif upos == 'NOUN':
-                grammemes.update({'Case': 'Nom', 'Number': 'Sing'})
-
-            return grammemes
-
-        def __lexical_root(affix: Morph, root: Morph):
-            if not affix:
-                return dict()
-            return affix.get(root.morpheme, dict())
-
-        def __affixes(affix):
-            if not affix:
-                return dict()
-            mapped_affix = affix.map('ud')
-            return mapped_affix if mapped_affix else dict()
-
-        def __combine_grammemes(grammemes: Dict) -> None:
-            """Modifies a series of grammemes if some conditions are met within the set."""
-            def __map_possessive(grammemes):
-                grammemes['Person'] = grammemes.get('Person[psor]')
-                grammemes['Number'] = grammemes.get('Number[psor]')
-                grammemes.pop('Person[psor]')
-                grammemes.pop('Number[psor]')
-
-            def __add_person_number(grammemes):
-                """For some forms the 3 person singular correspond to zero affixation."""
-                #CHECK PLURAL?
-                grammemes.update({'Person': 3, 'Number': 'Sing'})
-
-            def __map_tense(grammemes):
-                pos = grammemes.get('Person[psor]')
-                pred = grammemes.get('Person')
-                if pos and tense in ['Fut', 'PastResult']:
-                    __map_possessive(grammemes)
-                elif tense == 'PastResult' and pred:
-                    grammemes['Tense'] = 'PastPerf'
-                if not pos and not pred:
-                    __add_person_number(grammemes)
-
-            if grammemes.get('VerbForm', None) and grammemes.get('Mood', None):
-                grammemes.pop('Mood')
-            tense = grammemes.get('Tense', None)
-            if tense:
-                __map_tense(grammemes)
+                return _map_tag(token.morph, tag_type)
+            return _map_token_type(token.type, tag_type)
 
         def __map_grammmemes(token: Token):
             if not token.morph:
                 return '_'
-
-            affixes = token.morph.infl_groups[-1].affixes
-
-            grammemes = __init_zero_affixation(__map_tag(token, 'UPOS'))
-            grammemes.update(__lexical_root(affixes[0].map('ud'), token.morph.root))
-
-            for affix in affixes[1:]:
-                grammemes.update(__affixes(affix))
-
-            __combine_grammemes(grammemes)
-
-            to_string = [
-                f'{key}={value}'
-                for key, value in sorted(grammemes.items())
-            ]
-            return '|'.join(to_string) if grammemes else '_'
+            return _map_grammemes(token.morph)
 
         def __get_root(token: Token) -> str:
-            return ''.join([m.morpheme for m in token.morph.morphemes]) if token.has_morph else '_'
+            return _get_root(token.morph) if token.has_morph else '_'
 
+        generate_lemmas([parse])
         rows = [[line] for line in header] if header else [[f'# text = {parse.text}']]
         rows.extend([
             [
@@ -150,12 +171,150 @@ class CoNLLU(OutputFormat):
                 __map_grammmemes(token),
                 '_',
                 '_',
-                __get_root(token)
+                __get_root(token),
+                _get_misc(token.start, token.end)
             ]
             for token in parse.tokens
         ])
         return '\n'.join(['\t'.join(row) for row in rows])
 
+    @classmethod
+    def from_batch(cls, batch: ParseBatch, headers: List[List[str]] = None) -> List[str]:
+        """
+        Formats each sentence of a ParseBatch, with a CoNLLUWriter.
+        """
+        return CoNLLUWriter().format_batch(batch, headers)
+
+
+class CoNLLUWriter:
+    """
+    Writes parses in CoNLL-U incrementally to a file-like object, with the same output as
+    CoNLLU. Each sentence is followed by a blank line.
+
+    The LEMMA, UPOS, XPOS and FEATS columns, the empty HEAD and DEPREL columns ('_') and the
+    DEPS column, which holds the root of the analysis, only depend on the most likely analysis
+    of a token (or on the type of a token without morphology), so they are computed once per
+    Analysis object and token type, and memoized. Since Analysis
+    objects are shared (see AnalysisTable), most tokens are formatted with a lookup.
+    """
+
+    def __init__(self, stream: IO[str] = None, maxsize: int = 200000):
+        """
+        Initializes the writer.
+
+        :param stream: The file-like object the sentences are written to. Only needed by
+            `write` and `write_batch`.
+        :param maxsize: The maximum number of analyses whose columns are memoized. Once it
+            is reached, the columns of new analyses are still computed but no longer kept.
+        """
+        self.stream = stream
+        self.maxsize = maxsize
+        self.analyses = dict()
+        self.token_types = dict()
+
+    def __get_columns(self, analysis: Analysis, fst: Transducer) -> str:
+        """
+        Returns the columns from LEMMA to DEPS (the root) of a token with morphology, separated by tabs.
+        """
+        columns = self.analyses.get(analysis)
+        if columns is None:
+            columns = '\t'.join([
+                '|'.join(analysis.get_lemmas(fst)),
+                _map_tag(analysis, 'UPOS'),
+                _map_tag(analysis, 'XPOS'),
+                _map_grammemes(analysis),
+                '_',
+                '_',
+                _get_root(analysis)
+            ])
+            if len(self.analyses) < self.maxsize:
+                self.analyses[analysis] = columns
+        return columns
+
+    def __get_type_columns(self, token_type: str) -> str:
+        """
+        Returns the columns from UPOS to DEPS of a token without morphology, preceded by a tab.
+        """
+        columns = self.token_types.get(token_type)
+        if columns is None:
+            columns = self.token_types[token_type] = '\t' + '\t'.join([
+                _map_token_type(token_type, 'UPOS'), _map_token_type(token_type, 'XPOS'), '_', '_', '_', '_'
+            ])
+        return columns
+
+    def format(self, parse: Parse, header: List[str] = None) -> str:
+        """
+        Formats a parse, as CoNLLU does.
+
+        :param parse: A Parse object.
+        :param header: The comment lines of the sentence. Defaults to the text of the sentence.
+        :return: A CoNLL-U string, without the final blank line.
+        """
+        generate_lemmas([parse])
+        lines = list(header) if header else [f'# text = {parse.text}']
+        for token in parse.tokens:
+            if token.has_morph:
+                columns = self.__get_columns(token.morph, token.analyses.fst)
+            else:
+                columns = token.surface + self.__get_type_columns(token.type)
+            lines.append(f'{token.pos}\t{token.surface}\t{columns}\t{_get_misc(token.start, token.end)}')
+        return '\n'.join(lines)
+
+    def format_batch(self, batch: ParseBatch, headers: List[List[str]] = None) -> List[str]:
+        """
+        Formats each sentence of a ParseBatch directly from its columns, without building
+        Parse objects. The lemmas of the whole batch are generated first.
+
+        :param batch: A ParseBatch object.
+        :param headers: The comment lines of each sentence, if any.
+        :return: A list with the CoNLL-U string of each sentence.
+        """
+        batch.generate_lemmas()
+        surfaces = batch.surfaces
+        surface_offsets = batch.surface_offsets
+        fsts = batch.fsts
+        # The columns of each analysis of the batch, by its index in the analysis table
+        analysis_columns = dict()
+        sentences = list()
+        for idx, text in enumerate(batch.texts):
+            header = headers[idx] if headers else None
+            lines = list(header) if header else [f'# text = {text}']
+            for pos, token in enumerate(batch.get_tokens(idx), start=1):
+                surface = surfaces[surface_offsets[token]:surface_offsets[token + 1]]
+                fst = fsts[token]
+                if fst != -1:
+                    analysis_idx = batch.analyses[batch.analysis_offsets[token] + batch.mla[token]]
+                    columns = analysis_columns.get(analysis_idx)
+                    if columns is None:
+                        columns = analysis_columns[analysis_idx] = self.__get_columns(
+                            batch.analysis_table[analysis_idx], batch.transducers[fst]
+                        )
+                else:
+                    columns = surface + self.__get_type_columns(batch.token_types[batch.types[token]])
+                start = batch.starts[token]
+                misc = f'TokenRange={start}:{batch.ends[token]}' if start != -1 else '_'
+                lines.append(f'{pos}\t{surface}\t{columns}\t{misc}')
+            sentences.append('\n'.join(lines))
+        return sentences
+
+    def write(self, parse: Parse, header: List[str] = None) -> None:
+        """
+        Writes a parse to the stream, followed by a blank line.
+
+        :param parse: A Parse object.
+        :param header: The comment lines of the sentence. Defaults to the text of the sentence.
+        """
+        self.stream.write(self.format(parse, header) + '\n\n')
+
+    def write_batch(self, batch: ParseBatch, headers: List[List[str]] = None) -> None:
+        """
+        Writes each sentence of a ParseBatch to the stream, followed by a blank line.
+
+        :param batch: A ParseBatch object.
+        :param headers: The comment lines of each sentence, if any.
+        """
+        self.stream.writelines([sentence + '\n\n' for sentence in self.format_batch(batch, headers)])
+
 
 class YakutAnnotation(OutputFormat):
     """
@@ -170,6 +329,8 @@ class YakutAnnotation(OutputFormat):
                 "pos": token.pos,
                 "text": token.surface,
                 "type": token.type,
+                "start": token.start,
+                "end": token.end,
                 "fst": None
             }
             if token.has_morph:
@@ -212,3 +373,29 @@ class YakutManualDisambiguation(OutputFormat):
                 parses.append(parse)
         fields.update({"parses": parses})
         return fields
+
+
+# The output formats of `YakutMorph.annotate_many`, by name. 'parse' returns the Parse objects.
+output_formats = {
+    'parse': None,
+    'conllu': CoNLLU,
+    'json': YakutAnnotation
+}
+
+
+def get_header(sentence: str, record: Optional[dict], output_format: str) -> Any:
+    """
+    Builds the header of a sentence for the output format.
+
+    :param sentence: The sentence.
+    :param record: The JSONL object of the sentence.
+    :param output_format: Either 'conllu' or 'json'.
+    :return: A list of comment lines for CoNLL-U, or a dictionary of fields for JSON.
+    """
+    if output_format == 'json':
+        return record if record is not None else {'text': sentence}
+    header = list()
+    if record and 'id' in record:
+        header.append(f'# sent_id = {record["id"]}')
+    header.append(f'# text = {sentence}')
+    return header
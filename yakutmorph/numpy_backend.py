@@ -0,0 +1,458 @@
+import pickle
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .interfaces import DisambiguationModel
+from .utils import get_file_path
+
+
+def load_vocabulary(filename: str) -> Tuple[Dict, Dict]:
+    """
+    Loads the vocabulary mappings of the disambiguation model.
+
+    :param filename: The path to the pickle file containing the vocabulary mappings.
+    :return: A tuple containing a dictionary mapping strings to indices and a dictionary
+        mapping indices to strings.
+    """
+    with open(filename, 'rb') as f:
+        mappings = pickle.load(f)
+    return mappings['stoi'], mappings['itos']
+
+
+def convert_weights(path_to_weights: str, path_to_npz: str) -> None:
+    """
+    Converts the PyTorch state dict of a GRUModel into a NumPy .npz archive. This is the
+    only function of the module that requires torch.
+
+    :param path_to_weights: The path to the .pth file of the weights.
+    :param path_to_npz: The path where the .npz file is written.
+    """
+    import torch
+    state_dict = torch.load(path_to_weights)
+    np.savez(path_to_npz, **{name: tensor.numpy() for name, tensor in state_dict.items()})
+
+
+def pad_dags(
+        dags: List[List[List[str]]],
+        stoi: Dict[str, int],
+        unknown_idx: int
+        ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, List[List[Dict[int, int]]]]:
+    """
+    Pads a list of DAGs into an array of distinct vocabulary indices per step.
+
+    Nodes that map to the same vocabulary index (duplicated nodes, or different unknown
+    nodes) are collapsed into a single candidate. The nodes of a DAG collapsed by
+    `Parse.get_dag` count as many times as the analyses they stand for.
+
+    :param dags: A list of directed acyclic graphs representing possible analyses.
+    :param stoi: A dictionary mapping the nodes to vocabulary indices.
+    :param unknown_idx: The index of the nodes out of the vocabulary.
+    :return: A tuple containing a [sentences, steps, candidates] array with the vocabulary
+        indices of the candidates (padded with -1), an array of the same shape with the
+        logarithm of the number of analyses of each candidate, an array with the number
+        of steps of each DAG and, for each DAG and step, a dictionary mapping the vocabulary
+        indices to the position of the (last) node with that index.
+    """
+    n_steps = max(len(dag) for dag in dags)
+    positions = list()
+    steps = list()
+    for dag in dags:
+        counts = getattr(dag, 'counts', None)
+        dag_positions = list()
+        for step, nodes in enumerate(dag):
+            step_positions = dict()
+            step_counts = dict()
+            for e, node in enumerate(nodes):
+                idx = stoi.get(node, unknown_idx)
+                step_positions[idx] = e
+                step_counts[idx] = step_counts.get(idx, 0) + (counts[step][e] if counts else 1)
+            dag_positions.append(step_positions)
+            steps.append(step_counts)
+        steps.extend([{}] * (n_steps - len(dag)))
+        positions.append(dag_positions)
+
+    n_candidates = max(len(step_counts) for step_counts in steps)
+    candidates = np.array(
+        [list(step_counts) + [-1] * (n_candidates - len(step_counts)) for step_counts in steps],
+        dtype=np.int64
+    ).reshape(len(dags), n_steps, n_candidates)
+    multiplicities = np.array(
+        [list(step_counts.values()) + [1] * (n_candidates - len(step_counts)) for step_counts in steps],
+        dtype=np.float32
+    ).reshape(len(dags), n_steps, n_candidates)
+
+    lengths = np.array([len(dag) for dag in dags], dtype=np.int64)
+    return candidates, np.log(multiplicities), lengths, positions
+
+
+def pad_encoded_dags(dags: List[List[List[int]]]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Pads a list of DAGs of distinct vocabulary indices per step, as encoded by `DAGEncoder`.
+
+    :param dags: A list of DAGs of vocabulary indices. The nodes of a DAG count as many
+        times as the analyses they stand for.
+    :return: A tuple containing a [sentences, steps, candidates] array with the vocabulary
+        indices of the candidates (padded with -1), an array of the same shape with the
+        logarithm of the number of analyses of each candidate and an array with the number
+        of steps of each DAG.
+    """
+    n_steps = max(len(dag) for dag in dags)
+    n_candidates = max(len(nodes) for dag in dags for nodes in dag)
+    candidates = list()
+    multiplicities = list()
+    for dag in dags:
+        counts = getattr(dag, 'counts', None)
+        for step, nodes in enumerate(dag):
+            padding = n_candidates - len(nodes)
+            candidates.extend(nodes)
+            candidates.extend([-1] * padding)
+            multiplicities.extend(counts[step] if counts else [1] * len(nodes))
+            multiplicities.extend([1] * padding)
+        padding = (n_steps - len(dag)) * n_candidates
+        candidates.extend([-1] * padding)
+        multiplicities.extend([1] * padding)
+
+    shape = (len(dags), n_steps, n_candidates)
+    lengths = np.array([len(dag) for dag in dags], dtype=np.int64)
+    return (
+        np.array(candidates, dtype=np.int64).reshape(shape),
+        np.log(np.array(multiplicities, dtype=np.float32).reshape(shape)),
+        lengths
+    )
+
+
+def quantize(weight: np.ndarray, quantization: Optional[str]) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+    """
+    Quantizes a matrix of weights row by row.
+
+    :param weight: A [rows, columns] float32 matrix.
+    :param quantization: 'float16', 'int8' (symmetric, with a float32 scale per row) or None.
+    :return: A tuple containing the quantized matrix and the scale of each row (None unless
+        the matrix is quantized to int8).
+    """
+    if quantization is None:
+        return weight, None
+    if quantization == 'float16':
+        return weight.astype(np.float16), None
+    if quantization == 'int8':
+        scale = np.abs(weight).max(axis=1) / 127
+        scale[scale == 0] = 1
+        return np.round(weight / scale[:, None]).astype(np.int8), scale.astype(np.float32)
+    raise ValueError(f'Unknown quantization: {quantization}')
+
+
+def _sigmoid(x: np.ndarray) -> np.ndarray:
+    return 1 / (1 + np.exp(-x))
+
+
+def _log_softmax(x: np.ndarray, axis: int) -> np.ndarray:
+    shifted = x - x.max(axis=axis, keepdims=True)
+    return shifted - np.log(np.exp(shifted).sum(axis=axis, keepdims=True))
+
+
+class NumpyGRUModel:
+    """
+    An inference-only NumPy implementation of GRUModel with a single bidirectional layer,
+    which is fed one step at a time.
+
+    The embedding and the output projection, whose size grows with the vocabulary, can be
+    quantized to float16 or int8. Their rows are dequantized to float32 on use, and the
+    GRU cell, which is small, always runs in float32.
+    """
+    def __init__(self, weights: Dict[str, np.ndarray], quantization: str = None):
+        """
+        :param weights: The arrays of the state dict of a GRUModel.
+        :param quantization: Quantize the embedding and the output projection to 'float16' or
+            'int8'. Defaults to None (float32).
+        """
+        self.quantization = quantization
+        self.embedding, self.embedding_scale = quantize(weights['embedding.weight'], quantization)
+        # The weights of both directions are stacked, so that they run in a single matmul
+        self.weight_ih = np.stack([weights['gru.weight_ih_l0'], weights['gru.weight_ih_l0_reverse']]).transpose(0, 2, 1)
+        self.weight_hh = np.stack([weights['gru.weight_hh_l0'], weights['gru.weight_hh_l0_reverse']]).transpose(0, 2, 1)
+        self.bias_ih = np.stack([weights['gru.bias_ih_l0'], weights['gru.bias_ih_l0_reverse']])[:, None, :]
+        self.bias_hh = np.stack([weights['gru.bias_hh_l0'], weights['gru.bias_hh_l0_reverse']])[:, None, :]
+        self.fc_weight, self.fc_scale = quantize(weights['fc.weight'], quantization)
+        self.fc_bias = weights['fc.bias']
+        self.hidden_size = self.weight_hh.shape[1]
+
+    @property
+    def nbytes(self) -> int:
+        """
+        Returns the memory used by the weights, in bytes.
+        """
+        return sum(value.nbytes for value in vars(self).values() if isinstance(value, np.ndarray))
+
+    def init_hidden(self, batch_size: int) -> np.ndarray:
+        return np.zeros((2, batch_size, self.hidden_size), dtype=np.float32)
+
+    def forward(self, x: np.ndarray, hidden: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Runs a single step of the model.
+
+        :param x: A [batch] array with the input token indices.
+        :param hidden: A [2, batch, hidden] array with the hidden states of both directions.
+        :return: A tuple containing a [batch, 2 * hidden] array with the outputs of the GRU
+            and a [2, batch, hidden] array with the new hidden states.
+        """
+        h = self.hidden_size
+        embedded = self.embedding[x].astype(np.float32, copy=False)
+        if self.embedding_scale is not None:
+            embedded *= self.embedding_scale[x, None]
+        gates_i = embedded @ self.weight_ih + self.bias_ih
+        gates_h = hidden @ self.weight_hh + self.bias_hh
+        r = _sigmoid(gates_i[:, :, :h] + gates_h[:, :, :h])
+        z = _sigmoid(gates_i[:, :, h:2 * h] + gates_h[:, :, h:2 * h])
+        n = np.tanh(gates_i[:, :, 2 * h:] + r * gates_h[:, :, 2 * h:])
+        hidden = (1 - z) * n + z * hidden
+        return np.concatenate([hidden[0], hidden[1]], axis=1), hidden
+
+    def project(self, output: np.ndarray, candidates: np.ndarray) -> np.ndarray:
+        """
+        Computes the scores of the candidate tokens only, instead of the whole vocabulary.
+
+        :param output: A [sentences, beam, 2 * hidden] array with the outputs of the GRU.
+        :param candidates: A [sentences, candidates] array with the vocabulary indices of the candidates.
+        :return: A [sentences, beam, candidates] array with the scores of the candidates.
+        """
+        logits = output @ self.fc_weight[candidates].astype(np.float32, copy=False).transpose(0, 2, 1)
+        if self.fc_scale is not None:
+            logits *= self.fc_scale[candidates][:, None, :]
+        return logits + self.fc_bias[candidates][:, None, :]
+
+
+class YakutNumpyModel(DisambiguationModel):
+    """
+    A torch-free backend of YakutModel. The weights of the GRU are loaded from a NumPy
+    archive converted from 'data/gru_weights.pth' (see `convert_weights`), and the beam
+    search runs the GRU cell and the output projection vectorized over the beam.
+
+    With `quantization`, the embedding and the output projection are kept in float16 or
+    int8, which reduces the memory of the weights by 2x or 4x.
+    """
+    def __init__(self, path_to_weights: str = None, path_to_vocabulary: str = None, quantization: str = None):
+        """
+        :param path_to_weights: The path to the .npz file of the weights. Defaults to 'data/gru_weights.npz'.
+        :param path_to_vocabulary: The path to the vocabulary mappings. Defaults to 'data/vocabulary.pkl'.
+        :param quantization: Quantize the embedding and the output projection to 'float16' or
+            'int8'. Defaults to None (float32).
+        """
+        self.stoi, self.itos = load_vocabulary(
+            path_to_vocabulary if path_to_vocabulary else get_file_path('data/vocabulary.pkl')
+        )
+        self.padding_idx = self.stoi['<PAD>']
+        self.unknown_idx = self.stoi['^UNK']
+        with np.load(path_to_weights if path_to_weights else get_file_path('data/gru_weights.npz')) as weights:
+            self.model = NumpyGRUModel(dict(weights), quantization)
+
+    def get_vocabulary(self) -> Tuple[Dict[str, int], int]:
+        return self.stoi, self.unknown_idx
+
+    def beam_search(self, dag: List[List[str]], beam_width: int = 5, apply_softmax: bool = True) -> List[str]:
+        """
+        Performs beam search to find the most probable sequence of morphological analyses.
+
+        :param dag: A directed acyclic graph representing possible analyses.
+        :param beam_width: The width of the beam search. Defaults to 5.
+        :param apply_softmax: Apply softmax to the model's output. Defaults to True.
+        :return: A list with the most probable sequence of analyses.
+        """
+        return self.beam_search_batch([dag], beam_width, apply_softmax)[0]
+
+    def beam_search_batch(
+            self,
+            dags: List[List[List[str]]],
+            beam_width: int = 5,
+            apply_softmax: bool = True
+            ) -> List[List[str]]:
+        """
+        Performs beam search over several DAGs in lockstep.
+
+        :param dags: A list of directed acyclic graphs representing possible analyses.
+        :param beam_width: The width of the beam search. Defaults to 5.
+        :param apply_softmax: Apply softmax to the model's output. Defaults to True.
+        :return: A list with the most probable sequence of analyses for each DAG.
+        """
+        if not dags:
+            return list()
+
+        candidates, log_counts, lengths, _ = pad_dags(dags, self.stoi, self.unknown_idx)
+        sequences = self.__search(candidates, log_counts, lengths, beam_width, apply_softmax)
+        return [
+            [self.itos[idx] for idx in sequence[:length]]
+            for sequence, length in zip(sequences.tolist(), lengths.tolist())
+        ]
+
+    def __search(
+            self,
+            candidates: np.ndarray,
+            log_counts: np.ndarray,
+            lengths: np.ndarray,
+            beam_width: int,
+            apply_softmax: bool,
+            snapshots: List[Tuple[np.ndarray, np.ndarray, np.ndarray]] = None
+            ) -> np.ndarray:
+        """
+        Performs beam search over padded DAGs in lockstep, as YakutModel does.
+
+        :param candidates: A [sentences, steps, candidates] array with the vocabulary indices
+            of the candidates, padded with -1.
+        :param log_counts: The logarithm of the number of analyses of each candidate.
+        :param lengths: The number of steps of each DAG.
+        :param beam_width: The width of the beam search.
+        :param apply_softmax: Apply softmax to the model's output.
+        :param snapshots: If given, the scores, hidden states and sequences of the beams after
+            each step are appended to the list. If the list is not empty, the search resumes
+            from its last snapshot instead of starting from the first step.
+        :return: A [sentences, steps] array with the most probable sequence of each DAG.
+        """
+        n_sentences, n_steps, _ = candidates.shape
+        hidden_size = self.model.hidden_size
+
+        sequences = np.full((n_sentences, beam_width, n_steps), self.padding_idx, dtype=np.int64)
+        if snapshots:
+            scores, hidden, prefix = (array.copy() for array in snapshots[-1])
+            sequences[:, :, :prefix.shape[2]] = prefix
+        else:
+            sequences[:, :, 0] = candidates[:, 0, 0][:, None]
+            # Only the first slot of each beam holds a branch before the first step
+            scores = np.full((n_sentences, beam_width), -np.inf, dtype=np.float64)
+            scores[:, 0] = 0.0
+            hidden = self.model.init_hidden(n_sentences * beam_width).reshape(2, n_sentences, beam_width, hidden_size)
+            if snapshots is not None:
+                snapshots.append((scores.copy(), hidden.copy(), sequences[:, :, :1].copy()))
+
+        # The candidates of a step are only padded to the widest step of the active sentences,
+        # so that the search of a sentence does not depend on its later steps
+        widths = (candidates != -1).sum(axis=2)
+        for step in range(len(snapshots) if snapshots else 1, n_steps):
+            active = np.flatnonzero(lengths > step)
+            n_active = len(active)
+            n_candidates = int(widths[active, step].max())
+            step_candidates = candidates[active, step, :n_candidates]
+            padding = step_candidates == -1
+            step_candidates = np.where(padding, self.padding_idx, step_candidates)
+
+            output, step_hidden = self.model.forward(
+                sequences[active, :, step - 1].reshape(-1),
+                hidden[:, active].reshape(2, n_active * beam_width, hidden_size)
+            )
+
+            logs = self.model.project(output.reshape(n_active, beam_width, -1), step_candidates)
+            logs = np.where(padding[:, None, :], np.float32(-np.inf), logs)
+            if apply_softmax:
+                step_log_counts = log_counts[active, step, :n_candidates][:, None, :]
+                logs = _log_softmax(logs + step_log_counts, axis=2) - step_log_counts
+            step_scores = (scores[active][:, :, None] + logs.astype(np.float64)).reshape(n_active, -1)
+
+            # A stable sort keeps the original branch order among equally scored candidates
+            order = np.argsort(-step_scores, axis=1, kind='stable')[:, :beam_width]
+            parents = order // n_candidates
+            chosen = np.take_along_axis(step_candidates, order % n_candidates, 1)
+
+            scores[active] = np.take_along_axis(step_scores, order, 1)
+            step_hidden = step_hidden.reshape(2, n_active, beam_width, hidden_size)
+            hidden[:, active] = np.take_along_axis(step_hidden, parents[None, :, :, None], 2)
+            step_sequences = np.take_along_axis(sequences[active], parents[:, :, None], 1)
+            step_sequences[:, :, step] = chosen
+            sequences[active] = step_sequences
+            if snapshots is not None:
+                snapshots.append((scores.copy(), hidden.copy(), sequences[:, :, :step + 1].copy()))
+
+        return sequences[:, 0]
+
+    def disambiguate(self, dag: List[List[str]]) -> List[int]:
+        """
+        Disambiguates the morphological analyses in a directed acyclic graph (DAG).
+
+        :param dag: A directed acyclic graph representing possible analyses.
+        :return: The indices of the selected analyses in the DAG.
+        """
+        return self.disambiguate_batch([dag])[0]
+
+    def disambiguate_batch(self, dags: List[List[List[str]]]) -> List[List[int]]:
+        """
+        Disambiguates the morphological analyses of several DAGs with a single beam search.
+
+        :param dags: A list of directed acyclic graphs representing possible analyses.
+        :return: The indices of the selected analyses for each DAG.
+        """
+        if not dags:
+            return list()
+
+        candidates, log_counts, lengths, positions = pad_dags(dags, self.stoi, self.unknown_idx)
+        sequences = self.__search(candidates, log_counts, lengths, 5, True)
+        return [
+            [dag_positions[step][idx] for step, idx in enumerate(sequence[1:length - 1], start=1)]
+            for dag_positions, sequence, length in zip(positions, sequences.tolist(), lengths.tolist())
+        ]
+
+    def disambiguate_encoded(self, dags: List[List[List[int]]]) -> List[List[int]]:
+        """
+        Disambiguates several DAGs of vocabulary indices, as encoded by `DAGEncoder`, with a
+        single beam search.
+
+        :param dags: A list of DAGs of distinct vocabulary indices per step.
+        :return: The indices of the selected nodes for each DAG.
+        """
+        if not dags:
+            return list()
+
+        candidates, log_counts, lengths = pad_encoded_dags(dags)
+        sequences = self.__search(candidates, log_counts, lengths, 5, True)
+        return [
+            [dag[step].index(idx) for step, idx in enumerate(sequence[1:length - 1], start=1)]
+            for dag, sequence, length in zip(dags, sequences.tolist(), lengths.tolist())
+        ]
+
+    def disambiguate_incremental(self, dag: List[List[int]], state: 'BeamState' = None) -> Tuple[List[int], 'BeamState']:
+        """
+        Disambiguates a DAG of vocabulary indices, as encoded by `DAGEncoder`, resuming the beam
+        search from the state of a previous DAG. The state of the beams after a step only depends
+        on the steps up to it, so the search restarts from the first step that differs from the
+        previous DAG, with the hidden states and the beams of the unchanged prefix.
+
+        :param dag: A DAG of distinct vocabulary indices per step.
+        :param state: The BeamState returned for a previous DAG, if any.
+        :return: A tuple containing the indices of the selected nodes and the BeamState of the DAG.
+        """
+        counts = getattr(dag, 'counts', None)
+        keys = [(tuple(nodes), tuple(counts[step]) if counts else None) for step, nodes in enumerate(dag)]
+        n_shared = 0
+        if state is not None:
+            for key, previous_key in zip(keys, state.keys):
+                if key != previous_key:
+                    break
+                n_shared += 1
+        snapshots = state.snapshots[:n_shared] if n_shared else list()
+
+        if n_shared == len(dag):
+            sequence = snapshots[-1][2][0, 0]
+        else:
+            candidates, log_counts, lengths = pad_encoded_dags([dag])
+            sequence = self.__search(candidates, log_counts, lengths, 5, True, snapshots)[0]
+        indexes = [dag[step].index(idx) for step, idx in enumerate(sequence[1:len(dag) - 1].tolist(), start=1)]
+        return indexes, BeamState(keys, snapshots, n_shared)
+
+
+class BeamState:
+    """
+    The state of the beam search of a DAG after each of its steps, used by
+    `YakutNumpyModel.disambiguate_incremental` to resume the search of an edited DAG.
+
+    Attributes:
+        keys: The nodes and the counts of each step of the DAG.
+        snapshots: The scores, hidden states and sequences of the beams after each step.
+        n_reused: The number of steps whose state was reused from the previous DAG.
+    """
+
+    __slots__ = ('keys', 'snapshots', 'n_reused')
+
+    def __init__(self, keys: List[Tuple], snapshots: List[Tuple[np.ndarray, np.ndarray, np.ndarray]], n_reused: int = 0):
+        self.keys = keys
+        self.snapshots = snapshots
+        self.n_reused = n_reused
+
+    def __repr__(self):
+        return f'{self.__class__.__name__}({len(self.keys)} steps, {self.n_reused} reused)'
@@ -0,0 +1,154 @@
+import os
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, Tuple, Union
+
+from .main import YakutMorph
+from .mappers import output_formats
+
+# The YakutMorph object of a worker process, loaded once by the pool initializer
+_morph = None
+
+
+def _init_worker(morph_kwargs: Dict) -> None:
+    """
+    Loads the tokenizer, the transducers and the disambiguation model of a worker process.
+
+    :param morph_kwargs: The keyword arguments used to initialize YakutMorph.
+    """
+    global _morph
+    # Workers are long-lived, so their components are loaded upfront rather than on first use
+    _morph = YakutMorph(**morph_kwargs).load()
+    # Each worker runs on a single core, so intra-op threads would only compete with other workers
+    torch = sys.modules.get('torch')
+    if torch is not None:
+        torch.set_num_threads(1)
+
+
+def _annotate(items: List[Tuple[str, Any]], output_format: str, morph: YakutMorph = None) -> List[Any]:
+    """
+    Parses a chunk of sentences.
+
+    :param items: The sentences to parse, each with the header passed to the output format.
+    :param output_format: The name of the output format.
+    :param morph: The YakutMorph object used to parse. Defaults to the one of the worker process.
+    :return: A list with the annotation of each sentence.
+    """
+    morph = morph if morph else _morph
+    sentences = [sentence for sentence, _ in items]
+    headers = [header for _, header in items]
+    return morph.annotate_many(sentences, output_format, headers)
+
+
+class ParallelAnnotator:
+    """
+    Annotates a stream of sentences with a pool of worker processes. Each worker loads the
+    transducers and the disambiguation model once, and sentences are sent to the workers in
+    chunks that are disambiguated in batches.
+
+    Attributes
+    ----------
+    workers : The number of worker processes. If 0, the sentences are annotated in the current process.
+    output_format : The format of the results: 'parse' (Parse objects), 'conllu' (CoNLL-U strings)
+        or 'json' (YakutAnnotation dictionaries).
+    chunk_size : The number of sentences sent to a worker in each task.
+    max_in_flight : The maximum number of chunks submitted and not yet consumed.
+    """
+
+    def __init__(
+            self,
+            workers: int = None,
+            output_format: str = 'parse',
+            chunk_size: int = 32,
+            max_in_flight: int = None,
+            mp_context=None,
+            **morph_kwargs
+            ):
+        """
+        Initializes the annotator. The worker processes are started on the first call to `annotate`.
+
+        :param workers: The number of worker processes. Defaults to the number of CPUs.
+        :param output_format: The format of the results. Defaults to 'parse'.
+        :param chunk_size: The number of sentences sent to a worker in each task. Defaults to 32.
+        :param max_in_flight: The maximum number of chunks submitted and not yet consumed.
+            Defaults to twice the number of workers.
+        :param mp_context: A multiprocessing context used to start the workers.
+        :param morph_kwargs: Keyword arguments used to initialize YakutMorph in each worker.
+            They must be picklable.
+        """
+        if output_format not in output_formats:
+            raise ValueError(f'Unknown output format "{output_format}", expected one of {list(output_formats)}')
+        self.workers = workers
+        self.output_format = output_format
+        self.chunk_size = chunk_size
+        self.max_in_flight = max_in_flight
+        self.mp_context = mp_context
+        self.morph_kwargs = morph_kwargs
+        self.executor = None
+        self.morph = None
+
+    def __start(self) -> None:
+        """
+        Starts the worker processes, or loads YakutMorph in the current process if there are no workers.
+        """
+        if self.workers == 0:
+            self.morph = YakutMorph(**self.morph_kwargs)
+            return
+        if self.workers is None:
+            self.workers = os.cpu_count() or 1
+        self.executor = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=self.mp_context,
+            initializer=_init_worker,
+            initargs=(self.morph_kwargs,)
+        )
+        if self.max_in_flight is None:
+            self.max_in_flight = 2 * self.workers
+
+    def annotate(self, sentences: Iterable[Union[str, Tuple[str, Any]]]) -> Iterator[Any]:
+        """
+        Annotates a stream of sentences. The results are yielded in the order of the input,
+        and no more than `max_in_flight` chunks are read ahead of the consumer.
+
+        :param sentences: An iterable of sentences. A sentence can also be given as a tuple
+            with the header passed to the output format (a list of comment lines for CoNLL-U,
+            a dictionary of fields for YakutAnnotation).
+        :return: An iterator over the annotation of each sentence.
+        """
+        if self.executor is None and self.morph is None:
+            self.__start()
+
+        items = (sentence if isinstance(sentence, tuple) else (sentence, None) for sentence in sentences)
+        chunks = iter(lambda: list(islice(items, self.chunk_size)), [])
+
+        if self.executor is None:
+            for chunk in chunks:
+                yield from _annotate(chunk, self.output_format, self.morph)
+            return
+
+        in_flight = deque()
+        for chunk in chunks:
+            in_flight.append(self.executor.submit(_annotate, chunk, self.output_format))
+            if len(in_flight) >= self.max_in_flight:
+                yield from in_flight.popleft().result()
+        while in_flight:
+            yield from in_flight.popleft().result()
+
+    def close(self) -> None:
+        """
+        Stops the worker processes.
+        """
+        if self.executor is not None:
+            self.executor.shutdown()
+            self.executor = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __repr__(self):
+        return f'{self.__class__.__name__}(workers={self.workers})'
@@ -0,0 +1,307 @@
+import asyncio
+import json
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+from .aio import AsyncYakutMorph
+from .mappers import get_header
+
+# The reason phrases of the status codes used by the server
+STATUS = {
+    200: 'OK',
+    400: 'Bad Request',
+    404: 'Not Found',
+    405: 'Method Not Allowed',
+    413: 'Payload Too Large',
+    431: 'Request Header Fields Too Large',
+    500: 'Internal Server Error'
+}
+
+
+class HTTPError(Exception):
+    """
+    An error returned to the client with a status code.
+    """
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+class AnnotationServer:
+    """
+    A local HTTP server that annotates sentences with a single, warm YakutMorph object. The
+    sentences of concurrent requests are batched together by an AsyncYakutMorph front-end.
+
+    Endpoints:
+        POST /annotate  A JSON object with a sentence ("text") or a list of sentences ("texts"),
+                        and the output "format": "json" (YakutAnnotation, the default) or "conllu".
+                        A sentence can also be an object with a "text" and an "id", as in the
+                        JSONL input of `yakutmorph annotate`. Returns {"annotation": ...} or
+                        {"annotations": [...]}.
+        GET /health     {"status": "loading"} while the components are loaded in the background,
+                        and {"status": "ok"} once they are.
+        GET /metrics    The number of requests, sentences and batches, the throughput over the
+                        last minute and the latency of the recent requests.
+
+    The server speaks HTTP/1.1 with keep-alive connections, over TCP or a Unix socket.
+    """
+
+    def __init__(self, morph: AsyncYakutMorph, max_body_size: int = 1 << 24, window: int = 1000):
+        """
+        :param morph: The AsyncYakutMorph front-end used to annotate.
+        :param max_body_size: The maximum size of a request body in bytes. Defaults to 16 MiB.
+        :param window: The number of recent requests kept for the latency metrics.
+        """
+        self.morph = morph
+        self.max_body_size = max_body_size
+        self.start_time = time.monotonic()
+        self.ready = False
+        self.n_requests = 0
+        self.n_sentences = 0
+        self.n_errors = 0
+        # The latencies of the recent annotation requests
+        self.latencies: Deque[float] = deque(maxlen=window)
+        # The number of sentences annotated in each second of the last minute
+        self.throughput: Deque[List[int]] = deque(maxlen=60)
+
+    async def load(self) -> None:
+        """
+        Loads the components of YakutMorph and parses a sentence in the worker, so that the
+        first request does not pay for loading the transducers and the model. The server can
+        listen meanwhile: /health reports 'loading' until it is done, and the requests that
+        arrive wait for the worker.
+        """
+        await self.morph.parse('Мин аатым Кэскил.')
+        self.ready = True
+
+    async def start(self, host: str = '127.0.0.1', port: int = 8000, path: str = None) -> asyncio.AbstractServer:
+        """
+        Starts listening, on a Unix socket if a path is given and on a TCP port otherwise.
+
+        :param host: The address to bind. Defaults to 127.0.0.1.
+        :param port: The port to bind. 0 selects a free port.
+        :param path: The path to a Unix socket.
+        :return: The asyncio server.
+        """
+        if path:
+            return await asyncio.start_unix_server(self.handle, path=path)
+        return await asyncio.start_server(self.handle, host=host, port=port)
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """
+        Serves the requests of a connection until the client closes it.
+        """
+        try:
+            while True:
+                try:
+                    request = await self.read_request(reader)
+                    if request is None:
+                        break
+                    method, target, headers, body = request
+                    status, response = await self.dispatch(method, target, body)
+                    keep_alive = headers.get('connection', '').lower() != 'close'
+                except HTTPError as e:
+                    status, response, keep_alive = e.status, {'error': str(e)}, False
+                except (ConnectionError, asyncio.IncompleteReadError):
+                    raise
+                except Exception as e:
+                    status, response, keep_alive = 500, {'error': f'{e.__class__.__name__}: {e}'}, False
+                content = json.dumps(response, ensure_ascii=False).encode('utf-8')
+                writer.write(
+                    f'HTTP/1.1 {status} {STATUS[status]}\r\n'
+                    f'Content-Type: application/json; charset=utf-8\r\n'
+                    f'Content-Length: {len(content)}\r\n'
+                    f'Connection: {"keep-alive" if keep_alive else "close"}\r\n\r\n'.encode('latin-1') + content
+                )
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def read_request(self, reader: asyncio.StreamReader) -> Optional[Tuple[str, str, Dict[str, str], bytes]]:
+        """
+        Reads an HTTP request.
+
+        :param reader: The stream of the connection.
+        :return: A tuple with the method, the path, the (lowercased) headers and the body, or
+            None if the client closed the connection.
+        """
+        try:
+            head = await reader.readuntil(b'\r\n\r\n')
+        except asyncio.IncompleteReadError as e:
+            if not e.partial.strip():
+                return None
+            raise HTTPError(400, 'Incomplete request')
+        except asyncio.LimitOverrunError:
+            raise HTTPError(431, 'The request headers are too large')
+
+        request_line, *header_lines = head.decode('latin-1').rstrip('\r\n').split('\r\n')
+        try:
+            method, target, _ = request_line.split(' ')
+        except ValueError:
+            raise HTTPError(400, f'Invalid request line: {request_line}')
+        headers = dict()
+        for line in header_lines:
+            name, _, value = line.partition(':')
+            headers[name.strip().lower()] = value.strip()
+
+        try:
+            length = int(headers.get('content-length', 0))
+        except ValueError:
+            raise HTTPError(400, 'Invalid Content-Length')
+        if length > self.max_body_size:
+            raise HTTPError(413, f'The request body exceeds {self.max_body_size} bytes')
+        body = await reader.readexactly(length) if length else b''
+        return method, target.split('?', 1)[0], headers, body
+
+    async def dispatch(self, method: str, path: str, body: bytes) -> Tuple[int, Any]:
+        """
+        Routes a request to its endpoint.
+
+        :return: The status code and the JSON response.
+        """
+        if path == '/annotate':
+            if method != 'POST':
+                raise HTTPError(405, 'Use POST /annotate')
+            return 200, await self.annotate(body)
+        if method != 'GET':
+            if path in ('/health', '/metrics'):
+                raise HTTPError(405, f'Use GET {path}')
+            raise HTTPError(404, f'Unknown path {path}')
+        if path == '/health':
+            return 200, {'status': 'ok' if self.ready else 'loading'}
+        if path == '/metrics':
+            return 200, self.metrics()
+        raise HTTPError(404, f'Unknown path {path}')
+
+    async def annotate(self, body: bytes) -> Dict:
+        """
+        Annotates the sentences of a request. A request that fails is counted once as an error.
+
+        :param body: The JSON body of the request.
+        :return: The annotation of the sentence, or the annotations of the sentences.
+        """
+        self.n_requests += 1
+        try:
+            return await self.__annotate(body)
+        except BaseException:
+            self.n_errors += 1
+            raise
+
+    async def __annotate(self, body: bytes) -> Dict:
+        """
+        Private method to validate and annotate the sentences of a request. An invalid input
+        (including a ValueError or TypeError raised by YakutMorph) is a client error, and any
+        other failure of the annotation is an internal error.
+        """
+        start = time.monotonic()
+        try:
+            request = json.loads(body)
+        except ValueError as e:
+            raise HTTPError(400, f'Invalid JSON: {e}')
+        if not isinstance(request, dict) or ('text' in request) == ('texts' in request):
+            raise HTTPError(400, 'Expected an object with either "text" or "texts"')
+        output_format = request.get('format', 'json')
+        if output_format not in ('json', 'conllu'):
+            raise HTTPError(400, f'Unknown format "{output_format}", expected "json" or "conllu"')
+        items = [request['text']] if 'text' in request else request['texts']
+        if not isinstance(items, list):
+            raise HTTPError(400, '"texts" must be a list')
+
+        sentences = list()
+        for item in items:
+            record = item if isinstance(item, dict) else None
+            sentence = item.get('text') if record is not None else item
+            if not isinstance(sentence, str):
+                raise HTTPError(400, 'A sentence must be a string or an object with a "text" string')
+            sentences.append((sentence, get_header(sentence, record, output_format)))
+
+        annotations = await asyncio.gather(*[
+            self.morph.annotate(sentence, output_format, header) for sentence, header in sentences
+        ], return_exceptions=True)
+        errors = [annotation for annotation in annotations if isinstance(annotation, BaseException)]
+        if errors:
+            internal = [error for error in errors if not isinstance(error, (ValueError, TypeError))]
+            error = internal[0] if internal else errors[0]
+            raise HTTPError(500 if internal else 400, f'{error.__class__.__name__}: {error}')
+        end = time.monotonic()
+        self.n_sentences += len(sentences)
+        self.latencies.append(end - start)
+        second = int(end)
+        if self.throughput and self.throughput[-1][0] == second:
+            self.throughput[-1][1] += len(sentences)
+        else:
+            self.throughput.append([second, len(sentences)])
+        return {'annotation': annotations[0]} if 'text' in request else {'annotations': annotations}
+
+    def metrics(self) -> Dict:
+        """
+        Returns the metrics of the server.
+        """
+        now = time.monotonic()
+        latencies = sorted(self.latencies)
+        last_minute = sum(n for second, n in self.throughput if now - second <= 60)
+
+        def percentile(p: float) -> Optional[float]:
+            if not latencies:
+                return None
+            return 1000 * latencies[min(len(latencies) - 1, max(0, round(p / 100 * len(latencies)) - 1))]
+
+        return {
+            'uptime_s': now - self.start_time,
+            'requests': self.n_requests,
+            'errors': self.n_errors,
+            'sentences': self.n_sentences,
+            'batches': self.morph.n_batches,
+            'sentences_per_batch': self.morph.n_requests / self.morph.n_batches if self.morph.n_batches else 0.0,
+            'sentences_per_s': last_minute / min(60.0, max(now - self.start_time, 1e-9)),
+            'latency_ms': {'p50': percentile(50), 'p99': percentile(99), 'max': percentile(100)}
+        }
+
+
+def serve(
+        host: str = '127.0.0.1',
+        port: int = 8000,
+        path: str = None,
+        max_batch_size: int = 64,
+        max_wait: float = 0.0,
+        **morph_kwargs
+        ) -> None:
+    """
+    Loads YakutMorph and runs an annotation server until it is interrupted.
+
+    :param host: The address to bind. Defaults to 127.0.0.1.
+    :param port: The port to bind. Defaults to 8000.
+    :param path: The path to a Unix socket to listen on instead of a TCP port.
+    :param max_batch_size: The maximum number of sentences disambiguated together. Defaults to 64.
+    :param max_wait: The maximum time in seconds that a sentence waits for others. Defaults to 0.0.
+    :param morph_kwargs: Keyword arguments used to initialize YakutMorph.
+    """
+    async def run():
+        async with AsyncYakutMorph(max_batch_size=max_batch_size, max_wait=max_wait, **morph_kwargs) as morph:
+            server = AnnotationServer(morph)
+            async with await server.start(host, port, path) as listener:
+                address = path if path else '{}:{}'.format(*listener.sockets[0].getsockname()[:2])
+                print(f'Serving on {address}', flush=True)
+                # Loaded while listening, so that /health reports the progress. If loading
+                # fails, the server stops with its error instead of reporting 'loading' forever.
+                loading = asyncio.ensure_future(server.load())
+                loading.add_done_callback(lambda task: task.cancelled() or task.exception() and listener.close())
+                try:
+                    await listener.serve_forever()
+                except asyncio.CancelledError:
+                    if loading.done() and not loading.cancelled() and loading.exception():
+                        raise loading.exception() from None
+                    raise
+                finally:
+                    loading.cancel()
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
@@ -1,6 +1,6 @@
 import re
 from types import SimpleNamespace
-from typing import List, Tuple
+from typing import Iterable, Iterator, List, Tuple
 
 from .interfaces import Tokenizer
 
@@ -71,37 +71,95 @@ class YakutTokenizer(Tokenizer):
         """
         Initialize the `YakutTokenizer` with regular expressions and tokenization rules.
 
-        This constructor sets up a scanner with rules to identify various token types.
-        """
-
-        self.scanner = re.Scanner([
-            (self.phone.pattern, lambda scanner, token: (token, self.token_type.PHONE)),
-            (self.date.pattern, lambda scanner, token: (token, self.token_type.DATE)),
-            (self.number.pattern, lambda scanner, token: (token, self.token_type.NUMBER)),
-            (self.url.pattern, lambda scanner, token: (token, self.token_type.URI)),
-            (self.email.pattern, lambda scanner, token: (token, self.token_type.EMAIL)),
-            (self.roman.pattern, lambda scanner, token: (token, self.token_type.ROMAN)),
-            (r"[—–]", lambda scanner, token: (token, self.token_type.DASH)),
-            (r"-", lambda scanner, token: (token, self.token_type.HYPHEN)),
-            (r"[\"'«»`“”‘’]", lambda scanner, token: (token, self.token_type.QUOTATION)),
-            (r"[\(\)\[\]{}]", lambda scanner, token: (token, self.token_type.BRACKET)),
-            (r"\?+", lambda scanner, token: (token, self.token_type.QUESTION)),
-            (r"!+", lambda scanner, token: (token, self.token_type.EXCLAMATION)),
-            (r"\.{2,}", lambda scanner, token: (token, self.token_type.ELLIPSIS)),
-            (r"\.", lambda scanner, token: (token, self.token_type.STOP)),
-            (r",", lambda scanner, token: (token, self.token_type.COMMA)),
-            (r":", lambda scanner, token: (token, self.token_type.COLON)),
-            (r";", lambda scanner, token: (token, self.token_type.SEMICOLON)),
-            (r"[\$%&№@#&\*\+\-]+", lambda scanner, token: (token, self.token_type.SYMBOL)),
-            (self.title.pattern, lambda scanner, token: (token, self.token_type.TITLE)),
-            (self.uppercase.pattern, lambda scanner, token: (token, self.token_type.UPPERCASE)),
-            (self.lowercase.pattern, lambda scanner, token: (token, self.token_type.LOWERCASE)),
-            (self.title_lat.pattern, lambda scanner, token: (token, self.token_type.TITLELAT)),
-            (self.uppercase_lat.pattern, lambda scanner, token: (token, self.token_type.UPPERCASELAT)),
-            (self.lowercase_lat.pattern, lambda scanner, token: (token, self.token_type.LOWERCASELAT)),
-            (r"\s+", lambda scanner, token: None),                          # spaces are ignored
-            (r".", lambda scanner, token: (token, self.token_type.UNKNOWN))
-        ])
+        The rules are combined into a single regular expression with a named group per token type.
+        The alternatives are tried in order, so earlier rules take precedence over later ones. As in
+        the `re.Scanner` previously used, word boundaries, digits, spaces and word characters are
+        matched in ASCII mode.
+        """
+
+        # The rules are grouped in blocks preceded by a lookahead on the characters their matches can
+        # start with, so that a token skips the blocks that cannot match it. The lookaheads do not
+        # change which rule matches first.
+        blocks = [
+            (r'[\x00-\x7f]', [
+                ('PHONE', self.phone.pattern),
+                ('DATE', self.date.pattern),
+                ('NUMBER', self.number.pattern),
+                ('URI', self.url.pattern),
+                ('EMAIL', self.email.pattern),
+                ('ROMAN', self.roman.pattern)
+            ]),
+            (r"[—–\-\"'«»`“”‘’\(\)\[\]{}\?!\.,:;\$%&№@#\*\+]", [
+                ('DASH', r"[—–]"),
+                ('HYPHEN', r"-"),
+                ('QUOTATION', r"[\"'«»`“”‘’]"),
+                ('BRACKET', r"[\(\)\[\]{}]"),
+                ('QUESTION', r"\?+"),
+                ('EXCLAMATION', r"!+"),
+                ('ELLIPSIS', r"\.{2,}"),
+                ('STOP', r"\."),
+                ('COMMA', r","),
+                ('COLON', r":"),
+                ('SEMICOLON', r";"),
+                ('SYMBOL', r"[\$%&№@#&\*\+\-]+")
+            ]),
+            (r'[А-ЯЁҺҔҤӨҮа-яёһҕҥөүA-Za-z]', [
+                ('TITLE', self.title.pattern),
+                ('UPPERCASE', self.uppercase.pattern),
+                ('LOWERCASE', self.lowercase.pattern),
+                ('TITLELAT', self.title_lat.pattern),
+                ('UPPERCASELAT', self.uppercase_lat.pattern),
+                ('LOWERCASELAT', self.lowercase_lat.pattern)
+            ]),
+            (None, [
+                ('SPACE', r"\s+"),                                          # spaces are ignored
+                ('UNKNOWN', r".")
+            ])
+        ]
+        self.rules = [rule for _, rules in blocks for rule in rules]
+        self.pattern = re.compile('|'.join(
+            (f'(?={guard})' if guard else '')
+            + '(?:' + '|'.join(f'(?P<{name}>{pattern})' for name, pattern in rules) + ')'
+            for guard, rules in blocks
+        ), re.ASCII)
+        self.types = {name: self.token_types.get(name) for name, _ in self.rules}
+        # Maps the index of each named group to its token type (None for the ignored spaces)
+        self.group_types = [None] * (self.pattern.groups + 1)
+        for name, idx in self.pattern.groupindex.items():
+            self.group_types[idx] = self.types[name]
+
+    def span_tokenize(self, input_text: str) -> Iterator[Tuple[str, str, int, int]]:
+        """
+        Lazily tokenize the input text into (token, type, start, end) tuples. The offsets are
+        taken from the matches of the tokenizer, so that input_text[start:end] == token.
+
+        :param input_text: The text to be tokenized.
+        :return: An iterator of tuples where each tuple contains a token, its corresponding type
+            and its start and end character offsets in the input text.
+        """
+        group_types = self.group_types
+        match = None
+        for match in iter(self.pattern.scanner(input_text).match, None):
+            token_type = group_types[match.lastindex]
+            if token_type is None:
+                continue
+            start, end = match.span()
+            if start == end:
+                # Only a lookahead can match an empty string, which would not advance the tokenizer
+                break
+            yield input_text[start:end], token_type, start, end
+        end = match.end() if match else 0
+        if end != len(input_text):
+            raise TokenizationException(f'The substring "{input_text[end:]}" was not tokenized')
+
+    def iter_tokenize(self, input_text: str) -> Iterator[Tuple[str, str]]:
+        """
+        Lazily tokenize the input text into (token, type) tuples.
+
+        :param input_text: The text to be tokenized.
+        :return: An iterator of tuples where each tuple contains a token and its corresponding type.
+        """
+        return ((token, token_type) for token, token_type, _, _ in self.span_tokenize(input_text))
 
     def tokenize(self, input_text: str) -> List[Tuple[str, str]]:
         """
@@ -110,10 +168,7 @@ class YakutTokenizer(Tokenizer):
         :param input_text: The text to be tokenized.
         :return: A list of tuples where each tuple contains a token and its corresponding type.
         """
-        tokens, not_recognized = self.scanner.scan(input_text)
-        if not_recognized:
-            raise TokenizationException(f'The substring "{not_recognized}" was not tokenized')
-        return tokens
+        return [(token, token_type) for token, token_type, _, _ in self.span_tokenize(input_text)]
 
     def has_morphology(self) -> List[str]:
         """
@@ -124,3 +179,108 @@ class YakutTokenizer(Tokenizer):
         return [
             self.token_type.TITLE, self.token_type.UPPERCASE, self.token_type.LOWERCASE
         ]
+
+
+class YakutSentenceSplitter:
+    """
+    Splits a text into sentences using the token types of a YakutTokenizer.
+
+    A sentence ends with a period, a question mark, an exclamation mark or an ellipsis, together
+    with the closing quotation marks and brackets attached to it, unless the next word starts with
+    a lowercase letter. Sentences longer than `max_tokens` tokens are split as well, so that the
+    sequences passed to the disambiguation model stay short.
+    """
+
+    closing_symbols = {'»', '”', '’', '"', "'", ')', ']', '}'}
+
+    def __init__(self, tokenizer: YakutTokenizer = None, max_tokens: int = 200):
+        """
+        :param tokenizer: The tokenizer used to split the text. Defaults to YakutTokenizer.
+        :param max_tokens: The maximum number of tokens in a sentence. Defaults to 200.
+        """
+        self.tokenizer = tokenizer if tokenizer else YakutTokenizer()
+        self.max_tokens = max_tokens
+        token_type = self.tokenizer.token_type
+        self.boundary_types = {token_type.STOP, token_type.QUESTION, token_type.EXCLAMATION, token_type.ELLIPSIS}
+        self.closing_types = {token_type.QUOTATION, token_type.BRACKET}
+        self.lowercase_types = {token_type.LOWERCASE, token_type.LOWERCASELAT}
+
+    def spans(self, input_text: str) -> Iterator[Tuple[int, int, List[Tuple[str, str, int, int]]]]:
+        """
+        Splits the input text into sentences.
+
+        :param input_text: The text to be split.
+        :return: An iterator of tuples with the start and end positions of each sentence in the
+            input text and its list of (token, type, start, end) tuples, with offsets in the input text.
+        """
+        tokens = list(self.tokenizer.span_tokenize(input_text))
+
+        first = 0
+        i = 0
+        while i < len(tokens):
+            last = i
+            if tokens[i][1] in self.boundary_types:
+                # Attach the closing quotation marks and brackets that follow the punctuation mark
+                while (
+                    last + 1 < len(tokens)
+                    and tokens[last + 1][1] in self.closing_types
+                    and tokens[last + 1][0] in self.closing_symbols
+                    and tokens[last + 1][2] == tokens[last][3]
+                ):
+                    last += 1
+                is_boundary = last + 1 == len(tokens) or tokens[last + 1][1] not in self.lowercase_types
+            else:
+                is_boundary = last + 1 - first >= self.max_tokens
+            if is_boundary:
+                yield tokens[first][2], tokens[last][3], tokens[first:last + 1]
+                first = last + 1
+            i = last + 1
+
+        if first < len(tokens):
+            yield tokens[first][2], tokens[-1][3], tokens[first:]
+
+    @staticmethod
+    def __sentence(text: str, start: int, end: int, tokens: List[Tuple[str, str, int, int]]):
+        """
+        Slices a sentence out of a text and shifts the offsets of its tokens to the sentence.
+        """
+        return text[start:end], [
+            (token, token_type, token_start - start, token_end - start)
+            for token, token_type, token_start, token_end in tokens
+        ]
+
+    def split(self, input_text: str) -> Iterator[Tuple[str, List[Tuple[str, str, int, int]]]]:
+        """
+        Splits the input text into sentences.
+
+        :param input_text: The text to be split.
+        :return: An iterator of tuples with the text of each sentence and its list of
+            (token, type, start, end) tuples, with offsets in the text of the sentence.
+        """
+        for start, end, tokens in self.spans(input_text):
+            yield self.__sentence(input_text, start, end, tokens)
+
+    def iter_split(self, lines: Iterable[str]) -> Iterator[Tuple[str, List[Tuple[str, str, int, int]]]]:
+        """
+        Splits a stream of lines (e.g. a file) into sentences. Only the text of the last,
+        possibly incomplete, sentence is kept between lines, and an empty line always ends
+        a sentence.
+
+        :param lines: An iterable of lines.
+        :return: An iterator of tuples with the text of each sentence and its list of
+            (token, type, start, end) tuples, with offsets in the text of the sentence.
+        """
+        buffer = ''
+        for line in lines:
+            if not line.strip():
+                yield from self.split(buffer)
+                buffer = ''
+                continue
+            buffer += line
+            remainder = None
+            for span in self.spans(buffer):
+                if remainder is not None:
+                    yield self.__sentence(buffer, *remainder)
+                remainder = span
+            buffer = buffer[remainder[0]:] if remainder else ''
+        yield from self.split(buffer)
@@ -1,11 +1,13 @@
 import re
-from typing import Dict, List, Tuple
+from functools import lru_cache
+from typing import Dict, Iterable, List, Tuple
 
 import sfst_transduce
-import yaml
 
-from .interfaces import MorphReference, PostAnalysis, Transducer
-from .utils import get_file_path
+from .caches import LRUAnalysisCache, SQLiteAnalysisCache
+from .interfaces import AnalysisCache, CacheInfo, MorphReference, PostAnalysis, Transducer
+from .lexicon import FullFormLexicon, write_lexicon
+from .utils import get_file_path, get_fingerprint, load_yaml
 
 
 class YakutMorphReference(MorphReference):
@@ -14,10 +16,8 @@ class YakutMorphReference(MorphReference):
     """
 
     def __init__(self, path_to_file: str, inside_package: bool = False):
-        path = get_file_path(path_to_file) if inside_package else path_to_file
-        with open(path, 'r') as f:
-            reference = yaml.safe_load(f)
-        self.tags = {k: v for value in reference.values() for k, v in value.items()}
+        self.path = get_file_path(path_to_file) if inside_package else path_to_file
+        self.tags = _load_tags(self.path)
 
     def get_tags(self) -> List[str]:
         """
@@ -30,6 +30,31 @@ class YakutMorphReference(MorphReference):
         return self.tags.get(tag, dict())
 
 
+@lru_cache(maxsize=None)
+def _load_tags(path: str) -> Dict:
+    """
+    Loads the tags of a reference file once per process, so that the transducers of a
+    pipeline share them.
+
+    :param path: The path to the YAML file of the reference.
+    :return: A dictionary mapping each tag to its mappings.
+    """
+    reference = load_yaml(path)
+    return {k: v for value in reference.values() for k, v in value.items()}
+
+
+@lru_cache(maxsize=None)
+def _load_sfst(path: str) -> sfst_transduce.Transducer:
+    """
+    Loads a compiled transducer once per process, so that the YakutTransducer objects
+    (including unpickled ones) with the same file share it.
+
+    :param path: The path to the binary file of the transducer.
+    :return: The compiled transducer.
+    """
+    return sfst_transduce.Transducer(path)
+
+
 class YakutTransducer(Transducer):
     """
     A transducer for analyzing and generating Yakut word forms using a specified
@@ -41,7 +66,8 @@ class YakutTransducer(Transducer):
             path_to_transducer: str = None,
             label: str = None,
             regex: str = None,
-            reference: MorphReference = None
+            reference: MorphReference = None,
+            cache_size: int = 50000
             ):
         """
         Initializes the YakutTransducer with the specified or default transducer
@@ -49,18 +75,30 @@ class YakutTransducer(Transducer):
 
         :param path_to_transducer: Path to the binary file of the transducer.
             If not provided, the default transducer binary is used.
+        :param cache_size: The maximum number of generated analyses to keep. Once it is
+            reached, new analyses are still generated but no longer cached.
         """
         default_label = 'ymv'
         default_regex = r'[а-яёһҕҥөү]+|[\^\+][A-Za-z_#\d\.]+'
 
-        self.transducer = sfst_transduce.Transducer(
-            path_to_transducer if path_to_transducer else get_file_path('fsts/ymv.a')
-        )
+        self.path = path_to_transducer if path_to_transducer else get_file_path('fsts/ymv.a')
+        self._transducer = None
         self.label = label if label else default_label
         self.morphemes = re.compile(regex if regex else default_regex)
         self.reference = reference if reference else YakutMorphReference(
             'data/morph_reference.yaml', inside_package=True
         )
+        self.cache_size = cache_size
+        self.generated = dict()
+
+    @property
+    def transducer(self) -> sfst_transduce.Transducer:
+        """
+        The compiled transducer, loaded from its file on first use.
+        """
+        if self._transducer is None:
+            self._transducer = _load_sfst(self.path)
+        return self._transducer
 
     def analyse(self, surface_form: str) -> List[str]:
         """
@@ -80,11 +118,38 @@ class YakutTransducer(Transducer):
         :param analysis: The analysis to generate the surface form from.
         :return: A list of generated surface forms from the given analysis.
         """
-        return self.transducer.generate(analysis)
+        surface_forms = self.generated.get(analysis)
+        if surface_forms is None:
+            surface_forms = tuple(self.transducer.generate(analysis))
+            if len(self.generated) < self.cache_size:
+                self.generated[analysis] = surface_forms
+        return list(surface_forms)
+
+    def generate_many(self, analyses: Iterable[str]) -> List[List[str]]:
+        """
+        Generates the surface forms of several analyses. Each distinct analysis is
+        generated only once.
+
+        :param analyses: The analyses to generate the surface forms from.
+        :return: A list with the generated surface forms of each analysis.
+        """
+        analyses = list(analyses)
+        surface_forms = {analysis: self.generate(analysis) for analysis in dict.fromkeys(analyses)}
+        return [list(surface_forms[analysis]) for analysis in analyses]
 
     def get_morphemes(self, analysis: str) -> List[str]:
         return self.morphemes.findall(analysis)
 
+    def __getstate__(self):
+        """
+        The compiled transducer cannot be pickled, so it is reloaded from its file after unpickling.
+        The generated analyses are not pickled either.
+        """
+        state = self.__dict__.copy()
+        state['_transducer'] = None
+        state['generated'] = dict()
+        return state
+
 
 class DummyTransducer(Transducer):
     """
@@ -133,13 +198,30 @@ class YakutTransducerPipeline(Transducer):
     transducers in series.
     """
 
-    def __init__(self, transducers: Dict[str, str] = None, morph_reference: YakutMorphReference = None):
+    def __init__(
+            self,
+            transducers: Dict[str, str] = None,
+            morph_reference: YakutMorphReference = None,
+            cache_size: int = 50000,
+            cache: AnalysisCache = None,
+            cache_path: str = None,
+            lexicon_path: str = None
+            ):
         """
         Initializes the YakutTransducerPipeline with the specified or default
         transducers.
 
         :param transducers: A dictionary mapping transducer labels to the path to their corresponding
             binary file names. Defaults to a predefined set of transducers.
+        :param morph_reference: A reference to the morphology implemented by the transducers.
+        :param cache_size: The maximum number of surface forms kept in the analysis cache.
+            A value of 0 disables the cache. Defaults to 50000.
+        :param cache: An AnalysisCache object to use instead of the default LRU cache.
+        :param cache_path: The path to a SQLite database used as a persistent cache behind the
+            in-memory cache. The database can be shared by several processes, and its entries are
+            tied to a fingerprint of the transducers and reference files. Disabled by default.
+        :param lexicon_path: The path to a full-form lexicon built with `build_lexicon`, which is
+            looked up before the persistent cache and the transducers. Disabled by default.
         """
         default_transducers = {
             'voc': 'fsts/ymv.a',
@@ -151,6 +233,13 @@ class YakutTransducerPipeline(Transducer):
             transducers if transducers else default_transducers,
             morph_reference
         )
+        self.transducers = {transducer.label: transducer for transducer in self.pipeline}
+        if cache is None and cache_size:
+            cache = LRUAnalysisCache(cache_size)
+        self.cache = cache
+        fingerprint = self.fingerprint() if cache_path or lexicon_path else None
+        self.persistent_cache = SQLiteAnalysisCache(cache_path, fingerprint) if cache_path else None
+        self.lexicon = FullFormLexicon(lexicon_path, fingerprint) if lexicon_path else None
 
     def __initialize_pipeline(self, transducers, morph_reference: YakutMorphReference) -> List[Transducer]:
         """
@@ -172,9 +261,116 @@ class YakutTransducerPipeline(Transducer):
         pipeline.append(DummyTransducer('fail', '^UNK'))
         return pipeline
 
+    def fingerprint(self) -> str:
+        """
+        Computes a hash of the files of the transducers in the pipeline and their references.
+
+        :return: The hexadecimal digest of the files.
+        """
+        paths = [transducer.path for transducer in self.pipeline if hasattr(transducer, 'path')]
+        for transducer in self.pipeline:
+            path = getattr(transducer.reference, 'path', None)
+            if path and path not in paths:
+                paths.append(path)
+        return get_fingerprint(paths)
+
     def analyse(self, surface_form: str) -> Tuple[Transducer, List[str]]:
         """
-        Analyzes the given surface form using the transducer pipeline.
+        Analyzes the given surface form using the transducer pipeline. The outputs are
+        cached by the lowercased surface form.
+
+        :param surface_form: The surface form to be analyzed.
+        :return: the transducer that performed the analysis and a list of possible interpretations.
+        """
+        if self.cache is None and self.persistent_cache is None and self.lexicon is None:
+            return self.__analyse(surface_form)
+
+        key = surface_form.lower()
+        entry = self.cache.get(key) if self.cache is not None else None
+        if entry is None and self.lexicon is not None:
+            # Lexicon entries are not copied to the in-memory cache, which is kept for the other forms
+            entry = self.lexicon.get(key)
+        if entry is None and self.persistent_cache is not None:
+            entry = self.persistent_cache.get(key)
+            if entry is not None and self.cache is not None:
+                self.cache.put(key, *entry)
+
+        if entry is None:
+            transducer, analyses = self.__analyse(surface_form)
+            self.__store(key, transducer, analyses)
+            return transducer, analyses
+
+        label, analyses = entry
+        transducer = self.transducers[label]
+        if transducer is self.pipeline[-1]:
+            return transducer, transducer.analyse(surface_form)
+        return transducer, list(analyses)
+
+    def __store(self, key: str, transducer: Transducer, analyses: List[str]) -> None:
+        """
+        Stores the output of the pipeline in the caches.
+
+        :param key: The lowercased surface form.
+        :param transducer: The transducer that performed the analysis.
+        :param analyses: The analyses of the surface form.
+        """
+        # The fallback transducer keeps the case of the surface form, so its output is not stored
+        analyses = () if transducer is self.pipeline[-1] else analyses
+        if self.cache is not None:
+            self.cache.put(key, transducer.label, analyses)
+        if self.persistent_cache is not None:
+            self.persistent_cache.put(key, transducer.label, analyses)
+
+    def warm_up(self, surface_forms: Iterable[str]) -> int:
+        """
+        Analyses a series of surface forms (e.g. from a word-frequency list) and stores them in
+        the persistent cache, or in the in-memory cache if there is no persistent cache.
+        Surface forms that are already cached are skipped.
+
+        :param surface_forms: An iterable of surface forms, most frequent first.
+        :return: The number of surface forms that were analysed.
+        """
+        cache = self.persistent_cache if self.persistent_cache is not None else self.cache
+        if cache is None:
+            return 0
+
+        analysed = 0
+        for surface_form in surface_forms:
+            key = surface_form.lower()
+            if cache.get(key) is None:
+                transducer, analyses = self.__analyse(surface_form)
+                cache.put(key, transducer.label, () if transducer is self.pipeline[-1] else analyses)
+                analysed += 1
+        if cache is self.persistent_cache:
+            self.persistent_cache.flush()
+        return analysed
+
+    def build_lexicon(self, surface_forms: Iterable[str], path: str) -> int:
+        """
+        Analyses a series of surface forms (e.g. from a word-frequency list) with the transducers
+        and writes the label of the transducer and the analyses of each of them to a full-form
+        lexicon (see FullFormLexicon). Surface forms are lowercased.
+
+        :param surface_forms: An iterable of surface forms.
+        :param path: The path to the lexicon file.
+        :return: The number of surface forms in the lexicon.
+        """
+        def entries():
+            seen = set()
+            for surface_form in surface_forms:
+                key = surface_form.lower()
+                if key in seen:
+                    continue
+                seen.add(key)
+                transducer, analyses = self.__analyse(key)
+                yield key, transducer.label, () if transducer is self.pipeline[-1] else analyses
+
+        return write_lexicon(path, entries(), self.fingerprint())
+
+    def __analyse(self, surface_form: str) -> Tuple[Transducer, List[str]]:
+        """
+        Analyzes the given surface form with each transducer in the pipeline until
+        one of them succeeds.
 
         :param surface_form: The surface form to be analyzed.
         :return: the transducer that performed the analysis and a list of possible interpretations.
@@ -186,6 +382,23 @@ class YakutTransducerPipeline(Transducer):
                 return self.pipeline[transducer_idx], analyses
             transducer_idx += 1
 
+    def cache_info(self, persistent: bool = False) -> CacheInfo:
+        """
+        Returns the hits, misses, evictions and size of the analysis cache.
+
+        :param persistent: Return the statistics of the persistent cache instead of the in-memory one.
+        :return: A CacheInfo object, or None if the cache is disabled.
+        """
+        cache = self.persistent_cache if persistent else self.cache
+        return cache.info() if cache is not None else None
+
+    def cache_clear(self) -> None:
+        """
+        Removes all the entries from the in-memory analysis cache.
+        """
+        if self.cache is not None:
+            self.cache.clear()
+
     def __repr__(self):
         return f'Pipeline({"|".join([fst for fst in self.pipeline])})'
 
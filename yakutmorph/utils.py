@@ -1,6 +1,62 @@
-from pkg_resources import resource_filename
+import hashlib
+from typing import Any, Iterator, List
+
+import yaml
+
+try:
+    from importlib.resources import files
+except ImportError:  # Python < 3.9
+    from importlib_resources import files
 
 
 def get_file_path(file_path: str) -> str:
-    path = resource_filename(__name__, file_path)
-    return path
+    """
+    Resolves the path of a data file shipped with the package.
+
+    :param file_path: The path of the file, relative to the package directory.
+    :return: The path to the file.
+    """
+    return str(files(__package__).joinpath(file_path))
+
+
+def load_yaml(path: str) -> Any:
+    """
+    Loads a YAML file, with the LibYAML-based loader when it is available.
+
+    :param path: The path to the YAML file.
+    :return: The contents of the file.
+    """
+    with open(path, 'r') as f:
+        return yaml.load(f, Loader=getattr(yaml, 'CSafeLoader', yaml.SafeLoader))
+
+
+def get_fingerprint(paths: List[str]) -> str:
+    """
+    Computes a hash of the contents of a list of files, in the given order.
+
+    :param paths: A list of paths to files.
+    :return: The hexadecimal SHA-256 digest of the files.
+    """
+    digest = hashlib.sha256()
+    for path in paths:
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                digest.update(chunk)
+        digest.update(b'\0')
+    return digest.hexdigest()
+
+
+def read_word_list(path: str, encoding: str = 'utf-8') -> Iterator[str]:
+    """
+    Reads the word forms from a word list or a word-frequency list. Each line holds a word
+    form, optionally preceded or followed by its frequency (e.g. the output of `uniq -c`).
+
+    :param path: The path to the word list.
+    :param encoding: The encoding of the file. Defaults to utf-8.
+    :return: An iterator over the word forms, in the order of the file.
+    """
+    with open(path, 'r', encoding=encoding) as f:
+        for line in f:
+            fields = [field for field in line.split() if not field.isdigit()]
+            if fields:
+                yield fields[0]
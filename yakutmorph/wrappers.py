@@ -1,10 +1,42 @@
-from dataclasses import dataclass, field
-from typing import Dict, List, Optional, Union
+import sys
+from array import array
+from dataclasses import dataclass, field, fields
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
 
-from .interfaces import MorphReference, Transducer
+from .interfaces import Mapper, MorphReference, Transducer
 
 
-@dataclass
+def _get_slots_state(self) -> Dict:
+    return {name: getattr(self, name) for name in self.__slots__ if hasattr(self, name)}
+
+
+def _set_slots_state(self, state: Dict) -> None:
+    for name, value in state.items():
+        object.__setattr__(self, name, value)
+
+
+def _slotted(cls):
+    """
+    Recreates a dataclass with __slots__ for its fields, as `dataclass(slots=True)` does on
+    Python 3.10+, so that its instances do not have a __dict__.
+    """
+    cls_dict = dict(cls.__dict__)
+    names = tuple(f.name for f in fields(cls))
+    cls_dict['__slots__'] = names
+    for name in names:
+        # The default values are kept by the generated __init__
+        cls_dict.pop(name, None)
+    cls_dict.pop('__dict__', None)
+    cls_dict.pop('__weakref__', None)
+    if cls.__dataclass_params__.frozen:
+        # Frozen instances cannot be restored with setattr when unpickled
+        cls_dict['__getstate__'] = _get_slots_state
+        cls_dict['__setstate__'] = _set_slots_state
+    return type(cls)(cls.__name__, cls.__bases__, cls_dict)
+
+
+@_slotted
+@dataclass(frozen=True)
 class Morph:
     """
     Represents a morphological unit with a type and reference information.
@@ -37,18 +69,19 @@ class Morph:
         return self.reference.get(field, None)
 
 
-@dataclass
+@_slotted
+@dataclass(frozen=True)
 class InflGroup:
     """
     Represents a group of inflectional morphemes.
 
     Attributes:
         pos: The position of the inflection group.
-        affixes: A list of morpheme objects representing affixes.
+        affixes: A tuple of morpheme objects representing affixes.
     """
 
     pos: int
-    affixes: List[Morph]
+    affixes: Tuple[Morph, ...]
 
     def __repr__(self):
         """
@@ -63,66 +96,142 @@ class Analysis:
     """
     Represents the analysis of morphemes within a given context.
 
+    Analysis objects are immutable, so a single object can be shared by all the
+    tokens with the same analysis (see AnalysisTable). The morphemes, the stem and
+    the lemmas are derived on first use and kept with the object.
+
     Attributes:
         root: The lexical root of the analysis.
-        infl_groups: A list of inflectional groups.
+        infl_groups: A tuple of inflectional groups.
     """
 
-    def __init__(self, morphemes: List[str], reference: MorphReference):
+    __slots__ = ('root', 'infl_groups', '_morphemes', '_stem_morphemes', '_stem', '_lemmas')
 
-        self.root = Morph(morphemes[0], 'root', {})
-        self.infl_groups = [
-            InflGroup(i, igs)
-            for i, igs in enumerate(self.__set_infl_groups(morphemes, reference), start=1)
-        ]
-
-    def __set_infl_groups(self, morphemes: List[str], reference: MorphReference) -> List[InflGroup]:
+    def __init__(self, morphemes: List[str], reference: MorphReference, morphs: Dict[Tuple[str, str], Morph] = None):
+        """
+        :param morphemes: A list of morphemes.
+        :param reference: A reference to the morphology implemented by the transducer.
+        :param morphs: A table of Morph objects of the reference to share among analyses
+            (see AnalysisTable). Defaults to new Morph objects.
+        """
+        morphs = morphs if morphs is not None else dict()
+        object.__setattr__(self, 'root', self.__get_morph(morphs, morphemes[0], 'root', reference))
+        object.__setattr__(self, 'infl_groups', tuple(
+            InflGroup(i, tuple(igs))
+            for i, igs in enumerate(self.__set_infl_groups(morphemes, reference, morphs), start=1)
+        ))
+        object.__setattr__(self, '_morphemes', None)
+        object.__setattr__(self, '_stem_morphemes', None)
+        object.__setattr__(self, '_stem', None)
+        object.__setattr__(self, '_lemmas', None)
+
+    @staticmethod
+    def __get_morph(morphs: Dict[Tuple[str, str], Morph], morpheme: str, morph_type: str, reference: MorphReference) -> Morph:
         """
-        Private method to set inflection groups from morphemes.
+        Private method to get the shared Morph object of a morpheme.
+        """
+        morph = morphs.get((morpheme, morph_type))
+        if morph is None:
+            morph = Morph(morpheme, morph_type, {} if morph_type == 'root' else reference.get_tag(morpheme))
+            morphs[(morpheme, morph_type)] = morph
+        return morph
+
+    def __set_infl_groups(
+            self,
+            morphemes: List[str],
+            reference: MorphReference,
+            morphs: Dict[Tuple[str, str], Morph]
+            ) -> List[List[Morph]]:
+        """
+        Private method to set inflection groups from morphemes. Each derivational morpheme
+        starts a new inflectional group.
 
         :param morphemes: A list of morphemes.
         :param reference: A reference to the morphology implemented by the transducer.
+        :param morphs: A table of shared Morph objects.
         :return: A list of inflectional groups.
         """
         infl_groups = list()
-        curr_infl_group = list()
-        last_idx = len(morphemes) - 1
-        while last_idx > 0:
-            ig = Morph(
-                morphemes[last_idx],
-                'db' if morphemes[last_idx].startswith('^') else 'fl',
-                reference.get_tag(morphemes[last_idx])
-            )
-
-            curr_infl_group.insert(0, ig)
+        for morpheme in morphemes[1:]:
+            ig = self.__get_morph(morphs, morpheme, 'db' if morpheme.startswith('^') else 'fl', reference)
             if ig.type == 'db':
-                infl_groups.insert(0, curr_infl_group)
-                curr_infl_group = list()
-            last_idx -= 1
+                infl_groups.append([ig])
+            elif infl_groups:
+                infl_groups[-1].append(ig)
         return infl_groups
 
+    def __setattr__(self, name, value):
+        raise AttributeError(f'{self.__class__.__name__} objects are immutable')
+
+    def __delattr__(self, name):
+        raise AttributeError(f'{self.__class__.__name__} objects are immutable')
+
+    __getstate__ = _get_slots_state
+    __setstate__ = _set_slots_state
+
     @property
-    def morphemes(self):
+    def morphemes(self) -> Tuple[Morph, ...]:
         """
         Property to get all morphemes including the root and inflection groups.
 
-        :return: A list of 'Morph' objects.
+        :return: A tuple of 'Morph' objects.
         """
-        return [self.root] + [ig for group in self.infl_groups for ig in group.affixes]
+        if self._morphemes is None:
+            object.__setattr__(
+                self, '_morphemes', (self.root, *[ig for group in self.infl_groups for ig in group.affixes])
+            )
+        return self._morphemes
 
-    def remove_inflections(self):
+    def remove_inflections(self) -> Tuple[Morph, ...]:
         """
         Removes inflection morphemes from the last inflectional group.
 
-        :return: A list of 'Morph' objects.
+        :return: A tuple of 'Morph' objects.
         """
-        morphemes = self.morphemes
-        last_idx = len(morphemes) - 1
-        while last_idx > 0:
-            if morphemes[last_idx].type == 'db':
-                break
-            last_idx -= 1
-        return morphemes[:last_idx + 1]
+        if self._stem_morphemes is None:
+            morphemes = self.morphemes
+            if self.infl_groups:
+                # The last inflectional group starts with its derivational morpheme
+                morphemes = morphemes[:len(morphemes) - len(self.infl_groups[-1].affixes) + 1]
+            object.__setattr__(self, '_stem_morphemes', morphemes)
+        return self._stem_morphemes
+
+    @property
+    def stem(self) -> str:
+        """
+        The analysis without the inflections of the last inflectional group, from which
+        the lemmas are generated.
+        """
+        if self._stem is None:
+            object.__setattr__(self, '_stem', ''.join([m.morpheme for m in self.remove_inflections()]))
+        return self._stem
+
+    def get_lemmas(self, fst: Transducer) -> List[str]:
+        """
+        Generates the lemmas of the analysis. They are generated only once.
+
+        :param fst: The transducer that produced the analysis.
+        :return: A list of surface forms for the stem of the analysis.
+        """
+        if self._lemmas is None:
+            self._set_lemmas(fst.generate(self.stem))
+        return list(self._lemmas)
+
+    @property
+    def has_lemmas(self) -> bool:
+        """
+        Whether the lemmas of the analysis have been generated.
+        """
+        return self._lemmas is not None
+
+    def _set_lemmas(self, lemmas: Iterable[str]) -> None:
+        """
+        Sets the lemmas of the analysis, when they are generated for several analyses at once
+        (see `generate_lemmas`).
+
+        :param lemmas: The surface forms generated for the stem of the analysis.
+        """
+        object.__setattr__(self, '_lemmas', tuple(lemmas))
 
     def __repr__(self):
         """
@@ -130,8 +239,80 @@ class Analysis:
 
         :return: A string representation of the 'Analysis' object.
         """
-        return f'Analysis({self.morphemes})'
+        return f'Analysis({list(self.morphemes)})'
+
+class AnalysisTable:
+    """
+    An intern table of Analysis objects. Each distinct analysis produced by a transducer
+    is split into morphemes and wrapped into an Analysis object only once, and the same
+    object is shared among all the tokens and sentences where it occurs. The Morph objects
+    of the analyses are shared as well.
+
+    Position-dependent post-processing does not modify the shared objects: the post-processed
+    morphemes are looked up in the table, so a token simply points to a different Analysis.
+    """
+
+    def __init__(self, maxsize: int = 200000):
+        """
+        Initializes an empty table.
+
+        :param maxsize: The maximum number of entries kept in each of the tables. Once the
+            table is full, new analyses are still built but no longer shared.
+        """
+        self.maxsize = maxsize
+        self.morphemes = dict()
+        self.analyses = dict()
+        self.morphs = dict()
+
+    def get_morphemes(self, fst: Transducer, analysis: str) -> Tuple[str, ...]:
+        """
+        Splits an analysis produced by a transducer into morphemes.
+
+        :param fst: The transducer that produced the analysis.
+        :param analysis: The analysis string.
+        :return: A tuple of morphemes.
+        """
+        key = (fst, analysis)
+        morphemes = self.morphemes.get(key)
+        if morphemes is None:
+            # Interned, so that the strings of the tags are not duplicated among analyses
+            morphemes = tuple([sys.intern(morpheme) for morpheme in fst.get_morphemes(analysis)])
+            if len(self.morphemes) < self.maxsize:
+                self.morphemes[key] = morphemes
+        return morphemes
+
+    def get_analysis(self, fst: Transducer, morphemes: List[str]) -> Analysis:
+        """
+        Returns the shared Analysis object for a sequence of morphemes produced by a transducer.
+
+        :param fst: The transducer that produced the morphemes.
+        :param morphemes: A list of morphemes.
+        :return: An Analysis object.
+        """
+        key = (fst, tuple(morphemes))
+        analysis = self.analyses.get(key)
+        if analysis is None:
+            analysis = Analysis(morphemes, fst.reference, self.morphs.setdefault(fst.reference, dict()))
+            if len(self.analyses) < self.maxsize:
+                self.analyses[key] = analysis
+        return analysis
+
+    def clear(self) -> None:
+        """
+        Removes all the entries from the table.
+        """
+        self.morphemes.clear()
+        self.analyses.clear()
+        self.morphs.clear()
+
+    def __len__(self):
+        return len(self.analyses)
+
+    def __repr__(self):
+        return f'{self.__class__.__name__}({len(self.analyses)})'
+
 
+@_slotted
 @dataclass
 class Analyses:
     """
@@ -160,6 +341,7 @@ class Analyses:
         return f'{self.__class__.__name__}({self.fst}={len(self.output)})'
 
 
+@_slotted
 @dataclass
 class Token:
     """
@@ -172,6 +354,8 @@ class Token:
         type: The type of the token.
         has_morph: Indicates whether the token has morphological analyses.
         analyses: The morphological analyses of the token.
+        start: The character offset of the token in the text of the parse, if known.
+        end: The character offset of the end of the token in the text of the parse, if known.
     """
 
     pos: int
@@ -179,6 +363,8 @@ class Token:
     type: str
     has_morph: bool
     analyses: Optional[Analyses] = None
+    start: Optional[int] = None
+    end: Optional[int] = None
 
     def __repr__(self):
         """
@@ -218,11 +404,78 @@ class Token:
 
         :return: A list of surface forms for a given analysis.
         """
-        analysis = ''.join([m.morpheme for m in self.morph.remove_inflections()])
-        lemmas = self.analyses.fst.generate(analysis)
-        return lemmas
+        return self.morph.get_lemmas(self.analyses.fst)
 
 
+class DAG(list):
+    """
+    A directed acyclic graph (DAG) of the morphological analyses of a sequence: a list with
+    the nodes of each step, from '<BOS>' to '<EOS>'. The analyses of a token that are reduced
+    to the same node are collapsed into a single node, so that the disambiguation model only
+    scores distinct nodes, and each node keeps back-pointers to the analyses it stands for.
+
+    Attributes:
+        backpointers: For each step, the indices of the analyses collapsed into each node.
+    """
+
+    def __init__(self, nodes: List[List[str]], backpointers: List[List[List[int]]]):
+        super().__init__(nodes)
+        self.backpointers = backpointers
+
+    @classmethod
+    def collapse(cls, steps: Iterable[List[str]]) -> 'DAG':
+        """
+        Builds a DAG from the nodes of each analysis, collapsing the duplicated nodes of a step.
+        The distinct nodes keep the order of their first occurrence.
+
+        :param steps: For each step, the node of each analysis.
+        :return: A DAG object.
+        """
+        nodes = list()
+        backpointers = list()
+        for step in steps:
+            positions = dict()
+            for idx, node in enumerate(step):
+                positions.setdefault(node, []).append(idx)
+            nodes.append(list(positions))
+            backpointers.append(list(positions.values()))
+        return cls(nodes, backpointers)
+
+    @property
+    def counts(self) -> List[List[int]]:
+        """
+        Returns the number of analyses collapsed into each node.
+
+        :return: For each step, the number of analyses of each node.
+        """
+        return [[len(analyses) for analyses in step] for step in self.backpointers]
+
+    def is_ambiguous(self) -> bool:
+        """
+        Checks if any step has more than one distinct node.
+
+        :return: True if the DAG is ambiguous, False otherwise.
+        """
+        return any(len(step) > 1 for step in self)
+
+    def get_indexes(self, indexes: List[int] = None) -> List[int]:
+        """
+        Maps the nodes chosen for each token to the indices of their analyses. A node stands
+        for the last of the analyses collapsed into it.
+
+        :param indexes: The index of the chosen node of each token (i.e. of each step between
+            '<BOS>' and '<EOS>'). Defaults to the first node of each step.
+        :return: The index of the chosen analysis of each token.
+        """
+        if indexes is None:
+            indexes = [0] * (len(self) - 2)
+        return [self.backpointers[step][idx][-1] for step, idx in enumerate(indexes, start=1)]
+
+    def __repr__(self):
+        return f'{self.__class__.__name__}({list.__repr__(self)})'
+
+
+@_slotted
 @dataclass
 class Parse:
     """
@@ -232,10 +485,13 @@ class Parse:
     Attributes:
         text: The input text.
         tokens: The list of tokens in the input text.
+        disambiguation_state: The state of the disambiguation model after disambiguating the
+            parse, if it was built by `YakutMorph.reparse`, which resumes from it after an edit.
     """
 
     text: str
     tokens: List[Token]
+    disambiguation_state: Any = field(default=None, repr=False, compare=False)
 
     def __repr__(self):
         """
@@ -254,7 +510,7 @@ class Parse:
         """
         return any([token for token in self.tokens if token.is_ambiguous()])
 
-    def get_dag(self, mapper) -> List[List[str]]:
+    def get_dag(self, mapper) -> DAG:
         """
         Generates a directed acyclic graph (DAG) representation of the morphological
         parses for the input sequence. Each node in the DAG represents a morphological
@@ -262,10 +518,10 @@ class Parse:
 
         :param mapper: An object that provides methods for processing morphological
             groups and mapping token types.
-        :return: A DAG where each sublist contains the nodes (morphological analyses)
+        :return: A DAG where each sublist contains the distinct nodes (morphological analyses)
             for a token.
         """
-        dag = [['<BOS>']]
+        steps = [['<BOS>']]
         for token in self.tokens:
             nodes = []
             if token.analyses:
@@ -276,6 +532,383 @@ class Parse:
             else:
                 node = mapper.map_token_type(token.type)
                 nodes.append(node)
-            dag.append(nodes)
-        dag.append(['<EOS>'])
-        return dag
+            steps.append(nodes)
+        steps.append(['<EOS>'])
+        return DAG.collapse(steps)
+
+
+class ParseBatch:
+    """
+    A columnar representation of the parses of a batch of sentences. Instead of a Token
+    object per token, the batch keeps a few flat arrays with a value per token (or per
+    analysis), and the Analysis objects are referenced by their index in a table of the
+    distinct analyses of the batch.
+
+    A Parse object for a single sentence is built from the columns on demand, with
+    `batch[i]`. It is a copy: changing it does not change the batch.
+
+    Attributes:
+        texts: The text of each sentence.
+        token_offsets: The index of the first token of each sentence, followed by the number of tokens.
+        starts: The character offset of each token in the text of its sentence, or -1 if unknown.
+        ends: The character offset of the end of each token, or -1 if unknown.
+        surface_offsets: The offset of the surface form of each token in `surfaces`, followed
+            by the length of `surfaces`.
+        types: The index of the type of each token in `token_types`.
+        fsts: The index of the transducer of each token in `transducers`, or -1 for the
+            tokens without morphology.
+        analysis_offsets: The index of the first analysis of each token in `analyses`,
+            followed by the number of analyses.
+        analyses: The index of each analysis of each token in `analysis_table`.
+        mla: The index of the most likely analysis of each token among its analyses, or -1
+            for the tokens without morphology.
+        token_types: The distinct token types.
+        transducers: The distinct transducers.
+        analysis_table: The distinct Analysis objects.
+    """
+
+    def __init__(self):
+        """
+        Initializes an empty batch.
+        """
+        self.texts = list()
+        self.token_offsets = array('q', [0])
+        self.starts = array('i')
+        self.ends = array('i')
+        self.surface_offsets = array('q', [0])
+        self.types = array('h')
+        self.fsts = array('h')
+        self.analysis_offsets = array('q', [0])
+        self.analyses = array('i')
+        self.mla = array('h')
+        self.token_types = list()
+        self.transducers = list()
+        self.analysis_table = list()
+        self.__ids = dict()
+        self.__surfaces = list()
+
+    @classmethod
+    def from_parses(cls, parses: Iterable[Parse]) -> 'ParseBatch':
+        """
+        Builds a batch from Parse objects.
+
+        :param parses: The Parse objects.
+        :return: A ParseBatch object.
+        """
+        batch = cls()
+        for parse in parses:
+            batch.append(parse.text, [
+                (
+                    token.surface,
+                    token.type,
+                    token.start,
+                    token.end,
+                    token.analyses.fst if token.analyses else None,
+                    token.analyses.output if token.analyses else (),
+                    token.analyses.idx_mla if token.analyses and token.analyses.idx_mla is not None else 0
+                )
+                for token in parse.tokens
+            ])
+        return batch
+
+    def append(
+            self,
+            text: str,
+            tokens: Iterable[Tuple[str, str, Optional[int], Optional[int], Optional[Transducer], Sequence[Analysis], int]]
+            ) -> None:
+        """
+        Adds a sentence to the batch.
+
+        :param text: The text of the sentence.
+        :param tokens: An iterable of (surface, type, start, end, transducer, analyses, mla)
+            tuples, where the transducer is None for the tokens without morphology.
+        """
+        ids = self.__ids
+        for surface, token_type, start, end, fst, analyses, mla in tokens:
+            self.starts.append(start if start is not None else -1)
+            self.ends.append(end if end is not None else -1)
+            self.__surfaces.append(surface)
+            self.surface_offsets.append(self.surface_offsets[-1] + len(surface))
+            self.types.append(self.__get_id(token_type, self.token_types))
+            if fst is None:
+                self.fsts.append(-1)
+                self.mla.append(-1)
+            else:
+                self.fsts.append(self.__get_id(fst, self.transducers))
+                self.mla.append(mla)
+                for analysis in analyses:
+                    idx = ids.get(analysis)
+                    if idx is None:
+                        idx = ids[analysis] = len(self.analysis_table)
+                        self.analysis_table.append(analysis)
+                    self.analyses.append(idx)
+            self.analysis_offsets.append(len(self.analyses))
+        self.texts.append(text)
+        self.token_offsets.append(len(self.starts))
+
+    def __get_id(self, value, values: List) -> int:
+        # The lists of types and transducers are short
+        if value not in values:
+            values.append(value)
+        return values.index(value)
+
+    @property
+    def surfaces(self) -> str:
+        """
+        The surface forms of all the tokens, concatenated in a single string.
+        """
+        if len(self.__surfaces) != 1:
+            self.__surfaces = [''.join(self.__surfaces)]
+        return self.__surfaces[0]
+
+    @property
+    def n_tokens(self) -> int:
+        return len(self.starts)
+
+    def get_tokens(self, idx: int) -> range:
+        """
+        Returns the indices of the tokens of a sentence in the columns.
+
+        :param idx: The index of the sentence.
+        :return: A range of token indices.
+        """
+        return range(self.token_offsets[idx], self.token_offsets[idx + 1])
+
+    def get_analyses(self, token: int) -> List[Analysis]:
+        """
+        Returns the Analysis objects of a token.
+
+        :param token: The index of the token in the columns.
+        :return: A list of Analysis objects.
+        """
+        table = self.analysis_table
+        return [table[i] for i in self.analyses[self.analysis_offsets[token]:self.analysis_offsets[token + 1]]]
+
+    def is_ambiguous(self, idx: int) -> bool:
+        """
+        Checks if any token of a sentence has more than one analysis.
+
+        :param idx: The index of the sentence.
+        :return: True if the sentence is ambiguous, False otherwise.
+        """
+        offsets = self.analysis_offsets
+        return any(offsets[token + 1] - offsets[token] > 1 for token in self.get_tokens(idx))
+
+    def set_mla(self, idx: int, indexes: List[int] = None) -> None:
+        """
+        Sets the most likely analysis of each token with morphology of a sentence.
+
+        :param idx: The index of the sentence.
+        :param indexes: The indexes of the chosen analyses, one per token. If not provided,
+            the first analysis is chosen for every token.
+        """
+        tokens = self.get_tokens(idx)
+        for token, mla in zip(tokens, indexes if indexes is not None else [0] * len(tokens)):
+            if self.fsts[token] != -1:
+                self.mla[token] = mla
+
+    def __getitem__(self, idx: int) -> Parse:
+        """
+        Builds the Parse object of a sentence.
+
+        :param idx: The index of the sentence.
+        :return: A Parse object.
+        """
+        if idx < 0:
+            idx += len(self)
+        if not 0 <= idx < len(self):
+            raise IndexError('ParseBatch index out of range')
+        surfaces = self.surfaces
+        tokens = list()
+        for pos, token in enumerate(self.get_tokens(idx), start=1):
+            fst = self.fsts[token]
+            tokens.append(Token(
+                pos,
+                surfaces[self.surface_offsets[token]:self.surface_offsets[token + 1]],
+                self.token_types[self.types[token]],
+                fst != -1,
+                Analyses(self.transducers[fst], self.get_analyses(token), self.mla[token]) if fst != -1 else None,
+                self.starts[token] if self.starts[token] != -1 else None,
+                self.ends[token] if self.ends[token] != -1 else None
+            ))
+        return Parse(self.texts[idx], tokens)
+
+    def __iter__(self) -> Iterator[Parse]:
+        return (self[idx] for idx in range(len(self)))
+
+    def __len__(self):
+        return len(self.texts)
+
+    def generate_lemmas(self) -> None:
+        """
+        Generates the lemmas of the most likely analyses of the batch, with a single call to
+        `generate_many` per transducer (see `generate_lemmas`).
+        """
+        pending = dict()
+        for token, mla in enumerate(self.mla):
+            if mla == -1:
+                continue
+            analysis = self.analysis_table[self.analyses[self.analysis_offsets[token] + mla]]
+            if not analysis.has_lemmas:
+                fst = self.transducers[self.fsts[token]]
+                pending.setdefault(fst, dict()).setdefault(analysis.stem, set()).add(analysis)
+        _set_lemmas(pending)
+
+    def __repr__(self):
+        return f'{self.__class__.__name__}({len(self)} sentences, {self.n_tokens} tokens)'
+
+
+class DAGEncoder:
+    """
+    Encodes parses directly into DAGs of the vocabulary indices of a disambiguation model,
+    which the model consumes without any string processing (see `disambiguate_encoded`).
+
+    The node of an analysis only depends on the morphemes of its last inflectional group,
+    so the mapper and the vocabulary are applied once per distinct tuple of morphemes (or
+    token type), and the resulting index is memoized. Since Analysis objects are shared
+    (see AnalysisTable), the index of each Analysis object is memoized as well.
+    """
+
+    def __init__(self, mapper: Mapper, stoi: Dict[str, int], unknown_idx: int, maxsize: int = 200000):
+        """
+        Initializes the encoder.
+
+        :param mapper: The mapper that reduces the morphemes to the nodes of the DAG.
+        :param stoi: A dictionary mapping the nodes to vocabulary indices.
+        :param unknown_idx: The index of the nodes out of the vocabulary.
+        :param maxsize: The maximum number of entries kept in each of the tables. Once a
+            table is full, new entries are still encoded but no longer memoized.
+        """
+        self.mapper = mapper
+        self.stoi = stoi
+        self.unknown_idx = unknown_idx
+        self.maxsize = maxsize
+        self.bos_idx = stoi.get('<BOS>', unknown_idx)
+        self.eos_idx = stoi.get('<EOS>', unknown_idx)
+        self.analyses = dict()
+        self.morphs = dict()
+        self.token_types = dict()
+
+    def encode_morphs(self, morphs: Tuple[str, ...]) -> int:
+        """
+        Encodes the morphemes of the last inflectional group of an analysis.
+
+        :param morphs: A tuple of morphemes.
+        :return: The vocabulary index of the node.
+        """
+        idx = self.morphs.get(morphs)
+        if idx is None:
+            idx = self.stoi.get(''.join(self.mapper.process_morphs(list(morphs))), self.unknown_idx)
+            if len(self.morphs) < self.maxsize:
+                self.morphs[morphs] = idx
+        return idx
+
+    def encode_analysis(self, analysis: Analysis) -> int:
+        """
+        Encodes an analysis.
+
+        :param analysis: An Analysis object.
+        :return: The vocabulary index of the node.
+        """
+        idx = self.analyses.get(analysis)
+        if idx is None:
+            idx = self.encode_morphs(tuple([affix.morpheme for affix in analysis.infl_groups[-1].affixes]))
+            if len(self.analyses) < self.maxsize:
+                self.analyses[analysis] = idx
+        return idx
+
+    def encode_token_type(self, token_type: str) -> int:
+        """
+        Encodes the type of a token without morphology.
+
+        :param token_type: The type of the token.
+        :return: The vocabulary index of the node.
+        """
+        idx = self.token_types.get(token_type)
+        if idx is None:
+            idx = self.stoi.get(self.mapper.map_token_type(token_type), self.unknown_idx)
+            if len(self.token_types) < self.maxsize:
+                self.token_types[token_type] = idx
+        return idx
+
+    def encode(self, parse: Parse) -> DAG:
+        """
+        Encodes a parse into a DAG of vocabulary indices. The analyses of a token with the
+        same index are collapsed into a single node.
+
+        :param parse: A Parse object.
+        :return: A DAG where each sublist contains the distinct vocabulary indices of a token.
+        """
+        encode_analysis = self.encode_analysis
+        steps = [[self.bos_idx]]
+        for token in parse.tokens:
+            if token.analyses:
+                steps.append([encode_analysis(analysis) for analysis in token.analyses.output])
+            else:
+                steps.append([self.encode_token_type(token.type)])
+        steps.append([self.eos_idx])
+        return DAG.collapse(steps)
+
+    def encode_batch(self, batch: ParseBatch, indices: Iterable[int]) -> List[DAG]:
+        """
+        Encodes sentences of a ParseBatch into DAGs of vocabulary indices, directly from its
+        columns. Each distinct analysis and token type of the batch is encoded only once.
+
+        :param batch: A ParseBatch object.
+        :param indices: The indices of the sentences to encode.
+        :return: The DAG of each sentence.
+        """
+        analysis_ids = [self.encode_analysis(analysis) for analysis in batch.analysis_table]
+        type_ids = [self.encode_token_type(token_type) for token_type in batch.token_types]
+        offsets = batch.analysis_offsets
+        dags = list()
+        for idx in indices:
+            steps = [[self.bos_idx]]
+            for token in batch.get_tokens(idx):
+                if batch.fsts[token] != -1:
+                    steps.append([analysis_ids[i] for i in batch.analyses[offsets[token]:offsets[token + 1]]])
+                else:
+                    steps.append([type_ids[batch.types[token]]])
+            steps.append([self.eos_idx])
+            dags.append(DAG.collapse(steps))
+        return dags
+
+    def clear(self) -> None:
+        """
+        Removes all the entries from the tables.
+        """
+        self.analyses.clear()
+        self.morphs.clear()
+        self.token_types.clear()
+
+
+def generate_lemmas(parses: Iterable[Parse]) -> None:
+    """
+    Generates the lemmas of the most likely analyses of the tokens of several parses at once,
+    so that each transducer generates each distinct stem only once, with a single call to
+    `generate_many`. Later accesses to `Token.lemmas` do not generate them again.
+
+    :param parses: The parses whose lemmas are generated.
+    """
+    pending = dict()
+    for parse in parses:
+        for token in parse.tokens:
+            if token.analyses is None or token.analyses.idx_mla is None:
+                continue
+            analysis = token.morph
+            if not analysis.has_lemmas:
+                pending.setdefault(token.analyses.fst, dict()).setdefault(analysis.stem, []).append(analysis)
+    _set_lemmas(pending)
+
+
+def _set_lemmas(pending: Dict[Transducer, Dict[str, Iterable[Analysis]]]) -> None:
+    """
+    Generates the lemmas of the stems of each transducer and sets them on their analyses.
+
+    :param pending: For each transducer, the analyses of each stem.
+    """
+    for fst, stems in pending.items():
+        for lemmas, analyses in zip(fst.generate_many(stems), stems.values()):
+            lemmas = tuple(lemmas)
+            for analysis in analyses:
+                analysis._set_lemmas(lemmas)